@@ -3,6 +3,9 @@ import json
 import os
 import pytz
 import utils
+import news_index
+import comment_store
+import event_index
 from datetime import datetime, timedelta
 
 # --- Google Analytics 4 Injection ---
@@ -29,7 +32,7 @@ warnings.filterwarnings("ignore", category=FutureWarning, module="google.generat
 # Suppress Streamlit Warnings
 warnings.filterwarnings("ignore", category=DeprecationWarning, module="streamlit")
 # --------------------------------------------------------------------------------
-from db_utils import load_news_from_sheet, save_news_to_sheet, load_recent_news, load_news_by_date, load_local_news_cache, get_news_for_date
+from db_utils import load_news_from_sheet, update_news_items_in_sheet, delete_news_items_from_sheet, load_recent_news, load_news_by_date, load_local_news_cache, get_news_for_date, get_news_store_mtime, save_local_news_date
 
 # Fix SSL Certificate Issue on Mac
 os.environ["SSL_CERT_FILE"] = certifi.where()
@@ -63,12 +66,12 @@ components.html(TP_VERIFICATION_CODE, height=0)
 
 
 # --- Configuration ---
-NEWS_FILE = 'data/news.json'
+NEWS_FILE = 'data/news/manifest.json'  # date-partitioned store: data/news/<date>.json
 EVENTS_FILE = 'data/events.json'
 BIG_EVENTS_FILE = 'data/big_events.json'
 TRENDS_FILE = 'data/trends.json'
 CONFIG_FILE = 'data/config.json'
-COMMENTS_FILE = 'data/comments.json'
+COMMENTS_FILE = comment_store.COMMENTS_DIR  # per-article logs: data/comments/<xx>/<news_id>.jsonl
 BOARD_FILE = 'data/board.json'
 
 DEPLOY_URL = "https://thai-today.com"
@@ -430,7 +433,7 @@ def load_news_data():
         # Also check file modification time as escape hatch
         if not is_fresh:
             try:
-                mtime = os.path.getmtime(LOCAL_NEWS_CACHE)
+                mtime = get_news_store_mtime()
                 # If updated within last 6 hours, don't force GSheets (prevent API flood)
                 if (datetime.now().timestamp() - mtime) < 21600:
                     is_fresh = True
@@ -455,17 +458,6 @@ def get_cached_exchange_rate():
 def get_cached_usd_exchange_rate():
     return utils.get_usd_thb_rate()
 
-@st.cache_data(ttl=3600, show_spinner=False)
-def load_events_data(mtime):
-    """Loads events from JSON file."""
-    if os.path.exists(EVENTS_FILE):
-        with open(EVENTS_FILE, 'r', encoding='utf-8') as f:
-            try:
-                return json.load(f)
-            except:
-                return []
-    return []
-
 @st.cache_data(ttl=1800, show_spinner=False)
 def load_trends_data(mtime):
     """Loads trends from JSON file."""
@@ -533,6 +525,9 @@ def update_events_if_stale():
                     existing_sigs.add(sig)
                     added_count += 1
             
+            # Parse dates once at ingestion (date_range: start/end/status)
+            event_index.normalize_events(existing_events)
+            
             # Save
             with open(EVENTS_FILE, 'w', encoding='utf-8') as f:
                 json.dump(existing_events, f, ensure_ascii=False, indent=2)
@@ -540,76 +535,11 @@ def update_events_if_stale():
             return added_count
     return 0
 
-def is_event_active(date_str):
-    """
-    Checks if an event is active based on its date string.
-    Returns True if:
-    1. Date string is valid and >= Today.
-    2. Date string contains a range, and end date >= Today.
-    3. Date string is ambiguous but not clearly in the past.
-    Returns False if event is definitely in the past or too old (e.g., < 2024).
-    """
-    if not date_str:
-        return True # Keep if no date
-
-    try:
-        today = datetime.now().date()
-        current_year = today.year
-        
-        # Quick Check for obviously old years in string
-        # If "2017", "2018" etc found, reject immediately
-        for old_year in range(2015, current_year):
-            if str(old_year) in date_str:
-                return False
-
-        # Clean string
-        
-        # Clean string
-        clean_date = date_str.replace('.', '-').strip()
-        
-        # Case A: Range "2024-01-01 ~ 2024-02-01"
-        if '~' in clean_date:
-            parts = clean_date.split('~')
-            end_part = parts[1].strip()
-            if not end_part: 
-                start_part = parts[0].strip()
-                # "2024-01-01 ~" -> Check start date? No, it implies ongoing.
-                # Just check if start is not ancient? For now, assume active.
-                return True
-                
-            try:
-                # Try parsing end date
-                end_dt = datetime.strptime(end_part, "%Y-%m-%d").date()
-                return end_dt >= today
-            except:
-                pass # Parse fail, default True
-
-        # Case B: Single Date "2024-01-01"
-        try:
-            dt = datetime.strptime(clean_date, "%Y-%m-%d").date()
-            return dt >= today
-        except:
-             pass
-
-    except:
-        pass
-        
-    # Default to True if we differ parsing, to avoid hiding valid events with weird formats
-    return True
-
 def get_cached_events():
     """Wrapper that ensures file exists/is filtered, then loads."""
     update_events_if_stale()
-    mtime = 0
-    if os.path.exists(EVENTS_FILE):
-        mtime = os.path.getmtime(EVENTS_FILE)
-    
-    events = load_events_data(mtime)
-    
-    # Python-side Filtering: Remove expired events
-    valid_events = [e for e in events if is_event_active(e.get('date'))]
-    
-    return valid_events
+    # [OPTIMIZED] Index is rebuilt only when events.json changes; expired events are cut by bisect on end date
+    return event_index.load_index(EVENTS_FILE).active()
 
 def load_json(file_path, default=None):
     if default is None:
@@ -622,59 +552,12 @@ def load_json(file_path, default=None):
                 return default
     return default
 
-def highlight_text(text):
-    """Highlight keywords using Streamlit markdown syntax (for st.markdown)"""
-    # 1. 위험 (Red) - 가장 강력한 경고
-    red_keywords = ["사망", "살인", "체포", "총기", "마약", "야바", "폭발", "화재", "강도", "성범죄", "테러"]
-    for word in red_keywords:
-        text = text.replace(word, f":red[**{word}**]")
-        
-    # 2. 주의/경고 (Orange) - 비자, 법규, 벌금
-    orange_keywords = ["추방", "블랙리스트", "입국거부", "단속", "벌금", "전자담배", "불법", "비자", "경고"]
-    for word in orange_keywords:
-        text = text.replace(word, f":orange[**{word}**]")
-        
-    # 3. 경제/정보 (Blue) - 돈, 수치 변화
-    blue_keywords = ["인상", "하락", "폭등", "폭락", "환율", "사기", "바가지"]
-    for word in blue_keywords:
-        text = text.replace(word, f":blue[**{word}**]")
-
-    # 4. 배경지식 (Green/Grey) - 환경, 질병
-    green_keywords = ["홍수", "침수", "뎅기열", "주류 판매 금지", "시위"]
-    for word in green_keywords:
-        text = text.replace(word, f":green[**{word}**]")
-        
-    return text
-
-def highlight_text_html(text):
-    """Highlight keywords using HTML spans (for raw HTML rendering in news cards)"""
-    # 1. 위험 (Red)
-    red_keywords = ["사망", "살인", "체포", "총기", "마약", "야바", "폭발", "화재", "강도", "성범죄", "테러"]
-    for word in red_keywords:
-        text = text.replace(word, f"<span style='color:#FF4444;font-weight:bold;'>{word}</span>")
-        
-    # 2. 주의/경고 (Orange)
-    orange_keywords = ["추방", "블랙리스트", "입국거부", "단속", "벌금", "전자담배", "불법", "비자", "경고"]
-    for word in orange_keywords:
-        text = text.replace(word, f"<span style='color:#FF8C00;font-weight:bold;'>{word}</span>")
-        
-    # 3. 경제/정보 (Blue)
-    blue_keywords = ["인상", "하락", "폭등", "폭락", "환율", "사기", "바가지"]
-    for word in blue_keywords:
-        text = text.replace(word, f"<span style='color:#1E90FF;font-weight:bold;'>{word}</span>")
-
-    # 4. 배경지식 (Green)
-    green_keywords = ["홍수", "침수", "뎅기열", "주류 판매 금지", "시위"]
-    for word in green_keywords:
-        text = text.replace(word, f"<span style='color:#32CD32;font-weight:bold;'>{word}</span>")
-        
-    return text
-
 def save_json(file_path, data):
     with open(file_path, 'w', encoding='utf-8') as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
 
 # --- Visitor Counter (Session + API) ---
+# Both calls only touch the in-memory counter; utils flushes to counterapi.dev in the background
 if 'visited_session' not in st.session_state:
     # First visit in this session -> Increment (Total + Daily)
     total_val, daily_val = utils.increment_visitor_stats()
@@ -709,33 +592,14 @@ def generate_news_id(title, summary=""):
     combined = f"{title}_{summary[:50]}"
     return hashlib.md5(combined.encode()).hexdigest()
 
-def get_all_comments():
-    """Load the entire comments database."""
-    # Ensure file exists
-    if not os.path.exists(COMMENTS_FILE):
-        initial_data = {"blocked_users": []}
-        save_json(COMMENTS_FILE, initial_data)
-        return initial_data
-    return load_json(COMMENTS_FILE, default={"blocked_users": []})
-
 def save_comment(news_id, nickname, text):
-    """Save a new comment to the JSON file with a spinner delay."""
-    with st.spinner("댓글 저장 중..."):
-        time.sleep(1.5) # Simulate network delay/give feedback
-        data = get_all_comments()
-        
-        # Structure: {"news_id_hash": [List of comments], "blocked_users": []}
-        if news_id not in data:
-            data[news_id] = []
-            
-        new_comment = {
-            "user": nickname if nickname else "익명",
-            "text": text,
-            "date": datetime.now().strftime("%Y-%m-%d %H:%M")
-        }
-        
-        data[news_id].append(new_comment)
-        save_json(COMMENTS_FILE, data)
+    """Append a new comment to the article's comment log (atomic, no full-file rewrite)."""
+    comment_store.add_comment(
+        news_id,
+        user=nickname if nickname else "익명",
+        text=text,
+        date=datetime.now().strftime("%Y-%m-%d %H:%M")
+    )
 
 # --------------------------------------------------------------------------------
 # ### KLOOK AFFILIATE BANNER ###
@@ -1061,15 +925,11 @@ def render_tab_news():
         selected_date_str = st.session_state["selected_date_str"]
 
         if is_search_mode:
-            # Search Mode: Scan ALL dates
-            found_topics = []
-            for d, topics in news_data.items():
-                for t in topics:
-                    if st.session_state["search_query"] in t['title'] or st.session_state["search_query"] in t['summary']:
-                        t_with_date = t.copy()
-                        t_with_date['date_str'] = d
-                        found_topics.append(t_with_date)
-            found_topics.sort(key=lambda x: x.get('date_str', ''), reverse=True)
+            # Search Mode: [OPTIMIZED] Full-text index over every stored date (incl. archive)
+            # Ranked by relevance (title > summary > body) with a recency boost
+            news_index.sync_news_index()
+            news_index.index_missing_dates(news_data)
+            found_topics = news_index.search_news(st.session_state["search_query"])
             filtered_topics_all = found_topics
             header_text = f"🔍 '{st.session_state['search_query']}' " + ("Results" if st.session_state.get('language') == 'English' else "검색 결과") + f" ({len(found_topics)})"
 
@@ -1179,7 +1039,6 @@ def render_tab_news():
                  st.info(utils.t("no_news_update"), icon="⏳")
 
         # Render Cards
-        all_comments_data = get_all_comments() # Load once
     
         for idx, topic in enumerate(topics_to_show):
             # Glass Card Wrapper - Thai-Today.com Design
@@ -1205,7 +1064,8 @@ def render_tab_news():
                 image_html = f'<img src="{safe_image_url}" style="width:100%;border-radius:12px;margin-bottom:12px;object-fit:contain;max-height:400px;background-color:#f8f9fa;" alt="News" onerror="this.style.display=\'none\';" loading="lazy"/>'
             
             # Highlight summary using HTML version
-            summary_html = highlight_text_html(topic.get('summary', ''))
+            news_id = generate_news_id(topic['title'], topic.get('summary', ''))
+            summary_html = utils.highlight_text_html(topic.get('summary', ''), topic_id=topic.get('topic_id') or news_id)
             
             # Single HTML block
             card_html = f'''<div class="news-card glass-card">
@@ -1276,8 +1136,7 @@ def render_tab_news():
 
 
             # Comments
-            news_id = generate_news_id(topic['title'], topic.get('summary', ''))
-            comments = all_comments_data.get(news_id, [])
+            comments = comment_store.get_comments(news_id) # Only this article's log
         
             with st.expander(f"💬 댓글 ({len(comments)})"):
                 if not comments:
@@ -2407,7 +2266,7 @@ def render_tab_guide():
 def render_tab_tour():
     """Render the AI Tour Coordinator tab (Korean mode replacement for Guide)."""
     # Use constants from utils
-    TOURS = utils.load_tours()
+    tours_catalog = utils.get_tour_catalog() # Cached + indexed (no sheet read per rerun)
     
     # Initialize Cart
     if 'my_cart' not in st.session_state:
@@ -2472,6 +2331,7 @@ def render_tab_tour():
             # [NEW] Translation Persistence Logic
             if current_lang == 'English':
                 updated_any = False
+                TOURS = utils.load_tours() # Editable copy for save_tours
                 for r in recs:
                     r_id = r.get("tour_id")
                     r_name_en = r.get("tour_name_en")
@@ -2512,14 +2372,11 @@ def render_tab_tour():
             # 매칭되는 투어 데이터 찾기 (ID 우선, 이름 차선)
             matched_tour = None
             if tour_id:
-                matched_tour = next((t for t in TOURS if str(t.get('id', '')) == str(tour_id)), None)
-            
-            if not matched_tour:
-                matched_tour = next((t for t in TOURS if t["name"] == tour_name), None)
+                matched_tour = tours_catalog.get(tour_id)
             
             if not matched_tour:
-                # 부분 매칭 시도
-                matched_tour = next((t for t in TOURS if tour_name in t["name"] or t["name"] in tour_name), None)
+                # 이름 일치 -> 부분 매칭 시도
+                matched_tour = tours_catalog.find_by_name(tour_name)
             
             if matched_tour:
                 if idx == 0:
@@ -2576,7 +2433,7 @@ def render_tab_tour():
     
     # --- 3. 전체 목록 (Fallback) ---
     # Filter tours by region
-    region_tours = [t for t in TOURS if t.get('region', '방콕') == selected_region]
+    region_tours = tours_catalog.by_region(selected_region)
     
     with st.expander(utils.t("all_tours_title").format(selected_region_label, len(region_tours))):
         for t in region_tours:
@@ -2610,7 +2467,7 @@ def render_tab_tour():
         st.info(utils.t("planner_guide"))
     else:
         # Cart Items Display
-        cart_tours = [t for t in TOURS if t['id'] in st.session_state['my_cart']]
+        cart_tours = [t for t in tours_catalog.all() if t['id'] in st.session_state['my_cart']]
         total_cost = 0
         
         st.markdown(f"##### {utils.t('planner_cart')}")
@@ -3024,7 +2881,7 @@ if app_mode == "Admin Console":
             with col_list:
                 st.markdown("#### 📋 투어 현황 마스터보드")
                 try:
-                    df_tours = pd.DataFrame(utils.load_tours())
+                    df_tours = pd.DataFrame(utils.get_tour_catalog().all())
                     if not df_tours.empty:
                         st.dataframe(df_tours[['id', 'region', 'name', 'price']], use_container_width=True, height=400)
                     else:
@@ -3038,7 +2895,14 @@ if app_mode == "Admin Console":
                 files_to_check = [NEWS_FILE, COMMENTS_FILE, CONFIG_FILE]
                 for f in files_to_check:
                     try:
-                        if os.path.exists(f):
+                        if os.path.isdir(f):
+                            # Directory stores (e.g. data/comments/<xx>/<news_id>.jsonl): total of all files
+                            size = sum(
+                                os.path.getsize(os.path.join(root, name))
+                                for root, _, names in os.walk(f) for name in names
+                            ) / 1024 # KB
+                            st.markdown(f"✅ `{f.rstrip('/').split('/')[-1]}/`: **{size:.1f} KB**")
+                        elif os.path.exists(f):
                             size = os.path.getsize(f) / 1024 # KB
                             st.markdown(f"✅ `{f.split('/')[-1]}`: **{size:.1f} KB**")
                         else:
@@ -3122,26 +2986,26 @@ if app_mode == "Admin Console":
 
                             col_del, col_save = st.columns([1, 1])
                             if col_save.button("수정 저장", key=f"save_{selected_date_edit}_{i}"):
+                                original_title = topics[i]['title']
                                 topics[i]['title'] = new_title
                                 topics[i]['summary'] = new_summary
                                 topics[i]['category'] = new_category
                                 topics[i]['full_translated'] = new_full
-                                news_data[selected_date_edit] = topics
-                                news_data[selected_date_edit] = topics
-                                if save_news_to_sheet(news_data):
+                                # Targeted row update (keyed by topic_id, no full-sheet rewrite)
+                                if update_news_items_in_sheet(selected_date_edit, [topics[i]], legacy_titles=[original_title]):
+                                    save_local_news_date(selected_date_edit, topics)
+                                    news_index.sync_news_index()  # Picks up the rewritten partition
                                     st.success("데이터베이스(Google Sheets)에 저장되었습니다.")
                                     st.rerun()
                                 else:
                                     st.error("저장 실패")
                                 
                             if col_del.button("삭제", key=f"del_{selected_date_edit}_{i}"):
-                                topics.pop(i)
-                                if not topics:
-                                    del news_data[selected_date_edit]
-                                else:
-                                    news_data[selected_date_edit] = topics
+                                removed = topics.pop(i)
                                 
-                                if save_news_to_sheet(news_data):
+                                if delete_news_items_from_sheet(selected_date_edit, [removed]):
+                                    save_local_news_date(selected_date_edit, topics)
+                                    news_index.sync_news_index()  # Picks up the rewritten partition
                                     st.warning("삭제 후 저장되었습니다.")
                                     st.rerun()
                                 else:
@@ -3219,18 +3083,11 @@ if app_mode == "Admin Console":
             with tab3_1:
                 st.markdown("#### 뉴스 댓글 관리")
                 try:
-                    comments_data = get_all_comments()
+                    # List all comments flatly for review
+                    all_flat_comments = comment_store.list_all_comments()
                 except Exception as e:
                     st.error(f"댓글 로드 실패: {e}")
-                    comments_data = {"blocked_users": []}
-
-                # List all comments flatly for review
-                all_flat_comments = []
-                for news_id, com_list in comments_data.items():
-                    if news_id == "blocked_users": continue
-                    for c in com_list:
-                        c['news_id'] = news_id
-                        all_flat_comments.append(c)
+                    all_flat_comments = []
                 
                 # Sort by date descending (assuming date string is comparable)
                 all_flat_comments.sort(key=lambda x: x.get('date', ''), reverse=True)
@@ -3243,15 +3100,8 @@ if app_mode == "Admin Console":
                             st.markdown(f"**{c['user']}**: {c['text']}")
                             st.caption(f"{c['date']} | ID: {c['news_id']}")
                             if st.button("삭제", key=f"adm_del_com_{idx}"):
-                                # Logic to Delete
-                                original_list = comments_data[c['news_id']]
-                                # Find index in original list to delete
-                                # Simple match by text and date
-                                for i, orig in enumerate(original_list):
-                                    if orig['text'] == c['text'] and orig['date'] == c['date']:
-                                        original_list.pop(i)
-                                        break
-                                save_json(COMMENTS_FILE, comments_data)
+                                # Tombstone by comment id (the log itself is append-only)
+                                comment_store.delete_comment(c['news_id'], c['id'])
                                 st.success("삭제됨")
                                 st.rerun()
 
@@ -3376,6 +3226,7 @@ if app_mode == "Admin Console":
                                     # Ensure defaults for General Events
                                     if not new_data.get('type'): new_data['type'] = '기타'
                                     if not new_data.get('region'): new_data['region'] = '기타'
+                                    event_index.normalize_event(new_data)
                                     
                                     events_data.insert(0, new_data)
                                     save_json(EVENTS_FILE, events_data)
@@ -3391,6 +3242,20 @@ if app_mode == "Admin Console":
             else:
                 st.info(f"총 {len(events_data)}개의 일반 이벤트/핫이슈가 있습니다.")
                 
+                # Dates the parser could not read (always shown on the events tab until fixed)
+                evt_index = event_index.load_index(EVENTS_FILE)
+                unparsed_evts = evt_index.unparsed()
+                if unparsed_evts:
+                    st.warning(f"⚠️ 날짜를 해석하지 못한 이벤트 {len(unparsed_evts)}개 (만료 처리되지 않음) - 날짜를 'YYYY-MM-DD' 또는 'YYYY-MM-DD ~ YYYY-MM-DD' 형식으로 수정해주세요.")
+                    for evt in unparsed_evts:
+                        st.caption(f"• {evt.get('title')} — `{evt.get('date')}`")
+                # Open-ended events ("YYYY-MM-DD ~") hidden once they pass the horizon
+                expired_open_evts = evt_index.expired_open()
+                if expired_open_evts:
+                    st.warning(f"⏳ 종료일 없이 {event_index.OPEN_EVENT_HORIZON_DAYS}일이 지나 숨겨진 이벤트 {len(expired_open_evts)}개 - 종료일을 입력하거나 삭제해주세요.")
+                    for evt in expired_open_evts:
+                        st.caption(f"• {evt.get('title')} — `{evt.get('date')}`")
+                
                 # Filter/Search for Admin
                 filter_txt = st.text_input("이벤트 검색", key="evt_search")
                 filtered_evts = [e for e in events_data if filter_txt.lower() in e.get('title','').lower()] if filter_txt else events_data
@@ -3413,6 +3278,7 @@ if app_mode == "Admin Console":
                                 evt['price'] = new_price
                                 evt['location'] = new_loc
                                 evt['type'] = new_type
+                                event_index.normalize_event(evt) # Re-parse date_range if the date changed
                                 save_json(EVENTS_FILE, events_data) # Check if we need to map back to original index if filtered. 
                                 # Actually filtered_evts contains references to dicts in events_data, so modding evt works.
                                 st.success("저장됨")
@@ -4039,6 +3905,7 @@ if app_mode == "Admin Console":
                     loaded = utils.load_tours_from_sheet()
                     if loaded:
                         utils.save_tours_local(loaded)
+                        utils.get_tour_catalog().replace(loaded)
                         st.success("동기화 완료! 페이지가 새로고침됩니다.")
                         time.sleep(1)
                         st.rerun()
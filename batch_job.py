@@ -2,17 +2,23 @@ import difflib
 import json
 import os
 import utils
-import requests
-from bs4 import BeautifulSoup
+import llm_cache
+import event_index
+import http_utils
+import seen_urls
 from datetime import datetime, timedelta
 import re
 
 # Files
 FEEDS_FILE = 'data/feeds.json'
-NEWS_FILE = 'data/news.json'
-PROCESSED_URLS_FILE = 'data/processed_urls.json'
+# Seen-URL store (canonical URLs + publisher ids, append-only, 30-day expiry)
+PROCESSED_URLS_FILE = seen_urls.SEEN_URLS_FILE
+SEEN_URL_USE_BLOOM = False  # True = constant-memory Bloom filter (rare false positives)
 EVENTS_FILE = 'data/events.json'
-from db_utils import load_news_from_sheet, save_news_to_sheet
+# Number of most recent dates used for the title similarity check
+SIMILARITY_WINDOW_DAYS = 1
+TOUR_PREWARM_ENABLED = True  # Fill the tour recommendation cache for common profiles
+from db_utils import load_news_from_sheet, append_news_items_to_sheet, save_news_partition, mirror_news_to_archive, LOCAL_NEWS_DIR
 
 def load_json(file_path):
     if os.path.exists(file_path):
@@ -20,8 +26,8 @@ def load_json(file_path):
             try:
                 return json.load(f)
             except json.JSONDecodeError:
-                return [] if 'processed_urls' in file_path or 'news.json' in file_path else {}
-    return [] if 'processed_urls' in file_path or 'news.json' in file_path else {}
+                return [] if 'processed_urls' in file_path else {}
+    return [] if 'processed_urls' in file_path else {}
 
 def save_json(file_path, data):
     with open(file_path, 'w', encoding='utf-8') as f:
@@ -29,7 +35,7 @@ def save_json(file_path, data):
 
 def get_image_from_entry(item):
     """
-    Extracts image URL from RSS entry or falls back to scraping OG:IMAGE.
+    Extracts image URL from RSS entry or falls back to the page's OG:IMAGE.
     """
     entry = item.get('_raw_entry')
     image_url = None
@@ -60,22 +66,13 @@ def get_image_from_entry(item):
                  if 'image' in link.get('type', ''):
                      return link.get('href')
 
-    # Step 2: Scrape meta tag (Fallback)
+    # Step 2: og:image from the shared article extraction cache (Fallback)
+    # The page is usually already downloaded by fetch_full_content during analysis.
     if not image_url and item.get('link'):
-        try:
-            print(f"   - Scraping for image: {item['link']}")
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'
-            }
-            # Timeout set to 5 seconds as requested
-            response = requests.get(item['link'], headers=headers, timeout=5)
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                og_image = soup.find("meta", property="og:image")
-                if og_image and og_image.get("content"):
-                    return og_image["content"]
-        except Exception as e:
-            print(f"   - Image scrape failed: {e}")
+        image_url = utils.extract_article(item['link'])['image_url']
+        if image_url:
+            return image_url
+        print(f"   - No og:image found: {item['link']}")
 
     return None
 
@@ -91,8 +88,10 @@ def main():
     
     # 1. Load State
     feeds = load_json(FEEDS_FILE)
-    processed_urls = set(load_json(PROCESSED_URLS_FILE))
-    # print(f"Loaded {len(processed_urls)} processed URLs.")
+    processed_urls = seen_urls.SeenUrlStore(PROCESSED_URLS_FILE, use_bloom=SEEN_URL_USE_BLOOM)
+    # [Conditional GET] ETag/Last-Modified per feed. Saved only once the run has consumed the items.
+    feed_cache = utils.load_feed_cache()
+    print(f"Loaded {len(processed_urls)} processed URLs.")
     
     if not feeds:
         print("No feeds found. Exiting.")
@@ -100,14 +99,15 @@ def main():
 
     # 2. Fetch RSS (Balanced)
     print("Fetching RSS feeds (Balanced Mode)...")
-    all_news_items = utils.fetch_balanced_rss(feeds, processed_urls)
+    all_news_items = utils.fetch_balanced_rss(feeds, processed_urls, feed_cache=feed_cache)
     
     # [NEW] Add Google News Backup
     print("Fetching Google News (Backup)...")
-    google_news_items = utils.fetch_google_news_rss(query="Thailand Tourism")
+    google_news_items = utils.fetch_google_news_rss(query="Thailand Tourism", feed_cache=feed_cache)
     all_news_items.extend(google_news_items)
     
     print(f"Total items fetched: {len(all_news_items)}")
+    print(f"HTTP latency by host: {http_utils.get_latency_stats()}")
     
     # 3. Filter Duplicates (Strict Check + Similarity)
     recent_titles = []
@@ -115,10 +115,13 @@ def main():
     current_news = load_news_from_sheet()
     
     if isinstance(current_news, dict):
-        # 24-Hour Comparison Window (Only compare with the most recent day)
-        latest_date = sorted(current_news.keys(), reverse=True)[0] if current_news else None
-        if latest_date:
-            for topic in current_news[latest_date]:
+        # Keep local partitions (main + archive, searched by the app's news index) in step with the sheet, edits included
+        mirrored = mirror_news_to_archive({d: items for d, items in current_news.items() if d != today_str})
+        if mirrored:
+            print(f"Re-synced {mirrored} dates from the sheet into the local news store.")
+        # Comparison Window (default: only the most recent day)
+        for window_date in sorted(current_news.keys(), reverse=True)[:SIMILARITY_WINDOW_DAYS]:
+            for topic in current_news[window_date]:
                 recent_titles.append(topic['title'])
                 for ref in topic.get('references', []):
                     if isinstance(ref, dict) and ref.get('title'):
@@ -128,14 +131,8 @@ def main():
                          pass
 
     print(f"Loaded {len(recent_titles)} recent titles for similarity check.")
-
-    processed_ids = set()
-    for url in processed_urls:
-        if 'bangkokpost.com' in url:
-            parts = url.split('/')
-            for p in parts:
-                if p.isdigit() and len(p) >= 6:
-                    processed_ids.add(p)
+    # Length-sorted index + difflib's upper bounds -> full ratio only for titles that can exceed the threshold
+    title_index = utils.TitleIndex(recent_titles)
 
     new_items_with_ratios = []
     
@@ -147,16 +144,8 @@ def main():
         if not is_update_news and item['link'] in processed_urls:
             continue
             
-        # B. ID Match (Bangkok Post)
-        is_dup_id = False
-        if not is_update_news and 'bangkokpost.com' in item['link']:
-            parts = item['link'].split('/')
-            for p in parts:
-                if p.isdigit() and len(p) >= 6:
-                    if p in processed_ids:
-                        is_dup_id = True
-                        break
-        if is_dup_id:
+        # B. ID Match (Bangkok Post: same article id under a different slug)
+        if not is_update_news and processed_urls.has_publisher_id(item['link']):
             print(f"Duplicate ID found, skipping: {item['title']}")
             continue
 
@@ -173,8 +162,7 @@ def main():
         threshold = 0.85 if is_today_item else 0.6
         
         if not is_update_news:
-            for existing_title in recent_titles:
-                ratio = difflib.SequenceMatcher(None, item['title'].lower(), existing_title.lower()).ratio()
+            for existing_title, ratio in title_index.ratios(item['title'], threshold):
                 if ratio > max_ratio:
                     max_ratio = ratio
                     matching_title = existing_title
@@ -206,10 +194,7 @@ def main():
         for item in all_news_items:
             if item['link'] in processed_urls: continue
             
-            m_ratio = 0
-            for ext in recent_titles:
-                r = difflib.SequenceMatcher(None, item['title'].lower(), ext.lower()).ratio()
-                if r > m_ratio: m_ratio = r
+            m_ratio = max((r for _, r in title_index.ratios(item['title'])), default=0)
             fallback_candidates.append({"item": item, "max_ratio": m_ratio})
             
         fallback_candidates.sort(key=lambda x: x['max_ratio'])
@@ -222,20 +207,21 @@ def main():
 
     if not new_items:
         print("No new items to process.")
+        # Every candidate was already seen or rejected as similar -> feeds are consumed
+        utils.commit_feed_cache(feed_cache)
+        utils.save_feed_cache(feed_cache)
         return
 
     # 4. Selection (Expanded for Score Filtering)
     # Ensure items within the SAME batch are not too similar
     batch_deduped = []
+    batch_index = utils.TitleIndex()
     for candidate in new_items:
-        is_internal_dup = False
-        for chosen in batch_deduped:
-            r = difflib.SequenceMatcher(None, candidate['title'].lower(), chosen['title'].lower()).ratio()
-            if r > 0.85: # Very strict within the same batch
-                is_internal_dup = True
-                break
+        # Very strict within the same batch
+        is_internal_dup = any(r > 0.85 for _, r in batch_index.ratios(candidate['title'], 0.85))
         if not is_internal_dup:
             batch_deduped.append(candidate)
+            batch_index.add(candidate['title'])
             
     target_items = batch_deduped[:8] 
     print(f"Items selected for API call (after internal dedup): {len(target_items)}")
@@ -260,6 +246,8 @@ def main():
     print("Calling Gemini API...")
     analysis_result, error_msg = utils.analyze_news_with_gemini(target_items, api_key, recent_titles, current_time_str)
     
+    print(f"LLM cache stats: {llm_cache.get_stats()}")
+    
     if error_msg:
         print(f"Analysis failed: {error_msg}")
         return
@@ -322,6 +310,7 @@ def main():
 
     # Extract topics and append to today's list
     new_topics_count = 0
+    new_topics = []
     for topic in analysis_result.get('topics', []):
         # 1. Title Duplication Check (Strict)
         if topic['title'] in existing_today_titles:
@@ -388,13 +377,17 @@ def main():
             topic['image_url'] = first_image
             
         current_news[today_str].append(topic)
+        new_topics.append(topic)
         existing_today_titles.add(topic['title'])
         new_topics_count += 1
         
-    save_news_to_sheet(current_news)
-    save_json(NEWS_FILE, current_news) # Fix: Missing local save
+    utils.save_article_cache()
+    # Append only this run's topics (no full-sheet rewrite)
+    append_news_items_to_sheet({today_str: new_topics})
+    # Local store: rewrite only today's partition
+    save_news_partition(today_str, current_news[today_str])
     print(f"Saved {new_topics_count} new topics to Google Sheets under key '{today_str}'")
-    print(f"Saved {new_topics_count} new topics to {NEWS_FILE} under key '{today_str}'")
+    print(f"Saved {new_topics_count} new topics to {LOCAL_NEWS_DIR}/{today_str}.json")
 
     # 7-1. Cross-post Travel News to Events
     # Filter for '여행/관광' category
@@ -433,6 +426,7 @@ def main():
                     "type": "축제/이벤트",
                     "description": item.get('summary', '')
                 }
+                event_index.normalize_event(new_event) # date_range (start/end) parsed once here
                 
                 # Prepend to top
                 events_data.insert(0, new_event)
@@ -469,8 +463,14 @@ def main():
     else:
         print(f"Marked {processed_count} URLs as processed.")
     
-    save_json(PROCESSED_URLS_FILE, list(processed_urls))
-    print(f"Updated {PROCESSED_URLS_FILE} with {len(target_items)} new URLs.")
+    appended = processed_urls.flush()
+    print(f"Appended {appended} new URLs to {PROCESSED_URLS_FILE}.")
+    # Feeds with candidates left over (beyond the batch cap / failed) keep their old
+    # validators, so their unseen items are parsed again next run
+    pending_links = [item['link'] for item in new_items if item['link'] not in processed_urls]
+    committed = utils.commit_feed_cache(feed_cache, pending_links)
+    print(f"Feed cache: committed {committed} feeds, {len(pending_links)} items pending.")
+    utils.save_feed_cache(feed_cache)
 
     # 8. Update Twitter Trends
     print("Fetching Twitter Trends...")
@@ -485,5 +485,16 @@ def main():
     else:
         print("No critical twitter trends found or fetch failed.")
 
+def prewarm_tours():
+    """Pre-computes tour recommendations for common profiles (data/tour_recommendations.json)."""
+    if not TOUR_PREWARM_ENABLED:
+        return
+    try:
+        calls = utils.prewarm_tour_recommendations()
+        print(f"Tour recommendation pre-warm: {calls} Gemini calls")
+    except Exception as e:
+        print(f"Tour recommendation pre-warm failed: {e}")
+
 if __name__ == "__main__":
     main()
+    prewarm_tours()
@@ -2,7 +2,7 @@ import utils
 import json
 import os
 import time
-from db_utils import load_news_from_sheet, save_news_to_sheet
+from db_utils import load_news_from_sheet, save_news_to_sheet, save_news_partitions, LOCAL_NEWS_DIR
 
 def cleanup_translations():
     print("Starting translation cleanup for all existing news...")
@@ -56,13 +56,12 @@ def cleanup_translations():
     if updated_count > 0:
         print(f"Successfully updated {updated_count} fields across the database.")
         
-        # ALWAYS save local news.json first to preserve progress
+        # ALWAYS save the local news store first to preserve progress
         try:
-            with open('data/news.json', 'w', encoding='utf-8') as f:
-                json.dump(news_data, f, ensure_ascii=False, indent=2)
-            print("Successfully updated local data/news.json.")
+            save_news_partitions(news_data)
+            print(f"Successfully updated local {LOCAL_NEWS_DIR}/.")
         except Exception as e:
-            print(f"Failed to save local news.json: {e}")
+            print(f"Failed to save local news store: {e}")
 
         # Then attempt GSheet sync
         print("Syncing cleaned data back to Google Sheets...")
@@ -70,7 +69,7 @@ def cleanup_translations():
         if success:
             print("Successfully synced cleaned data back to Google Sheets.")
         else:
-            print("Failed to sync to Google Sheets. Progress is saved locally in data/news.json.")
+            print("Failed to sync to Google Sheets. Progress is saved locally in data/news/.")
     else:
         print("No Thai fields found (or all failed). Database is clean.")
 
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import threading
+import uuid
+
+# News comments, one append-only log per article:
+#   data/comments/<first 2 hex chars of news_id>/<news_id>.jsonl
+# Each line is a comment or a deletion tombstone. A line is written with a
+# single O_APPEND write, so concurrent sessions never overwrite each other,
+# and reading one article's comments never touches the others.
+COMMENTS_DIR = "data/comments"
+LEGACY_COMMENTS_FILE = "data/comments.json"
+_LEGACY_RESERVED_KEYS = {"comments", "blocked_users"}
+
+_migrate_lock = threading.Lock()
+_migrated = False
+
+
+def _shard_path(news_id, base_dir=COMMENTS_DIR):
+    news_id = str(news_id)
+    return os.path.join(base_dir, news_id[:2], f"{news_id}.jsonl")
+
+
+def _append(news_id, record, base_dir=COMMENTS_DIR):
+    path = _shard_path(news_id, base_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+
+def _legacy_comment_id(news_id, comment):
+    seed = f"{news_id}|{comment.get('date', '')}|{comment.get('user', '')}|{comment.get('text', '')}"
+    return hashlib.md5(seed.encode("utf-8")).hexdigest()[:12]
+
+
+def _ensure_migrated():
+    """Splits the legacy data/comments.json into per-article logs (once)."""
+    global _migrated
+    if _migrated:
+        return
+    with _migrate_lock:
+        if _migrated:
+            return
+        if not os.path.exists(COMMENTS_DIR) and os.path.exists(LEGACY_COMMENTS_FILE):
+            try:
+                with open(LEGACY_COMMENTS_FILE, 'r', encoding='utf-8') as f:
+                    legacy = json.load(f)
+                # Build next to the target and rename, so a crash never leaves a half-migrated store
+                tmp_dir = f"{COMMENTS_DIR}.tmp"
+                if os.path.exists(tmp_dir):
+                    import shutil
+                    shutil.rmtree(tmp_dir)
+                for news_id, comments in legacy.items():
+                    if news_id in _LEGACY_RESERVED_KEYS or not isinstance(comments, list):
+                        continue
+                    for comment in comments:
+                        record = dict(comment)
+                        record.setdefault("id", _legacy_comment_id(news_id, comment))
+                        _append(news_id, record, base_dir=tmp_dir)
+                os.makedirs(tmp_dir, exist_ok=True)
+                os.replace(tmp_dir, COMMENTS_DIR)
+                print(f"Migrated {LEGACY_COMMENTS_FILE} -> {COMMENTS_DIR}/")
+            except Exception as e:
+                print(f"Comment migration error: {e}")
+        _migrated = True
+
+
+def _read_log(path):
+    comments, deleted = [], set()
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Torn line from a crashed writer
+            if record.get("op") == "delete":
+                deleted.add(record.get("id"))
+            else:
+                comments.append(record)
+    return [c for c in comments if c.get("id") not in deleted]
+
+
+def get_comments(news_id):
+    """Returns the comments of one article (oldest first)."""
+    _ensure_migrated()
+    path = _shard_path(news_id)
+    if not os.path.exists(path):
+        return []
+    try:
+        return _read_log(path)
+    except Exception as e:
+        print(f"Comment read error ({news_id}): {e}")
+        return []
+
+
+def add_comment(news_id, user, text, date):
+    """Appends one comment. Returns the stored record."""
+    _ensure_migrated()
+    record = {"id": uuid.uuid4().hex[:12], "user": user, "text": text, "date": date}
+    _append(news_id, record)
+    return record
+
+
+def delete_comment(news_id, comment_id):
+    """Appends a tombstone (logs are never rewritten)."""
+    _ensure_migrated()
+    _append(news_id, {"op": "delete", "id": comment_id})
+
+
+def list_all_comments():
+    """Every comment with its 'news_id' (admin review; walks all logs)."""
+    _ensure_migrated()
+    results = []
+    if not os.path.exists(COMMENTS_DIR):
+        return results
+    for shard in sorted(os.listdir(COMMENTS_DIR)):
+        shard_dir = os.path.join(COMMENTS_DIR, shard)
+        if not os.path.isdir(shard_dir):
+            continue
+        for filename in os.listdir(shard_dir):
+            if not filename.endswith(".jsonl"):
+                continue
+            news_id = filename[:-len(".jsonl")]
+            for comment in _read_log(os.path.join(shard_dir, filename)):
+                comment["news_id"] = news_id
+                results.append(comment)
+    return results
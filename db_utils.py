@@ -2,38 +2,166 @@
 import streamlit as st
 import pandas as pd
 from streamlit_gsheets import GSheetsConnection
+import copy
+import hashlib
 import json
 import os
+import threading
+import time
 from datetime import datetime, timedelta
 
 # SPREADSHEET URL (Public/Shared)
 SPREADSHEET_URL = "https://docs.google.com/spreadsheets/d/1xa6Vwpx7jhaT_YqX6n1pvh0VdLY4N277hdq3QWMNEV8/edit?usp=sharing"
 
-# Local cache file path
+# --- LOCAL PARTITIONED NEWS STORE ---
+# One compact JSON file per date + a small manifest:
+#   data/news/2025-01-01.json, data/news/manifest.json ({date: {count, updated_at, hash}})
+# Loaders read only the partitions they need; writers replace one partition
+# via tmp file + os.replace so readers never see a torn file.
+LOCAL_NEWS_DIR = "data/news"
+ARCHIVE_NEWS_DIR = "data/news_archive"
+MANIFEST_FILE = "manifest.json"
+
+# Legacy monolithic files (split into partitions on first access)
 LOCAL_NEWS_CACHE = "data/news.json"
+ARCHIVE_NEWS_CACHE = "data/archive_news.json"
+_LEGACY_FILES = {LOCAL_NEWS_DIR: LOCAL_NEWS_CACHE, ARCHIVE_NEWS_DIR: ARCHIVE_NEWS_CACHE}
 
-def load_local_news_cache(days=7):
+def _atomic_write_json(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+def _partition_path(store_dir, date_key):
+    return os.path.join(store_dir, f"{date_key}.json")
+
+def _read_manifest(store_dir):
+    path = os.path.join(store_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        return manifest if isinstance(manifest, dict) else None
+    except Exception as e:
+        print(f"Error reading news manifest {path}: {e}")
+        return None
+
+def _load_manifest(store_dir):
+    """Returns the manifest, migrating the legacy monolithic file if needed."""
+    manifest = _read_manifest(store_dir)
+    if manifest is not None:
+        return manifest
+    
+    manifest = {"dates": {}}
+    legacy_file = _LEGACY_FILES.get(store_dir)
+    if legacy_file and os.path.exists(legacy_file):
+        try:
+            with open(legacy_file, 'r', encoding='utf-8') as f:
+                legacy = json.load(f)
+            if isinstance(legacy, dict) and legacy:
+                print(f"Migrating {legacy_file} -> {store_dir}/ ({len(legacy)} dates)")
+                save_news_partitions(legacy, store_dir)
+                manifest = _read_manifest(store_dir) or manifest
+        except Exception as e:
+            print(f"Error migrating {legacy_file}: {e}")
+    return manifest
+
+def list_news_dates(store_dir=LOCAL_NEWS_DIR):
+    """Returns stored dates (newest first) without opening any partition."""
+    return sorted(_load_manifest(store_dir).get("dates", {}).keys(), reverse=True)
+
+def get_news_store_mtime(store_dir=LOCAL_NEWS_DIR):
+    """Last write time of the store (manifest mtime), or None."""
+    path = os.path.join(store_dir, MANIFEST_FILE)
+    return os.path.getmtime(path) if os.path.exists(path) else None
+
+def load_news_partitions(store_dir=LOCAL_NEWS_DIR, dates=None, since_date=None):
+    """
+    Reads only the requested partitions.
+    dates: iterable of "YYYY-MM-DD" (None = all); since_date: keep dates >= since_date
+    Returns: dict { "YYYY-MM-DD": [items] } (newest date first)
     """
-    [FAST] Loads news from local JSON file.
-    Returns only recent N days for consistency with GSheets version.
+    available = list_news_dates(store_dir)
+    if dates is not None:
+        wanted = set(dates)
+        available = [d for d in available if d in wanted]
+    if since_date:
+        available = [d for d in available if d >= since_date]
     
-    Returns: dict { "YYYY-MM-DD": [items] } or {} if file doesn't exist
+    news_by_date = {}
+    for date_key in available:
+        items = load_news_partition(date_key, store_dir)
+        if items is not None:
+            news_by_date[date_key] = items
+    return news_by_date
+
+def load_news_partition(date_key, store_dir=LOCAL_NEWS_DIR):
+    """Returns the items stored for one date, or None if that partition does not exist."""
+    if not os.path.exists(os.path.join(store_dir, MANIFEST_FILE)):
+        _load_manifest(store_dir) # Migrates the legacy monolithic file once
+    path = _partition_path(store_dir, date_key)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            items = json.load(f)
+        return items if isinstance(items, list) else None
+    except Exception as e:
+        print(f"Error reading news partition {path}: {e}")
+        return None
+
+def _content_hash(items):
+    """Stable hash of a date's items (manifest 'hash'; detects edits that keep the count)."""
+    payload = json.dumps(items, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.md5(payload.encode('utf-8')).hexdigest()
+
+def save_news_partitions(news_by_date, store_dir=LOCAL_NEWS_DIR):
+    """Writes the given dates' partitions (others untouched) and updates the manifest once."""
+    os.makedirs(store_dir, exist_ok=True)
+    manifest = _read_manifest(store_dir) or {"dates": {}}
+    now_str = datetime.now().isoformat(timespec='seconds')
+    for date_key, items in news_by_date.items():
+        _atomic_write_json(_partition_path(store_dir, date_key), items)
+        manifest.setdefault("dates", {})[date_key] = {
+            "count": len(items), "updated_at": now_str, "hash": _content_hash(items)
+        }
+    _atomic_write_json(os.path.join(store_dir, MANIFEST_FILE), manifest)
+
+def save_news_partition(date_key, items, store_dir=LOCAL_NEWS_DIR):
+    save_news_partitions({date_key: items}, store_dir)
+
+def _local_store_for(date_key):
+    """Store holding the date: the main store wins, then the archive; new past dates go to the archive."""
+    if date_key in _load_manifest(LOCAL_NEWS_DIR).get("dates", {}):
+        return LOCAL_NEWS_DIR
+    if date_key in _load_manifest(ARCHIVE_NEWS_DIR).get("dates", {}):
+        return ARCHIVE_NEWS_DIR
+    return LOCAL_NEWS_DIR if date_key >= datetime.now().strftime("%Y-%m-%d") else ARCHIVE_NEWS_DIR
+
+def save_local_news_date(date_key, items):
     """
-    if not os.path.exists(LOCAL_NEWS_CACHE):
-        return {}
+    Write-through for admin edits/deletes: rewrites the date's partition in whichever local
+    store holds it, so the app, the news index and the next batch run see the edit.
+    Returns: the store dir written
+    """
+    store_dir = _local_store_for(date_key)
+    save_news_partition(date_key, items, store_dir)
+    return store_dir
+
+def load_local_news_cache(days=7):
+    """
+    [FAST] Loads news from the local partitioned store.
+    Returns only recent N days for consistency with GSheets version
+    (only those partitions are opened).
     
+    Returns: dict { "YYYY-MM-DD": [items] } or {} if the store is empty
+    """
     try:
-        with open(LOCAL_NEWS_CACHE, 'r', encoding='utf-8') as f:
-            all_news = json.load(f)
-        
-        if not isinstance(all_news, dict):
-            return {}
-        
         # Filter to recent N days
         cutoff_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
-        recent_news = {k: v for k, v in all_news.items() if k >= cutoff_date}
-        
-        return recent_news
+        return load_news_partitions(LOCAL_NEWS_DIR, since_date=cutoff_date)
     except Exception as e:
         print(f"Error loading local news cache: {e}")
         return {}
@@ -51,72 +179,143 @@ def get_db_connection():
         print(f"DB Connection Error: {e}")
         return None
 
-# --- NEWS CRUD OPERATIONS ---
+# --- SHEET -> NEWS DECODER ---
 
-def load_news_from_sheet(worksheet="news"):
+def _parse_json_cell(val):
+    """GSheets stores list/dict fields as strings. Returns the parsed value or the original string."""
+    if not isinstance(val, str):
+        return val
+    stripped = val.strip()
+    if not (stripped.startswith('[') or stripped.startswith('{')):
+        return val
+    try:
+        return json.loads(stripped)
+    except Exception:
+        try:
+            import ast
+            return ast.literal_eval(stripped)
+        except Exception:
+            return val # Keep as string if all parse fails
+
+def _fallback_link(link, refs):
+    if isinstance(refs, list) and refs and isinstance(refs[0], dict):
+        return refs[0].get('url', "#")
+    if isinstance(refs, str) and refs.startswith('http'):
+        return refs
+    return link
+
+def decode_news_frame(df, since_date=None, on_date=None):
     """
-    Reads all news data from the specified worksheet.
-    Returns a list of dictionaries (records).
+    Converts the 'news' worksheet DataFrame into { "YYYY-MM-DD": [items] }.
+    
+    Date normalization, NaN cleaning and the date filter are vectorized;
+    JSON columns are parsed only for rows that survive the filter.
+    
+    since_date: keep rows with date >= since_date ("YYYY-MM-DD")
+    on_date: keep rows with date == on_date
     """
-    conn = get_db_connection()
-    if not conn:
+    if df is None or df.empty or 'date' not in df.columns:
         return {}
-
-    try:
+    
+    df = df[df['date'].notna()]
+    
+    # Robust Date Parsing (Handle '2024-01-01T...' and '2024-01-01 00:00:00')
+    dates = df['date'].astype(str).str.split('T').str[0].str.split(' ').str[0]
+    mask = pd.Series(True, index=df.index)
+    if since_date:
+        mask &= dates >= since_date
+    if on_date:
+        mask &= dates == on_date
+    df = df[mask]
+    dates = dates[mask]
+    if df.empty:
+        return {}
+    
+    # Clean up NaN values
+    df = df.astype(object).where(df.notna(), "")
+    
+    # Parse JSON fields (only surviving rows)
+    for field in ['references', 'related_topics']:
+        if field in df.columns:
+            df[field] = df[field].map(_parse_json_cell)
+    
+    # Ensure 'link' exists for UI compatibility (Fallback to first reference)
+    if 'references' in df.columns:
+        link_col = df['link'] if 'link' in df.columns else pd.Series("", index=df.index, dtype=object)
+        missing = link_col.isin(["", "#"])
+        if missing.any():
+            link_col = link_col.copy()
+            link_col.loc[missing] = [
+                _fallback_link(link, refs)
+                for link, refs in zip(link_col[missing], df.loc[missing, 'references'])
+            ]
+            df['link'] = link_col
+    
+    # Group by date in one pass (keeps first-seen date order)
+    news_by_date = {}
+    for date_str, record in zip(dates.tolist(), df.to_dict(orient="records")):
+        news_by_date.setdefault(date_str, []).append(record)
+    return news_by_date
+
+# --- IN-PROCESS NEWS STORE ---
+# The worksheet is downloaded at most once per NEWS_STORE_TTL and kept as a
+# { "YYYY-MM-DD": [items] } index. Full-corpus, recent-window and single-date
+# queries are all answered from memory. save_news_to_sheet() invalidates it.
+NEWS_STORE_TTL = 300  # seconds
+
+_news_stores = {}  # { worksheet: {"index": dict, "fetched_at": float} }
+_news_store_lock = threading.Lock()
+
+def _get_news_index(worksheet="news", force_refresh=False):
+    """
+    Returns the shared date -> items index for the worksheet (treat as read-only),
+    or None if the sheet could not be read.
+    """
+    with _news_store_lock:
+        store = _news_stores.get(worksheet)
+        if store and not force_refresh and (time.time() - store["fetched_at"]) < NEWS_STORE_TTL:
+            return store["index"]
+        
+        conn = get_db_connection()
+        if not conn:
+            return None
+        
         # Read as DataFrame (Explicitly pass spreadsheet to avoid config errors)
-        df = conn.read(spreadsheet=SPREADSHEET_URL, worksheet=worksheet, ttl=0) # ttl=0 to always fetch fresh, or manage manually
+        # ttl=0: freshness is managed by this store
+        df = conn.read(spreadsheet=SPREADSHEET_URL, worksheet=worksheet, ttl=0)
         
-        # Determine if data exists
-        if df.empty:
-            return {}
-
         # Expected Columns in Sheet:
         # date (YYYY-MM-DD), title, summary, link, source, category, impact_score, image_url, ...
         # JSON structure was: { "2024-01-01": [ {item}, {item} ] }
-        
-        # Convert DF to list of dicts
-        records = df.to_dict(orient="records")
-        
-        # Transform back to Dict-by-Date structure for App compatibility
-        news_by_date = {}
-        for item in records:
-            # Handle potential NaN/Nat
-            if pd.isna(item.get('date')): continue
-            
-            # Robust Date Parsing (Handle '2024-01-01T...' and '2024-01-01 00:00:00')
-            date_str = str(item['date']).split('T')[0].split(' ')[0] # Ensure YYYY-MM-DD string
-            if date_str not in news_by_date:
-                news_by_date[date_str] = []
-            
-            # Clean up NaN values in item
-            clean_item = {k: (v if not pd.isna(v) else "") for k, v in item.items()}
-
-            # Parse JSON fields if they are strings (GSHEETS stores list/dict as string)
-            for field in ['references', 'related_topics']:
-                if field in clean_item and isinstance(clean_item[field], str):
-                     # Simple check if it looks like JSON list or dict
-                    val = str(clean_item[field]).strip()
-                    if val.startswith('[') or val.startswith('{'):
-                        try:
-                            clean_item[field] = json.loads(val)
-                        except:
-                            try:
-                                import ast
-                                clean_item[field] = ast.literal_eval(val)
-                            except:
-                                pass # Keep as string if all parse fails
-
-            # Ensure 'link' exists for UI compatibility (Fallback to first reference)
-            if not clean_item.get('link') or clean_item['link'] == "" or clean_item['link'] == "#":
-                refs = clean_item.get('references')
-                if isinstance(refs, list) and refs:
-                    clean_item['link'] = refs[0].get('url', "#")
-                elif isinstance(refs, str) and refs.startswith('http'):
-                    clean_item['link'] = refs
-
-            news_by_date[date_str].append(clean_item)
-            
-        return news_by_date
+        index = decode_news_frame(df)
+        _news_stores[worksheet] = {"index": index, "fetched_at": time.time()}
+        return index
+
+def invalidate_news_store(worksheet=None):
+    """Drops the in-memory news index (all worksheets if None)."""
+    with _news_store_lock:
+        if worksheet is None:
+            _news_stores.clear()
+        else:
+            _news_stores.pop(worksheet, None)
+
+def _copy_dates(index, dates):
+    # Deep copies so callers can append/remove/edit items (e.g. admin edits before a
+    # failed sheet write) without touching the shared index
+    return {d: copy.deepcopy(index[d]) for d in dates}
+
+# --- NEWS CRUD OPERATIONS ---
+
+def load_news_from_sheet(worksheet="news", force_refresh=False):
+    """
+    Reads all news data from the specified worksheet (via the in-process store).
+    Returns: dict { "YYYY-MM-DD": [items] }
+    """
+    try:
+        index = _get_news_index(worksheet, force_refresh=force_refresh)
+        if not index:
+            return {}
+        return _copy_dates(index, index.keys())
 
     except Exception as e:
         print(f"Error loading news from sheet: {e}")
@@ -124,203 +323,116 @@ def load_news_from_sheet(worksheet="news"):
 
 def load_recent_news(days=7):
     """
-    [OPTIMIZED] Loads only recent N days of news with TTL caching.
+    [OPTIMIZED] Loads only recent N days of news from the in-process store.
     
-    - Uses TTL=300 (5 min) to cache GSheets API results
-    - Filters to only recent 'days' worth of data for faster processing
-    - Falls back to full load if filtering fails
+    - The sheet is downloaded at most once per NEWS_STORE_TTL (5 min)
+    - Only date keys within the window are copied out
     
     Returns: dict { "YYYY-MM-DD": [items] }
     """
-    conn = get_db_connection()
-    if not conn:
-        return {}
-
     try:
-        # TTL=300 (5 minutes) - Key optimization for repeat loads
-        df = conn.read(spreadsheet=SPREADSHEET_URL, worksheet="news", ttl=300)
-        
-        if df.empty:
+        index = _get_news_index("news")
+        if not index:
             return {}
         
         # Calculate cutoff date
-        from datetime import timedelta
         cutoff_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
         
-        # Convert to records
-        records = df.to_dict(orient="records")
-        
-        # Transform to Dict-by-Date structure (same as original)
-        news_by_date = {}
-        for item in records:
-            if pd.isna(item.get('date')): continue
-            
-            date_str = str(item['date']).split('T')[0].split(' ')[0]
-            
-            # Skip old dates (the optimization)
-            if date_str < cutoff_date:
-                continue
-                
-            if date_str not in news_by_date:
-                news_by_date[date_str] = []
-            
-            # Clean up NaN values
-            clean_item = {k: (v if not pd.isna(v) else "") for k, v in item.items()}
-
-            # Parse JSON fields
-            for field in ['references', 'related_topics']:
-                if field in clean_item and isinstance(clean_item[field], str):
-                    val = str(clean_item[field]).strip()
-                    if val.startswith('[') or val.startswith('{'):
-                        try:
-                            clean_item[field] = json.loads(val)
-                        except:
-                            try:
-                                import ast
-                                clean_item[field] = ast.literal_eval(val)
-                            except:
-                                pass
-
-            # Ensure 'link' exists
-            if not clean_item.get('link') or clean_item['link'] == "" or clean_item['link'] == "#":
-                refs = clean_item.get('references')
-                if isinstance(refs, list) and refs:
-                    clean_item['link'] = refs[0].get('url', "#")
-                elif isinstance(refs, str) and refs.startswith('http'):
-                    clean_item['link'] = refs
-
-            news_by_date[date_str].append(clean_item)
-            
-        return news_by_date
+        # Skip old dates (the optimization)
+        return _copy_dates(index, [d for d in index.keys() if d >= cutoff_date])
 
     except Exception as e:
         print(f"Error loading recent news: {e}")
-        # Fallback to full load on error
-        return load_news_from_sheet()
+        return {}
 
 def load_news_by_date(target_date):
     """
     [ON-DEMAND] Loads news for a specific date only.
     
     Used when user selects a date outside the recent window.
-    Cached per-date to avoid repeat fetches.
+    O(1) lookup in the in-process store (no extra sheet download).
     
     Args:
         target_date: "YYYY-MM-DD" string
     
     Returns: list of news items for that date, or []
     """
-    conn = get_db_connection()
-    if not conn:
-        return []
-
     try:
-        # TTL=600 (10 min) for specific date queries
-        df = conn.read(spreadsheet=SPREADSHEET_URL, worksheet="news", ttl=600)
-        
-        if df.empty:
+        index = _get_news_index("news")
+        if not index:
             return []
-        
-        # Filter to target date only
-        records = df.to_dict(orient="records")
-        items = []
-        
-        for item in records:
-            if pd.isna(item.get('date')): continue
-            
-            date_str = str(item['date']).split('T')[0].split(' ')[0]
-            
-            if date_str != target_date:
-                continue
-            
-            # Clean up NaN values
-            clean_item = {k: (v if not pd.isna(v) else "") for k, v in item.items()}
-
-            # Parse JSON fields
-            for field in ['references', 'related_topics']:
-                if field in clean_item and isinstance(clean_item[field], str):
-                    val = str(clean_item[field]).strip()
-                    if val.startswith('[') or val.startswith('{'):
-                        try:
-                            clean_item[field] = json.loads(val)
-                        except:
-                            pass
-
-            # Ensure 'link' exists
-            if not clean_item.get('link') or clean_item['link'] == "" or clean_item['link'] == "#":
-                refs = clean_item.get('references')
-                if isinstance(refs, list) and refs:
-                    clean_item['link'] = refs[0].get('url', "#")
-
-            items.append(clean_item)
-            
-        return items
+        return copy.deepcopy(index.get(target_date, []))
 
     except Exception as e:
         print(f"Error loading news for date {target_date}: {e}")
         return []
 
-# Archive cache file path
-ARCHIVE_NEWS_CACHE = "data/archive_news.json"
-
 def get_news_for_date(target_date: str) -> list:
     """
     [LAZY LOADING] 특정 날짜의 뉴스를 가져옵니다.
     
-    1. 로컬 전체 캐시(news.json)에서 먼저 확인 (0.01s)
-    2. 아카이브 캐시에서 확인 (0.01s)  
+    1. 로컬 파티션(data/news/{date}.json)에서 먼저 확인 (0.01s)
+    2. 아카이브 파티션(data/news_archive/{date}.json)에서 확인 (0.01s)  
     3. 없으면 GSheets에서 해당 날짜만 쿼리 (2-3s)
-    4. 가져온 데이터를 아카이브에 저장 (재조회 최적화)
+    4. 가져온 데이터를 아카이브 파티션으로 저장 (재조회 최적화)
     
     Args:
         target_date: "YYYY-MM-DD" 형식 문자열
     
     Returns: list of news items for that date
     """
-    # Step 1: 로컬 메인 캐시 확인 (전체 파일에서 해당 날짜만)
-    if os.path.exists(LOCAL_NEWS_CACHE):
-        try:
-            with open(LOCAL_NEWS_CACHE, 'r', encoding='utf-8') as f:
-                all_news = json.load(f)
-            if isinstance(all_news, dict) and target_date in all_news:
-                return all_news[target_date]
-        except Exception as e:
-            print(f"Error reading local cache: {e}")
+    # Step 1: 로컬 메인 파티션 확인
+    items = load_news_partition(target_date, LOCAL_NEWS_DIR)
+    if items is not None:
+        return items
     
-    # Step 2: 아카이브 캐시 확인
-    if os.path.exists(ARCHIVE_NEWS_CACHE):
-        try:
-            with open(ARCHIVE_NEWS_CACHE, 'r', encoding='utf-8') as f:
-                archive = json.load(f)
-            if isinstance(archive, dict) and target_date in archive:
-                return archive[target_date]
-        except Exception as e:
-            print(f"Error reading archive cache: {e}")
+    # Step 2: 아카이브 파티션 확인
+    items = load_news_partition(target_date, ARCHIVE_NEWS_DIR)
+    if items is not None:
+        return items
     
     # Step 3: GSheets에서 온디맨드 로드
     items = load_news_by_date(target_date)
     
-    # Step 4: 아카이브에 저장 (재조회 최적화)
+    # Step 4: 아카이브에 저장 (해당 날짜 파티션만 기록)
     if items:
         try:
-            archive = {}
-            if os.path.exists(ARCHIVE_NEWS_CACHE):
-                with open(ARCHIVE_NEWS_CACHE, 'r', encoding='utf-8') as f:
-                    archive = json.load(f)
-                if not isinstance(archive, dict):
-                    archive = {}
-            archive[target_date] = items
-            with open(ARCHIVE_NEWS_CACHE, 'w', encoding='utf-8') as f:
-                json.dump(archive, f, ensure_ascii=False, indent=2)
+            save_news_partition(target_date, items, ARCHIVE_NEWS_DIR)
         except Exception as e:
             print(f"Error saving to archive cache: {e}")
     
     return items
 
+def mirror_news_to_archive(news_by_date):
+    """
+    Re-syncs local partitions with the full sheet so local search covers history.
+    Dates missing locally go to the archive; a date already stored (main store first,
+    then archive) is rewritten in place when its content hash differs from the sheet's,
+    which also picks up sheet edits that keep the item count.
+    Returns: number of partitions written
+    """
+    stores = {
+        store_dir: _load_manifest(store_dir).get("dates", {})
+        for store_dir in (LOCAL_NEWS_DIR, ARCHIVE_NEWS_DIR)
+    }
+    changed = {LOCAL_NEWS_DIR: {}, ARCHIVE_NEWS_DIR: {}}
+    for date_key, items in news_by_date.items():
+        store_dir = LOCAL_NEWS_DIR if date_key in stores[LOCAL_NEWS_DIR] else ARCHIVE_NEWS_DIR
+        if stores[store_dir].get(date_key, {}).get("hash") != _content_hash(items):
+            changed[store_dir][date_key] = items
+    for store_dir, dates in changed.items():
+        if dates:
+            save_news_partitions(dates, store_dir)
+    return sum(len(dates) for dates in changed.values())
+
 def save_news_to_sheet(news_data_dict, worksheet="news"):
     """
-    Overwrites the 'news' worksheet with the provided news_data_dict.
+    [COMPACTION] Overwrites the whole 'news' worksheet with the provided news_data_dict.
     news_data_dict format: { "YYYY-MM-DD": [ {title, link...}, ... ] }
+    
+    Routine writes should use append_news_items_to_sheet / update_news_items_in_sheet /
+    delete_news_items_from_sheet, whose cost scales with the delta. Use this only for
+    bulk maintenance (migrations, cleanups) where rewriting every row is intended.
     """
     conn = get_db_connection()
     if not conn:
@@ -333,25 +445,26 @@ def save_news_to_sheet(news_data_dict, worksheet="news"):
             for item in items:
                 # Ensure 'date' field is explicit
                 item['date'] = date_key 
+                ensure_topic_id(item, date_key)
                 all_records.append(item)
         
         if not all_records:
             # If empty, maybe just clear sheet? but better not to break structure
             # Create empty DF with columns
-            df = pd.DataFrame(columns=["date", "title", "summary", "link", "source", "category", "tourist_impact_score", "full_translated", "image_url"])
+            df = pd.DataFrame(columns=NEWS_SHEET_COLUMNS + ["image_url"])
         else:
             df = pd.DataFrame(all_records)
             
         # Ensure common columns exist to avoid schema errors if some items miss keys
-        expected_cols = ["date", "title", "summary", "link", "source", "category", "tourist_impact_score", "full_translated"]
-        for col in expected_cols:
+        for col in NEWS_SHEET_COLUMNS:
             if col not in df.columns:
                 df[col] = ""
 
         # Write to Sheet
         conn.update(spreadsheet=SPREADSHEET_URL, worksheet=worksheet, data=df)
         
-        # Clear Streamlit Cache to force reload next time
+        # Clear Streamlit Cache + in-process store to force reload next time
+        invalidate_news_store(worksheet)
         st.cache_data.clear()
         return True
 
@@ -359,15 +472,209 @@ def save_news_to_sheet(news_data_dict, worksheet="news"):
         print(f"Error saving news to sheet: {e}")
         return False
 
-def append_news_items_to_sheet(new_items_list, worksheet="news"):
+# --- INCREMENTAL WRITES (append / targeted row updates keyed by topic_id) ---
+
+NEWS_SHEET_COLUMNS = ["date", "title", "summary", "link", "source", "category", "tourist_impact_score", "full_translated", "topic_id"]
+
+def ensure_topic_id(item, date_key):
+    """
+    Assigns a stable 'topic_id' (kept across title/summary edits) if the item has none.
+    Returns the id.
     """
-    Appends a list of news items (dicts) to the sheet.
-    Useful for crawlers to add without reading everything first?
-    Actually, 'update()' overlaps. 'write()' overwrites.
-    st-gsheets-connection usually does overwrite on 'update' if passed full DF.
-    To append, we assume we might need to Read -> Append -> Write.
+    if not item.get('topic_id'):
+        refs = item.get('references')
+        first_url = ""
+        if isinstance(refs, list) and refs and isinstance(refs[0], dict):
+            first_url = refs[0].get('url') or ""
+        seed = f"{date_key}|{first_url or item.get('link', '')}|{item.get('title', '')}"
+        item['topic_id'] = hashlib.md5(seed.encode('utf-8')).hexdigest()[:16]
+    return item['topic_id']
+
+# gspread handles for incremental writes, opened once per process
+_news_worksheets = {}
+_news_worksheets_lock = threading.Lock()
+
+def get_news_worksheet(worksheet="news"):
     """
-    # For safety/simplicity in this app (data size < 10k rows), 
-    # Read-Modify-Write is safer to maintain consistency.
-    # So we can just use load -> append in memory -> save.
-    pass
+    Returns the gspread Worksheet of the news spreadsheet (service account only).
+    Opened through the public gspread API with the same credentials as
+    utils.get_hotel_gsheets_client (GOOGLE_SHEETS_KEY or [connections.gsheets_news]).
+    """
+    with _news_worksheets_lock:
+        ws = _news_worksheets.get(worksheet)
+        if ws is not None:
+            return ws
+        try:
+            from utils import get_hotel_gsheets_client
+            client = get_hotel_gsheets_client()
+            if not client:
+                return None
+            ws = client.open_by_url(SPREADSHEET_URL).worksheet(worksheet)
+            _news_worksheets[worksheet] = ws
+            return ws
+        except Exception as e:
+            print(f"Error opening worksheet '{worksheet}': {e}")
+            return None
+
+def _to_cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+def _ensure_header(ws, items):
+    """Reads the header row once and appends any missing columns. Returns the header list."""
+    header = ws.row_values(1)
+    needed = list(NEWS_SHEET_COLUMNS)
+    for item in items:
+        for key in item.keys():
+            if key not in needed:
+                needed.append(key)
+    missing = [c for c in needed if c not in header]
+    if missing:
+        header = header + missing
+        if len(header) > ws.col_count:
+            ws.add_cols(len(header) - ws.col_count)
+        ws.update(range_name="A1", values=[header])
+    return header
+
+def _item_to_row(item, header):
+    return [_to_cell(item.get(col, "")) for col in header]
+
+def _locate_rows(ws, header, keys):
+    """
+    Finds sheet row numbers for items, reading only the id/date/title columns (one request).
+    keys: list of (topic_id, date_key, legacy_title) — legacy_title matches old rows without an id.
+    Returns: list of row numbers (None when not found), same order as keys
+    """
+    from gspread.utils import rowcol_to_a1
+    cols = ["topic_id", "date", "title"]
+    ranges = []
+    for col in cols:
+        c = header.index(col) + 1
+        ranges.append(f"{rowcol_to_a1(1, c)[:-1]}:{rowcol_to_a1(1, c)[:-1]}")
+    id_vals, date_vals, title_vals = [[r[0] if r else "" for r in block] for block in ws.batch_get(ranges)]
+    
+    by_id = {}
+    by_date_title = {}
+    for i in range(1, max(len(id_vals), len(date_vals), len(title_vals))):
+        row_no = i + 1
+        tid = id_vals[i] if i < len(id_vals) else ""
+        if tid:
+            by_id.setdefault(tid, row_no)
+        d = str(date_vals[i] if i < len(date_vals) else "").split('T')[0].split(' ')[0]
+        t = title_vals[i] if i < len(title_vals) else ""
+        by_date_title.setdefault((d, t), row_no)
+    
+    rows = []
+    for topic_id, date_key, legacy_title in keys:
+        row_no = by_id.get(topic_id) if topic_id else None
+        if row_no is None and legacy_title is not None:
+            row_no = by_date_title.get((date_key, legacy_title))
+        rows.append(row_no)
+    return rows
+
+def _after_write(worksheet):
+    invalidate_news_store(worksheet)
+    st.cache_data.clear()
+
+def append_news_items_to_sheet(news_data_dict, worksheet="news"):
+    """
+    Appends only the given items as new rows in one batched call.
+    news_data_dict format: { "YYYY-MM-DD": [ {title, link...}, ... ] }
+    Returns: True on success
+    """
+    rows_items = []
+    for date_key, items in news_data_dict.items():
+        for item in items:
+            item['date'] = date_key
+            ensure_topic_id(item, date_key)
+            rows_items.append(item)
+    if not rows_items:
+        return True
+    
+    ws = get_news_worksheet(worksheet)
+    if ws is None:
+        return False
+    try:
+        header = _ensure_header(ws, rows_items)
+        ws.append_rows([_item_to_row(item, header) for item in rows_items], value_input_option="RAW")
+        _after_write(worksheet)
+        return True
+    except Exception as e:
+        print(f"Error appending news to sheet: {e}")
+        return False
+
+def update_news_items_in_sheet(date_key, items, legacy_titles=None, worksheet="news"):
+    """
+    Rewrites only the rows of the given items (one batch_update request), keyed by topic_id.
+    legacy_titles: original titles (same order as items) to locate old rows without a topic_id.
+    Items that cannot be located are appended.
+    Returns: True on success
+    """
+    if not items:
+        return True
+    ws = get_news_worksheet(worksheet)
+    if ws is None:
+        return False
+    try:
+        from gspread.utils import rowcol_to_a1
+        legacy_titles = legacy_titles or [None] * len(items)
+        keys = [(item.get('topic_id'), date_key, legacy) for item, legacy in zip(items, legacy_titles)]
+        for item in items:
+            item['date'] = date_key
+            ensure_topic_id(item, date_key)
+        
+        header = _ensure_header(ws, items)
+        row_numbers = _locate_rows(ws, header, keys)
+        
+        updates = []
+        not_found = []
+        for item, row_no in zip(items, row_numbers):
+            if row_no is None:
+                not_found.append(item)
+                continue
+            updates.append({
+                "range": f"{rowcol_to_a1(row_no, 1)}:{rowcol_to_a1(row_no, len(header))}",
+                "values": [_item_to_row(item, header)]
+            })
+        if updates:
+            ws.batch_update(updates, value_input_option="RAW")
+        if not_found:
+            ws.append_rows([_item_to_row(item, header) for item in not_found], value_input_option="RAW")
+        _after_write(worksheet)
+        return True
+    except Exception as e:
+        print(f"Error updating news rows: {e}")
+        return False
+
+def delete_news_items_from_sheet(date_key, items, worksheet="news"):
+    """
+    Deletes only the rows of the given items (one batch request), keyed by topic_id
+    with (date, title) as the fallback for rows written before topic ids existed.
+    Returns: True on success
+    """
+    if not items:
+        return True
+    ws = get_news_worksheet(worksheet)
+    if ws is None:
+        return False
+    try:
+        header = ws.row_values(1)
+        if "topic_id" not in header:
+            header = _ensure_header(ws, [])
+        keys = [(item.get('topic_id'), date_key, item.get('title')) for item in items]
+        row_numbers = sorted({r for r in _locate_rows(ws, header, keys) if r}, reverse=True)
+        if row_numbers:
+            ws.spreadsheet.batch_update({"requests": [
+                {"deleteDimension": {"range": {"sheetId": ws.id, "dimension": "ROWS", "startIndex": r - 1, "endIndex": r}}}
+                for r in row_numbers
+            ]})
+        _after_write(worksheet)
+        return True
+    except Exception as e:
+        print(f"Error deleting news rows: {e}")
+        return False
@@ -1,6 +1,6 @@
 import streamlit as st
 import pandas as pd
-from db_utils import SPREADSHEET_URL, load_news_from_sheet
+from db_utils import SPREADSHEET_URL, load_news_from_sheet, load_news_partitions, LOCAL_NEWS_DIR
 import json
 
 def debug_sheet():
@@ -8,12 +8,10 @@ def debug_sheet():
     # We can't use st.connection() easily in a script, 
     # but we can try to use a local simulation if we have the JSON fallback logic
     # Wait, load_news_from_sheet will use the connection.
-    # I'll just check data/news.json which is supposed to be what safe_deploy.py pushes.
+    # I'll just check the local data/news/ store which is what safe_deploy.py pushes.
     
-    if os.path.exists('data/news.json'):
-        with open('data/news.json', 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
+    data = load_news_partitions()
+    if data:
         dates = sorted(data.keys(), reverse=True)
         for date in dates[:3]:
             print(f"\nDate: {date}")
@@ -23,7 +21,7 @@ def debug_sheet():
                 print(f"    link: {item.get('link')}")
                 print(f"    references: {item.get('references')}")
     else:
-        print("data/news.json not found")
+        print(f"{LOCAL_NEWS_DIR}/ not found")
 
 if __name__ == "__main__":
     import os
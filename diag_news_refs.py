@@ -1,9 +1,9 @@
 import json
 import os
+from db_utils import load_news_partitions
 
 def check_news():
-    with open('data/news.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_news_partitions()
     
     for date, items in data.items():
         for i, item in enumerate(items):
@@ -0,0 +1,213 @@
+import bisect
+import calendar
+import json
+import os
+import re
+import threading
+from datetime import date, datetime, timedelta
+
+# Parsed-event index for the events tab (data/events.json)
+# Free-text dates are parsed once at ingestion into
+#   event["date_range"] = {"start": "YYYY-MM-DD" | None, "end": "YYYY-MM-DD" | None,
+#                          "status": "ok" | "open" | "undated" | "unparsed", "source": <raw date>}
+# and the index keeps dated events sorted by end date, so "active events" is a
+# bisect on today instead of re-parsing every date string on every render.
+# "undated" and "unparsed" events stay visible, like before; "unparsed" ones are
+# listed for admin review. "open" events (no end) stay visible for
+# OPEN_EVENT_HORIZON_DAYS after their start, then expire and are listed for review.
+STATUS_OK = "ok"
+STATUS_OPEN = "open"
+STATUS_UNDATED = "undated"
+STATUS_UNPARSED = "unparsed"
+
+PARSER_VERSION = 3             # stored in date_range; bump to re-parse stored events
+OPEN_EVENT_HORIZON_DAYS = 180  # an open-ended event expires this long after its start
+
+_DATE_RE = re.compile(r"(\d{4})\s*[-./년]\s*(\d{1,2})\s*[-./월]\s*(\d{1,2})")
+_MONTH_RE = re.compile(r"(\d{4})\s*[-./년]\s*(\d{1,2})(?!\d)")
+_YEAR_RE = re.compile(r"(?<!\d)(20\d{2})(?!\d)")
+# Yearless range ends ("~ 10-30", "~ 10월 30일", "~ 5월", "~ 30일"), resolved against the start
+_MONTH_DAY_RE = re.compile(r"(?<!\d)(\d{1,2})\s*[-./월]\s*(\d{1,2})(?!\d)")
+_BARE_MONTH_RE = re.compile(r"^\s*(\d{1,2})\s*월")
+_DAY_RE = re.compile(r"^\s*(\d{1,2})\s*(?:일|\(|$)")
+# English month names ("Oct 20, 2026", "20 - 25 Oct 2026") are not parsed (-> "unparsed")
+_MONTH_NAME_RE = re.compile(r"(?<![a-z])(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?(?![a-z])", re.I)
+_RANGE_SEPARATORS = ("~", "–", "—", " to ", " - ")
+
+
+def _safe_date(year, month, day):
+    try:
+        return date(int(year), int(month), int(day))
+    except ValueError:
+        return None
+
+
+def _parse_point(text, as_end=False):
+    """First date in a fragment; a bare month / year expands to its last day when as_end."""
+    match = _DATE_RE.search(text)
+    if match:
+        return _safe_date(*match.groups())
+    match = _MONTH_RE.search(text)
+    if match:
+        year, month = int(match.group(1)), int(match.group(2))
+        if 1 <= month <= 12:
+            return date(year, month, calendar.monthrange(year, month)[1] if as_end else 1)
+    match = _YEAR_RE.search(text)
+    if match:
+        year = int(match.group(1))
+        return date(year, 12, 31) if as_end else date(year, 1, 1)
+    return None
+
+
+def _parse_end(text, start):
+    """Range end; a yearless end inherits the year (and month) from the start."""
+    end = _parse_point(text, as_end=True)
+    if end is not None or start is None:
+        return end
+    match = _MONTH_DAY_RE.search(text)
+    if match:
+        end = _safe_date(start.year, *match.groups())
+        if end is not None and end < start:  # "2026-12-20 ~ 01-05"
+            end = _safe_date(start.year + 1, *match.groups())
+        return end
+    match = _BARE_MONTH_RE.search(text)
+    if match:  # "2026년 3월~5월" -> end of May 2026
+        month = int(match.group(1))
+        if not 1 <= month <= 12:
+            return None
+        year = start.year + 1 if month < start.month else start.year
+        return date(year, month, calendar.monthrange(year, month)[1])
+    match = _DAY_RE.search(text)
+    if match:
+        return _safe_date(start.year, start.month, match.group(1))
+    return None
+
+
+def parse_event_date(date_str):
+    """Free-text event date -> date_range dict (see module header)."""
+    raw = str(date_str or "").strip()
+    result = {"start": None, "end": None, "status": STATUS_UNDATED, "source": raw, "parser": PARSER_VERSION}
+    if not raw:
+        return result
+    if _MONTH_NAME_RE.search(raw):
+        result["status"] = STATUS_UNPARSED
+        return result
+
+    start_text, end_text = raw, None
+    for sep in _RANGE_SEPARATORS:
+        if sep in raw:
+            start_text, end_text = raw.split(sep, 1)
+            break
+
+    start = _parse_point(start_text)
+    if end_text is None:
+        end = _parse_point(start_text, as_end=True)
+    else:
+        end = _parse_end(end_text, start)
+        if end is None and start is not None:
+            result.update(start=start.isoformat(), status=STATUS_OPEN)
+            return result  # "2024-01-01 ~" / "2024-01-01 ~ 미정" -> ongoing
+
+    if start is None and end is None:
+        result["status"] = STATUS_UNPARSED
+        return result
+    start, end = start or end, end or start
+    if end < start:
+        start, end = end, start
+    result.update(start=start.isoformat(), end=end.isoformat(), status=STATUS_OK)
+    return result
+
+
+def normalize_event(event):
+    """Sets event['date_range'] from event['date'] (re-parsed when the date text or the parser changed)."""
+    date_range = event.get("date_range")
+    raw = str(event.get("date") or "").strip()
+    if (not isinstance(date_range, dict) or date_range.get("source") != raw
+            or date_range.get("parser") != PARSER_VERSION):
+        event["date_range"] = parse_event_date(raw)
+    return event
+
+
+def normalize_events(events):
+    for event in events:
+        if isinstance(event, dict):
+            normalize_event(event)
+    return events
+
+
+def _open_cutoff(today):
+    """Open events starting before this date have passed the horizon."""
+    return (today - timedelta(days=OPEN_EVENT_HORIZON_DAYS)).isoformat()
+
+
+def is_active(date_range, today=None):
+    status = date_range.get("status")
+    today = today or datetime.now().date()
+    if status == STATUS_OK:
+        return date_range["end"] >= today.isoformat()
+    if status == STATUS_OPEN:
+        return date_range["start"] >= _open_cutoff(today)
+    return True  # undated / unparsed: keep visible
+
+
+class EventIndex:
+    """Events sorted by end (open events by start); active() is two bisects + the always-visible events."""
+    def __init__(self, events):
+        self.events = normalize_events([e for e in events if isinstance(e, dict)])
+        dated = sorted(
+            (e["date_range"]["end"], position)
+            for position, e in enumerate(self.events) if e["date_range"]["status"] == STATUS_OK
+        )
+        self._ends = [end for end, _ in dated]
+        self._dated_positions = [position for _, position in dated]
+        opened = sorted(
+            (e["date_range"]["start"], position)
+            for position, e in enumerate(self.events) if e["date_range"]["status"] == STATUS_OPEN
+        )
+        self._open_starts = [start for start, _ in opened]
+        self._open_positions = [position for _, position in opened]
+        self._always = [
+            p for p, e in enumerate(self.events)
+            if e["date_range"]["status"] in (STATUS_UNDATED, STATUS_UNPARSED)
+        ]
+
+    def active(self, today=None):
+        """Events ending today or later, open events within the horizon, plus undated / unparsed, in file order."""
+        today = today or datetime.now().date()
+        start = bisect.bisect_left(self._ends, today.isoformat())
+        open_start = bisect.bisect_left(self._open_starts, _open_cutoff(today))
+        positions = sorted(self._dated_positions[start:] + self._open_positions[open_start:] + self._always)
+        return [self.events[p] for p in positions]
+
+    def unparsed(self):
+        return [e for e in self.events if e["date_range"]["status"] == STATUS_UNPARSED]
+
+    def expired_open(self, today=None):
+        """Open-ended events hidden by the horizon (admin review: add an end date or delete)."""
+        cutoff = _open_cutoff(today or datetime.now().date())
+        stale = self._open_positions[:bisect.bisect_left(self._open_starts, cutoff)]
+        return [self.events[p] for p in sorted(stale)]
+
+
+_lock = threading.Lock()
+_cache = {}  # path -> (mtime, EventIndex)
+
+
+def load_index(path):
+    """EventIndex for a JSON file, rebuilt only when the file changed."""
+    mtime = os.path.getmtime(path) if os.path.exists(path) else None
+    with _lock:
+        cached = _cache.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+    events = []
+    if mtime is not None:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                events = json.load(f)
+        except Exception as e:
+            print(f"Event index read error: {e}")
+    index = EventIndex(events if isinstance(events, list) else [])
+    with _lock:
+        _cache[path] = (mtime, index)
+    return index
@@ -0,0 +1,107 @@
+import http.cookiejar
+import random
+import threading
+import time
+import urllib.parse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Shared HTTP client for all outbound calls (RSS, scraping, Google APIs, counters...)
+# One Session = per-host connection pools with keep-alive, so repeated calls
+# to the same host skip the TCP+TLS handshake.
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'
+DEFAULT_TIMEOUT = 10
+POOL_CONNECTIONS = 32   # number of hosts kept in the pool manager
+POOL_MAXSIZE = 16       # keep-alive connections per host
+RETRY_STATUS = {429, 500, 502, 503, 504}
+RETRY_BACKOFF = 0.5     # seconds, doubled per attempt (+/- 50% jitter)
+
+_session = None
+_session_lock = threading.Lock()
+_metrics_lock = threading.Lock()
+_host_metrics = {}  # { host: {"count", "errors", "total_ms", "max_ms"} }
+
+
+def get_session():
+    """Returns the process-wide requests.Session (created lazily, thread-safe)."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers.update({"User-Agent": DEFAULT_USER_AGENT})
+                # Calls must not leak cookies into each other across threads/users
+                session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+                _session = session
+    return _session
+
+
+def _record(host, elapsed_ms, error):
+    with _metrics_lock:
+        m = _host_metrics.setdefault(host, {"count": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0})
+        m["count"] += 1
+        m["total_ms"] += elapsed_ms
+        m["max_ms"] = max(m["max_ms"], elapsed_ms)
+        if error:
+            m["errors"] += 1
+
+
+def get_latency_stats():
+    """
+    Returns per-host latency metrics for this process.
+    { host: {"count", "errors", "avg_ms", "max_ms"} }
+    """
+    with _metrics_lock:
+        return {
+            host: {
+                "count": m["count"],
+                "errors": m["errors"],
+                "avg_ms": round(m["total_ms"] / m["count"], 1) if m["count"] else 0.0,
+                "max_ms": round(m["max_ms"], 1),
+            }
+            for host, m in _host_metrics.items()
+        }
+
+
+def request(method, url, retries=0, timeout=DEFAULT_TIMEOUT, **kwargs):
+    """
+    Sends a request through the shared session.
+
+    retries: extra attempts on connection errors / timeouts / 429 / 5xx,
+             with jittered exponential backoff.
+    Headers given by the caller are merged over the default User-Agent.
+    Returns: requests.Response (the last one, even if its status is an error)
+    Raises: requests.RequestException when every attempt failed to connect
+    """
+    host = urllib.parse.urlparse(url).netloc.lower()
+    session = get_session()
+    attempt = 0
+
+    while True:
+        started = time.perf_counter()
+        try:
+            response = session.request(method, url, timeout=timeout, **kwargs)
+        except requests.RequestException:
+            _record(host, (time.perf_counter() - started) * 1000, True)
+            if attempt >= retries:
+                raise
+        else:
+            is_error = response.status_code in RETRY_STATUS
+            _record(host, (time.perf_counter() - started) * 1000, is_error)
+            if not is_error or attempt >= retries:
+                return response
+
+        attempt += 1
+        time.sleep(RETRY_BACKOFF * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5))
+
+
+def get(url, retries=1, timeout=DEFAULT_TIMEOUT, **kwargs):
+    return request("GET", url, retries=retries, timeout=timeout, **kwargs)
+
+
+def post(url, retries=0, timeout=DEFAULT_TIMEOUT, **kwargs):
+    return request("POST", url, retries=retries, timeout=timeout, **kwargs)
@@ -0,0 +1,166 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+# Content-addressed Gemini response cache (SQLite)
+# Key = sha256(model name + generation config + prompt)
+LLM_CACHE_DB = "data/llm_cache.db"
+LLM_CACHE_MAX_ENTRIES = 2000  # LRU limit (least recently used rows are evicted)
+
+# TTL per call site (seconds)
+LLM_CACHE_TTL = {
+    "translate": 30 * 86400,
+    "news_analysis": 86400,
+    "infographic": 86400,
+    "hotel_reviews": 7 * 86400,
+    "restaurant_reviews": 7 * 86400,
+    "tour_recommendation": 86400,
+    "event_extract": 3 * 86400,
+    "big_events": 12 * 3600,
+    "default": 86400,
+}
+
+_lock = threading.Lock()
+_conn = None
+_stats = {}  # { site: {"hits": int, "misses": int} }
+
+
+class CachedResponse:
+    """Minimal stand-in for a Gemini response (only `.text` is used by callers)."""
+    def __init__(self, text):
+        self.text = text
+
+
+def _get_conn():
+    global _conn
+    if _conn is None:
+        os.makedirs(os.path.dirname(LLM_CACHE_DB) or ".", exist_ok=True)
+        _conn = sqlite3.connect(LLM_CACHE_DB, check_same_thread=False)
+        _conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                site TEXT,
+                model TEXT,
+                body BLOB,
+                created_at REAL,
+                expires_at REAL,
+                last_access REAL
+            )
+        """)
+        _conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_access ON responses(last_access)")
+        _conn.commit()
+    return _conn
+
+
+def make_key(model_name, prompt, generation_config=None):
+    config_str = json.dumps(generation_config or {}, sort_keys=True, ensure_ascii=False, default=str)
+    raw = f"{model_name}\n{config_str}\n{prompt}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _count(site, field):
+    entry = _stats.setdefault(site, {"hits": 0, "misses": 0})
+    entry[field] += 1
+
+
+def get(key, site="default"):
+    """Returns cached text or None (expired rows count as a miss)."""
+    now = time.time()
+    try:
+        with _lock:
+            conn = _get_conn()
+            row = conn.execute("SELECT body, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row and row[1] >= now:
+                conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+                conn.commit()
+                _count(site, "hits")
+                return zlib.decompress(row[0]).decode("utf-8")
+            if row:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                conn.commit()
+            _count(site, "misses")
+    except Exception as e:
+        print(f"LLM cache read error: {e}")
+    return None
+
+
+def put(key, text, site="default", model_name="", ttl=None):
+    now = time.time()
+    ttl = ttl if ttl is not None else LLM_CACHE_TTL.get(site, LLM_CACHE_TTL["default"])
+    try:
+        with _lock:
+            conn = _get_conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, site, model, body, created_at, expires_at, last_access) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, site, model_name, zlib.compress(text.encode("utf-8")), now, now + ttl, now)
+            )
+            # LRU eviction
+            total = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            if total > LLM_CACHE_MAX_ENTRIES:
+                conn.execute(
+                    "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY last_access ASC LIMIT ?)",
+                    (total - LLM_CACHE_MAX_ENTRIES,)
+                )
+            conn.commit()
+    except Exception as e:
+        print(f"LLM cache write error: {e}")
+
+
+def invalidate(key):
+    try:
+        with _lock:
+            conn = _get_conn()
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            conn.commit()
+    except Exception as e:
+        print(f"LLM cache delete error: {e}")
+
+
+def get_stats():
+    """Returns hit/miss counters per call site for this process."""
+    with _lock:
+        return {site: dict(counts) for site, counts in _stats.items()}
+
+
+def _is_json_text(text):
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.replace("```json", "").replace("```", "").strip()
+    try:
+        json.loads(text)
+        return True
+    except Exception:
+        return False
+
+
+def cached_generate_content(model, prompt, site="default", ttl=None, validate=None):
+    """
+    Drop-in replacement for `model.generate_content(prompt)` with a disk cache.
+
+    model: genai.GenerativeModel (model name and generation config are part of the key)
+    site: call-site name used for TTL lookup and hit/miss counters
+    validate: optional callable(text) -> bool; only responses that pass are stored.
+              JSON-mode models default to "must parse as JSON".
+
+    Returns: object with `.text` (cached) or the live Gemini response
+    """
+    model_name = getattr(model, "model_name", "") or ""
+    generation_config = getattr(model, "_generation_config", None) or {}
+    key = make_key(model_name, prompt, generation_config)
+
+    cached = get(key, site)
+    if cached is not None:
+        return CachedResponse(cached)
+
+    response = model.generate_content(prompt)
+    text = response.text
+
+    if validate is None and generation_config.get("response_mime_type") == "application/json":
+        validate = _is_json_text
+    if text and (validate is None or validate(text)):
+        put(key, text, site=site, model_name=model_name, ttl=ttl)
+    return response
@@ -23,15 +23,12 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from utils import normalize_category, CATEGORY_MAPPING, DISPLAY_LABELS
 
 def load_local_news():
-    """Load news from local JSON file if exists."""
-    news_file = "data/news.json"
-    if os.path.exists(news_file):
-        with open(news_file, 'r', encoding='utf-8') as f:
-            try:
-                return json.load(f)
-            except:
-                return {}
-    return {}
+    """Load news from the local date-partitioned store (data/news/)."""
+    from db_utils import load_news_partitions
+    try:
+        return load_news_partitions()
+    except:
+        return {}
 
 def migrate_local_news(dry_run=False):
     """Migrate local news.json categories."""
@@ -58,9 +55,9 @@ def migrate_local_news(dry_run=False):
                         article['category'] = new_cat
     
     if not dry_run and changes > 0:
-        with open("data/news.json", 'w', encoding='utf-8') as f:
-            json.dump(news_data, f, ensure_ascii=False, indent=2)
-        print(f"\n✅ Saved {changes} changes to data/news.json")
+        from db_utils import save_news_partitions
+        save_news_partitions(news_data)
+        print(f"\n✅ Saved {changes} changes to data/news/")
     
     return changes
 
@@ -3,22 +3,19 @@ import streamlit as st
 import json
 import os
 import pandas as pd
-from db_utils import save_news_to_sheet
+from db_utils import save_news_to_sheet, load_news_partitions, LOCAL_NEWS_DIR
 
 st.title("📂 News Data Migration Tool")
-st.caption("Migrate local `data/news.json` to Google Sheets")
+st.caption("Migrate local `data/news/` store to Google Sheets")
 
-NEWS_FILE = 'data/news.json'
+NEWS_FILE = LOCAL_NEWS_DIR
 
 def load_local_json():
-    if os.path.exists(NEWS_FILE):
-        with open(NEWS_FILE, 'r', encoding='utf-8') as f:
-            try:
-                return json.load(f)
-            except Exception as e:
-                st.error(f"Failed to load JSON: {e}")
-                return None
-    return None
+    try:
+        return load_news_partitions()
+    except Exception as e:
+        st.error(f"Failed to load JSON: {e}")
+        return None
 
 if st.button("🚀 Start Migration", type="primary"):
     st.info(f"Loading {NEWS_FILE}...")
@@ -26,7 +23,7 @@ if st.button("🚀 Start Migration", type="primary"):
     data = load_local_json()
     
     if not data:
-        st.error("No data found in news.json or file missing.")
+        st.error("No data found in data/news/ or store missing.")
     else:
         # Check size
         total_days = len(data)
@@ -0,0 +1,221 @@
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+import zlib
+from datetime import datetime
+
+from db_utils import LOCAL_NEWS_DIR, ARCHIVE_NEWS_DIR, _read_manifest, load_news_partition, ensure_topic_id
+
+# Full-text search index over the local news store (data/news + data/news_archive)
+# SQLite FTS5 with pre-tokenized text:
+#   - Latin words / numbers -> lowercase words (queries match as prefixes)
+#   - Hangul / Thai / CJK runs -> character bigrams (no word boundaries needed)
+# Each date is re-indexed only when its partition changed (manifest updated_at).
+NEWS_INDEX_DB = "data/news_index.db"
+FIELD_WEIGHTS = (4.0, 2.0, 1.0)   # title, summary, full_translated (bm25 column weights)
+RECENCY_HALF_LIFE_DAYS = 30       # recency boost halves every N days
+RECENCY_WEIGHT = 1.0              # final = relevance * (1 + RECENCY_WEIGHT * decay)
+MAX_CANDIDATES = 500              # best-relevance hits considered for recency re-ranking
+
+_TOKEN_RE = re.compile(
+    r"[0-9a-z\u00c0-\u024f]+"            # Latin / digits
+    r"|[\uac00-\ud7a3\u3131-\u318e]+"    # Hangul
+    r"|[\u0e00-\u0e7f]+"                 # Thai
+    r"|[\u3040-\u30ff\u4e00-\u9fff]+"    # Kana / CJK
+)
+
+_lock = threading.Lock()
+_conn = None
+
+
+def _is_latin(run):
+    return run[0] <= "\u024f"
+
+
+def tokenize(text):
+    """Returns index tokens: Latin words, bigrams for scripts without spaces."""
+    tokens = []
+    for run in _TOKEN_RE.findall(str(text or "").lower()):
+        if _is_latin(run) or len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def _query_expression(query):
+    """FTS5 MATCH expression: every token required, Latin words as prefixes."""
+    terms = []
+    for run in _TOKEN_RE.findall(str(query or "").lower()):
+        if _is_latin(run) or len(run) == 1:
+            terms.append(f'"{run}"*')
+        else:
+            terms.extend(f'"{run[i:i + 2]}"' for i in range(len(run) - 1))
+    return " AND ".join(dict.fromkeys(terms))
+
+
+def _get_conn():
+    global _conn
+    if _conn is None:
+        os.makedirs(os.path.dirname(NEWS_INDEX_DB) or ".", exist_ok=True)
+        _conn = sqlite3.connect(NEWS_INDEX_DB, check_same_thread=False)
+        _conn.executescript("""
+            CREATE TABLE IF NOT EXISTS docs (
+                id INTEGER PRIMARY KEY,
+                date TEXT,
+                topic BLOB
+            );
+            CREATE INDEX IF NOT EXISTS idx_docs_date ON docs(date);
+            CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5(
+                title, summary, body, tokenize = 'ascii'
+            );
+            CREATE TABLE IF NOT EXISTS indexed_dates (
+                date TEXT PRIMARY KEY,
+                signature TEXT
+            );
+        """)
+        _conn.commit()
+    return _conn
+
+
+def _index_date(conn, date_key, items, signature):
+    """Replaces all documents of one date (caller holds the lock)."""
+    old_ids = [row[0] for row in conn.execute("SELECT id FROM docs WHERE date = ?", (date_key,))]
+    if old_ids:
+        conn.executemany("DELETE FROM docs_fts WHERE rowid = ?", [(i,) for i in old_ids])
+        conn.execute("DELETE FROM docs WHERE date = ?", (date_key,))
+
+    seen = set()
+    for item in items or []:
+        if not isinstance(item, dict) or not item.get("title"):
+            continue
+        topic_id = ensure_topic_id(dict(item), date_key)
+        if topic_id in seen:
+            continue
+        seen.add(topic_id)
+        body = zlib.compress(json.dumps(item, ensure_ascii=False, default=str).encode("utf-8"))
+        cur = conn.execute("INSERT INTO docs (date, topic) VALUES (?, ?)", (date_key, body))
+        conn.execute(
+            "INSERT INTO docs_fts (rowid, title, summary, body) VALUES (?, ?, ?, ?)",
+            (cur.lastrowid,
+             " ".join(tokenize(item.get("title"))),
+             " ".join(tokenize(item.get("summary"))),
+             " ".join(tokenize(item.get("full_translated"))))
+        )
+    conn.execute("INSERT OR REPLACE INTO indexed_dates (date, signature) VALUES (?, ?)", (date_key, signature))
+
+
+def _store_signatures():
+    """{ date: (store_dir, signature) } for the local store (main partitions win over archive)."""
+    sources = {}
+    for store_dir in (ARCHIVE_NEWS_DIR, LOCAL_NEWS_DIR):
+        manifest = _read_manifest(store_dir) or {}
+        for date_key, meta in manifest.get("dates", {}).items():
+            sources[date_key] = (store_dir, f"{store_dir}|{meta.get('updated_at')}|{meta.get('count')}")
+    return sources
+
+
+def sync_news_index():
+    """
+    Brings the index up to date with the local news store.
+    Only dates whose partition changed since the last sync are re-indexed.
+    Returns: number of dates re-indexed
+    """
+    try:
+        sources = _store_signatures()
+        with _lock:
+            conn = _get_conn()
+            indexed = dict(conn.execute("SELECT date, signature FROM indexed_dates").fetchall())
+            changed = [d for d, (_, sig) in sources.items() if indexed.get(d) != sig]
+            for date_key in changed:
+                store_dir, signature = sources[date_key]
+                _index_date(conn, date_key, load_news_partition(date_key, store_dir), signature)
+            conn.commit()
+        if changed:
+            print(f"News index: re-indexed {len(changed)} dates")
+        return len(changed)
+    except Exception as e:
+        print(f"News index sync error: {e}")
+        return 0
+
+
+def index_news(news_by_date):
+    """
+    Re-indexes the given dates directly (dates that are not in the local store yet).
+    Stored dates go through sync_news_index(), which records the manifest signature;
+    a "direct" signature never matches it, so the next sync re-indexes the partition.
+    """
+    try:
+        with _lock:
+            conn = _get_conn()
+            for date_key, items in news_by_date.items():
+                _index_date(conn, date_key, items, signature=f"direct|{len(items or [])}")
+            conn.commit()
+    except Exception as e:
+        print(f"News index update error: {e}")
+
+
+def index_missing_dates(news_by_date):
+    """Indexes dates that are not in the index yet (e.g. loaded from GSheets before the local store)."""
+    try:
+        with _lock:
+            indexed = {row[0] for row in _get_conn().execute("SELECT date FROM indexed_dates")}
+        missing = {d: items for d, items in news_by_date.items() if d not in indexed}
+        if missing:
+            index_news(missing)
+    except Exception as e:
+        print(f"News index update error: {e}")
+
+
+def _recency_boost(date_key, today):
+    try:
+        age_days = max(0, (today - datetime.strptime(date_key, "%Y-%m-%d").date()).days)
+    except ValueError:
+        return 1.0
+    return 1.0 + RECENCY_WEIGHT * math.pow(0.5, age_days / RECENCY_HALF_LIFE_DAYS)
+
+
+def search_news(query, limit=None, today=None):
+    """
+    Searches title / summary / full_translated across every indexed date.
+    Ranked by bm25 relevance (title > summary > body) boosted by recency.
+    Returns: list of topic dicts with 'date_str' set (best first)
+    """
+    expression = _query_expression(query)
+    if not expression:
+        return []
+    today = today or datetime.now().date()
+    try:
+        with _lock:
+            conn = _get_conn()
+            rows = conn.execute(
+                """SELECT docs.date, docs.topic, bm25(docs_fts, ?, ?, ?) AS score
+                    FROM docs_fts JOIN docs ON docs.id = docs_fts.rowid
+                    WHERE docs_fts MATCH ?
+                    ORDER BY score LIMIT ?""",
+                (*FIELD_WEIGHTS, expression, MAX_CANDIDATES)
+            ).fetchall()
+    except Exception as e:
+        print(f"News search error: {e}")
+        return []
+
+    # bm25() is negative (lower = better)
+    ranked = sorted(rows, key=lambda r: (-r[2] * _recency_boost(r[0], today), r[0]), reverse=True)
+    results = []
+    for date_key, body, _ in ranked[:limit] if limit else ranked:
+        topic = json.loads(zlib.decompress(body).decode("utf-8"))
+        topic["date_str"] = date_key
+        results.append(topic)
+    return results
+
+
+def get_index_stats():
+    with _lock:
+        conn = _get_conn()
+        return {
+            "dates": conn.execute("SELECT COUNT(*) FROM indexed_dates").fetchone()[0],
+            "docs": conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0],
+        }
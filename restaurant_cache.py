@@ -0,0 +1,223 @@
+import copy
+import json
+import os
+import threading
+import time
+import unicodedata
+
+# Local mirror of the `cached_restaurants` sheet
+# - Primary key: (location_id, language); legacy rows without language count as Korean
+# - Name index: character bigrams -> keys, for substring / prefix search
+# - JSON columns (photos, cuisines, analysis...) are decoded once at sync time
+# A snapshot on disk serves the first request immediately; once it is older than
+# RESTAURANT_CACHE_TTL the sheet is re-read in a background thread.
+RESTAURANT_CACHE_FILE = "data/restaurant_cache.json"
+RESTAURANT_CACHE_TTL = 1800  # seconds
+RESTAURANT_CACHE_RETRY = 60  # seconds before retrying a failed sync
+
+
+def normalize_name(name):
+    return " ".join(unicodedata.normalize("NFKC", str(name or "")).casefold().split())
+
+
+def _name_grams(normalized):
+    if len(normalized) < 2:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + 2] for i in range(len(normalized) - 1)}
+
+
+def _json_list(value, split_fallback=False):
+    if not value:
+        return []
+    try:
+        return json.loads(value)
+    except Exception:
+        return value.split(',') if split_fallback and isinstance(value, str) else []
+
+
+def parse_restaurant_record(data):
+    """Sheet record (get_all_records row) -> details dict used by the food tab."""
+    analysis = {}
+    if data.get('analysis'):
+        try:
+            analysis = json.loads(data['analysis'])
+        except Exception:
+            analysis = {}
+
+    return {
+        'location_id': str(data.get('location_id', '')),
+        'name': data.get('name', ''),
+        'rating': float(data.get('rating', 0) or 0),
+        'num_reviews': int(data.get('num_reviews', 0) or 0),
+        'food_rating': float(data.get('food_rating', 0) or 0),
+        'atmosphere_rating': float(data.get('atmosphere_rating', 0) or 0),
+        'location_rating': float(data.get('location_rating', 0) or 0),
+        'price_level': data.get('price_level', ''),
+        'price': data.get('price', ''),
+        'cuisines': _json_list(data.get('cuisines'), split_fallback=True),
+        'hours': data.get('hours', ''),
+        'weekday_text': _json_list(data.get('weekday_text')),
+        'address': data.get('address', ''),
+        'phone': data.get('phone', ''),
+        'web_url': data.get('web_url', ''),
+        'maps_url': data.get('maps_url', data.get('web_url', '')),
+        'photos': _json_list(data.get('photos'), split_fallback=True),
+        'ranking': data.get('ranking', ''),
+        'editorial_summary': data.get('editorial_summary', ''),
+        'recommended_menu': _json_list(data.get('recommended_menu')),
+        'analysis': analysis,
+        'language': data.get('language') or "Korean",
+        'is_cached': True
+    }
+
+
+class RestaurantCache:
+    """
+    In-memory restaurant store synced from the sheet.
+
+    fetch_records: callable returning the sheet's get_all_records() (or None on error)
+    """
+    def __init__(self, fetch_records, path=RESTAURANT_CACHE_FILE, ttl=RESTAURANT_CACHE_TTL):
+        self.fetch_records = fetch_records
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._records = {}   # {(location_id, language): details}
+        self._order = {}     # key -> sheet position (search results keep sheet order)
+        self._grams = {}     # bigram -> set(keys)
+        self._synced_at = None
+        self._syncing = False
+
+    # --- Index maintenance (caller holds the lock) ---
+    def _put(self, details, position):
+        key = (details['location_id'], details['language'])
+        old = self._records.get(key)
+        if old is not None:
+            for gram in _name_grams(normalize_name(old['name'])):
+                self._grams.get(gram, set()).discard(key)
+        self._records[key] = details
+        self._order.setdefault(key, position)
+        for gram in _name_grams(normalize_name(details['name'])):
+            self._grams.setdefault(gram, set()).add(key)
+
+    def _replace_all(self, records, synced_at):
+        self._records, self._order, self._grams = {}, {}, {}
+        for position, details in enumerate(records):
+            if details.get('location_id') and (details['location_id'], details['language']) not in self._records:
+                self._put(details, position)
+        self._synced_at = synced_at
+
+    # --- Persistence ---
+    def _load_snapshot(self):
+        if not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            self._replace_all(snapshot.get("records", []), snapshot.get("synced_at", 0))
+            return True
+        except Exception as e:
+            print(f"Restaurant cache snapshot read error: {e}")
+            return False
+
+    def _save_snapshot(self):
+        try:
+            records = sorted(self._records.items(), key=lambda kv: self._order.get(kv[0], 0))
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"synced_at": self._synced_at, "records": [r for _, r in records]}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Restaurant cache snapshot error: {e}")
+
+    # --- Sync ---
+    def _sync_failed(self):
+        with self._lock:
+            self._synced_at = time.time() - self.ttl + RESTAURANT_CACHE_RETRY
+
+    def sync(self):
+        """Re-reads the whole sheet (one get_all_records call) and swaps the index."""
+        try:
+            rows = self.fetch_records()
+            if rows is None:
+                self._sync_failed()
+                return False
+            records, skipped = [], 0
+            for row_no, row in enumerate(rows, start=2):
+                try:
+                    records.append(parse_restaurant_record(row))
+                except Exception as e:
+                    # One malformed row (e.g. rating "N/A") must not stall the whole mirror
+                    print(f"Restaurant cache: skipping sheet row {row_no}: {e}")
+                    skipped += 1
+            with self._lock:
+                self._replace_all(records, time.time())
+                self._save_snapshot()
+            print(f"Restaurant cache synced: {len(self._records)} entries" + (f" ({skipped} bad rows skipped)" if skipped else ""))
+            return True
+        except Exception as e:
+            print(f"Restaurant cache sync error: {e}")
+            self._sync_failed()
+            return False
+        finally:
+            self._syncing = False
+
+    def _ensure_fresh(self):
+        with self._lock:
+            if self._synced_at is None and not self._load_snapshot():
+                self._synced_at = 0
+                blocking = True
+            else:
+                blocking = False
+            stale = time.time() - self._synced_at >= self.ttl
+            if not stale or self._syncing:
+                return
+            self._syncing = True
+
+        if blocking:
+            self.sync()  # Nothing to serve yet
+        else:
+            threading.Thread(target=self.sync, daemon=True).start()  # Serve stale, refresh behind
+
+    # --- Queries ---
+    def search(self, keyword):
+        """Cached restaurants whose name contains the keyword (or is contained in it); prefix matches first."""
+        self._ensure_fresh()
+        needle = normalize_name(keyword)
+        with self._lock:
+            if needle:
+                candidates = set()
+                for gram in _name_grams(needle):
+                    candidates |= self._grams.get(gram, set())
+                if len(needle) < 2:
+                    candidates = set(self._records)
+            else:
+                candidates = set(self._records)
+
+            hits = []
+            for key in candidates:
+                details = self._records[key]
+                name = normalize_name(details['name'])
+                if needle in name or (name and name in needle):
+                    hits.append((not name.startswith(needle), self._order.get(key, 0), details))
+        hits.sort(key=lambda h: (h[0], h[1]))
+        return [{
+            'location_id': d['location_id'],
+            'name': d['name'],
+            'address': d.get('address') or '주소 정보 없음',
+            'is_cached': True
+        } for _, _, d in hits]
+
+    def get(self, location_id, language="Korean"):
+        self._ensure_fresh()
+        with self._lock:
+            details = self._records.get((str(location_id), language or "Korean"))
+            return copy.deepcopy(details) if details else None
+
+    def upsert(self, sheet_record):
+        """Write-through from save_restaurant_to_cache (sheet row already written)."""
+        record = parse_restaurant_record(sheet_record)
+        with self._lock:
+            self._put(record, len(self._order))
+            if self._synced_at is not None:
+                self._save_snapshot()
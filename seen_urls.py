@@ -0,0 +1,260 @@
+import base64
+import hashlib
+import math
+import os
+import re
+import threading
+import time
+import urllib.parse
+
+# Seen-URL store for the news crawler (replaces data/processed_urls.json)
+# On disk: append-only log, one line per URL
+#   <unix_ts>\t<canonical_url>\t<publisher_key>
+# Lines older than SEEN_URL_TTL_DAYS are skipped on load and dropped by
+# compaction, so the file (and startup cost) stays flat over months.
+SEEN_URLS_FILE = "data/seen_urls.log"
+LEGACY_PROCESSED_URLS_FILE = "data/processed_urls.json"
+SEEN_URL_TTL_DAYS = 30          # Feeds only return items from the last few days
+COMPACT_MIN_EXPIRED = 500       # Rewrite the log once this many lines are dead...
+COMPACT_EXPIRED_RATIO = 0.5     # ...and they make up at least this share of it
+
+# Optional Bloom-filter mode: membership uses a fixed-size bit array instead of
+# in-memory sets (false positives ~= BLOOM_ERROR_RATE, never false negatives)
+BLOOM_CAPACITY = 50000
+BLOOM_ERROR_RATE = 0.001
+
+# Query parameters that never identify an article
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "igshid", "yclid", "oc", "ocid",
+    "cmpid", "mc_cid", "mc_eid", "ref", "ref_src", "src", "share", "amp", "_ga",
+}
+TRACKING_PREFIXES = ("utm_", "at_", "pk_", "itm_")
+
+# Publisher article ids: the same story is re-published under different slugs,
+# so the id alone identifies it. { domain: regex with one id group }
+PUBLISHER_ID_PATTERNS = {
+    "bangkokpost.com": re.compile(r"/(\d{6,})(?:/|$)"),
+}
+
+REDIRECT_PARAMS = ("url", "q", "u")
+GOOGLE_NEWS_HOST = "news.google.com"
+
+
+def _decode_google_news_id(article_id):
+    """Older Google News ids are base64 protobufs that embed the target URL."""
+    try:
+        raw = base64.urlsafe_b64decode(article_id + "=" * (-len(article_id) % 4))
+    except Exception:
+        return None
+    match = re.search(rb"https?://[\x21-\x7e]+", raw)
+    if not match:
+        return None
+    return match.group(0).decode("ascii", errors="ignore")
+
+
+def unwrap_redirect(url):
+    """
+    Returns the publisher URL behind Google / Google News redirects.
+    Opaque Google News ids are returned unchanged (their id is still stable).
+    """
+    parsed = urllib.parse.urlsplit(url)
+    host = parsed.netloc.lower()
+
+    if host.endswith("google.com") and parsed.path in ("/url", "/news/url"):
+        params = urllib.parse.parse_qs(parsed.query)
+        for name in REDIRECT_PARAMS:
+            if params.get(name, [""])[0].startswith("http"):
+                return params[name][0]
+
+    if host == GOOGLE_NEWS_HOST:
+        parts = [p for p in parsed.path.split("/") if p]
+        if "articles" in parts and parts.index("articles") + 1 < len(parts):
+            target = _decode_google_news_id(parts[parts.index("articles") + 1])
+            if target:
+                return target
+    return url
+
+
+def canonicalize_url(url):
+    """
+    Normalized URL used as the store key:
+    redirect unwrapped, https, lowercase host without "www.", no fragment,
+    no tracking parameters (remaining ones sorted), no trailing slash.
+    """
+    if not url:
+        return ""
+    url = unwrap_redirect(str(url).strip())
+    parsed = urllib.parse.urlsplit(url)
+    host = parsed.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if host.endswith(":443") or host.endswith(":80"):
+        host = host.rsplit(":", 1)[0]
+
+    query = [
+        (k, v) for k, v in urllib.parse.parse_qsl(parsed.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PREFIXES)
+    ]
+    path = parsed.path.rstrip("/") or "/"
+    scheme = "https" if parsed.scheme in ("http", "https") else parsed.scheme
+    return urllib.parse.urlunsplit((scheme, host, path, urllib.parse.urlencode(sorted(query)), ""))
+
+
+def publisher_key(canonical_url):
+    """Returns "domain:id" for publishers with stable article ids, else ""."""
+    host = urllib.parse.urlsplit(canonical_url).netloc
+    for domain, pattern in PUBLISHER_ID_PATTERNS.items():
+        if host == domain or host.endswith("." + domain):
+            match = pattern.search(urllib.parse.urlsplit(canonical_url).path)
+            if match:
+                return f"{domain}:{match.group(1)}"
+    return ""
+
+
+class BloomFilter:
+    """Fixed-size bit array with double hashing (no deletes)."""
+    def __init__(self, capacity=BLOOM_CAPACITY, error_rate=BLOOM_ERROR_RATE):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, key):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class SeenUrlStore:
+    """
+    Set-like store of crawled article URLs.
+
+    `url in store`             -> canonical URL already seen
+    store.has_publisher_id(url) -> same publisher article id already seen
+    store.add(url)             -> buffered; written by flush() as appended lines
+    use_bloom=True keeps only a Bloom filter in memory (constant size).
+    """
+    def __init__(self, path=SEEN_URLS_FILE, ttl_days=SEEN_URL_TTL_DAYS, use_bloom=False,
+                 legacy_file=LEGACY_PROCESSED_URLS_FILE):
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self.use_bloom = use_bloom
+        self.legacy_file = legacy_file
+        self._lock = threading.Lock()
+        self._pending = []
+        self._count = 0
+        if use_bloom:
+            self._urls = self._ids = BloomFilter()
+        else:
+            self._urls, self._ids = set(), set()
+        self._load()
+
+    # --- Loading ---
+    def _parse_line(self, line, cutoff):
+        parts = line.rstrip("\n").split("\t")
+        if len(parts) < 2 or not parts[0].isdigit():
+            return None
+        if int(parts[0]) < cutoff:
+            return False
+        return parts[1], (parts[2] if len(parts) > 2 else "")
+
+    def _remember(self, canonical, pub_key):
+        self._urls.add("u:" + canonical if self.use_bloom else canonical)
+        if pub_key:
+            self._ids.add("i:" + pub_key if self.use_bloom else pub_key)
+        self._count += 1
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            self._migrate_legacy()
+            return
+
+        cutoff = int(time.time() - self.ttl)
+        expired = 0
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                entry = self._parse_line(line, cutoff)
+                if entry is False:
+                    expired += 1
+                elif entry:
+                    self._remember(*entry)
+
+        if expired >= COMPACT_MIN_EXPIRED and expired >= (expired + self._count) * COMPACT_EXPIRED_RATIO:
+            self._compact(cutoff)
+
+    def _compact(self, cutoff):
+        """Streams live lines into a new file and swaps it in (memory stays flat)."""
+        tmp_path = f"{self.path}.tmp"
+        kept = 0
+        with open(self.path, "r", encoding="utf-8") as src, open(tmp_path, "w", encoding="utf-8") as dst:
+            for line in src:
+                if self._parse_line(line, cutoff):
+                    dst.write(line if line.endswith("\n") else line + "\n")
+                    kept += 1
+        os.replace(tmp_path, self.path)
+        print(f"Compacted {self.path}: kept {kept} live URLs")
+
+    def _migrate_legacy(self):
+        if not self.legacy_file or not os.path.exists(self.legacy_file):
+            return
+        import json
+        try:
+            with open(self.legacy_file, "r", encoding="utf-8") as f:
+                urls = json.load(f)
+        except Exception as e:
+            print(f"Error reading {self.legacy_file}: {e}")
+            return
+        if isinstance(urls, list):
+            for url in urls:
+                self.add(url)
+            self.flush()
+            print(f"Migrated {len(urls)} URLs from {self.legacy_file} -> {self.path}")
+
+    # --- Queries ---
+    def __contains__(self, url):
+        canonical = canonicalize_url(url)
+        if not canonical:
+            return False
+        return ("u:" + canonical if self.use_bloom else canonical) in self._urls
+
+    def has_publisher_id(self, url):
+        pub_key = publisher_key(canonicalize_url(url))
+        if not pub_key:
+            return False
+        return ("i:" + pub_key if self.use_bloom else pub_key) in self._ids
+
+    def __len__(self):
+        return self._count
+
+    # --- Writes ---
+    def add(self, url):
+        """Marks a URL as seen. Returns False if it was already known."""
+        canonical = canonicalize_url(url)
+        if not canonical:
+            return False
+        with self._lock:
+            if ("u:" + canonical if self.use_bloom else canonical) in self._urls:
+                return False
+            pub_key = publisher_key(canonical)
+            self._remember(canonical, pub_key)
+            self._pending.append(f"{int(time.time())}\t{canonical}\t{pub_key}\n")
+            return True
+
+    def flush(self):
+        """Appends buffered URLs to the log (existing lines are never rewritten)."""
+        with self._lock:
+            if not self._pending:
+                return 0
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.writelines(self._pending)
+            written = len(self._pending)
+            self._pending = []
+            return written
@@ -0,0 +1,48 @@
+from datetime import date
+import event_index
+
+# (raw date text, expected (start, end, status))
+PARSER_CASES = [
+    ("2026-02-10", ("2026-02-10", "2026-02-10", "ok")),
+    ("2026-02-10 to 2026-02-15", ("2026-02-10", "2026-02-15", "ok")),
+    ("2026-01-18 ~ 2026-03-01 (매주 일요일)", ("2026-01-18", "2026-03-01", "ok")),
+    ("2026-10-01 ~ 10-30", ("2026-10-01", "2026-10-30", "ok")),
+    ("2026-10-01~10-30", ("2026-10-01", "2026-10-30", "ok")),
+    ("2026년 10월 1일 ~ 30일", ("2026-10-01", "2026-10-30", "ok")),
+    ("2026-12-20 ~ 01-05", ("2026-12-20", "2027-01-05", "ok")),
+    ("2026년 3월~5월", ("2026-03-01", "2026-05-31", "ok")),
+    ("2026년 11월 ~ 2월", ("2026-11-01", "2027-02-28", "ok")),
+    ("2026-03", ("2026-03-01", "2026-03-31", "ok")),
+    ("2026-03-01 ~ 미정", ("2026-03-01", None, "open")),
+    ("Oct 20, 2026", (None, None, "unparsed")),
+    ("20 - 25 Oct 2026", (None, None, "unparsed")),
+    ("🔥 뉴스/핫이슈", (None, None, "unparsed")),
+    ("", (None, None, "undated")),
+]
+
+def test_parse_event_date():
+    for raw, expected in PARSER_CASES:
+        parsed = event_index.parse_event_date(raw)
+        assert (parsed["start"], parsed["end"], parsed["status"]) == expected, raw
+
+def test_active_events():
+    today = date(2026, 10, 18)
+    events = [
+        {"title": "ended", "date": "2026-01-01"},
+        {"title": "running", "date": "2026-10-01 ~ 10-30"},
+        {"title": "open, recent", "date": "2026-09-01 ~"},
+        {"title": "open, past horizon", "date": "2025-01-01 ~"},
+        {"title": "unparsed", "date": "Oct 20, 2026"},
+    ]
+    index = event_index.EventIndex(events)
+    assert [e["title"] for e in index.active(today)] == ["running", "open, recent", "unparsed"]
+    assert [e["title"] for e in index.expired_open(today)] == ["open, past horizon"]
+    assert [e["title"] for e in index.unparsed()] == ["unparsed"]
+    for event in events:
+        expected = event["title"] in ("running", "open, recent", "unparsed")
+        assert event_index.is_active(event["date_range"], today) == expected, event["title"]
+
+if __name__ == "__main__":
+    test_parse_event_date()
+    test_active_events()
+    print("event_index checks passed")
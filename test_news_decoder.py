@@ -0,0 +1,75 @@
+import json
+import time
+import numpy as np
+import pandas as pd
+import db_utils
+
+def legacy_decode(df, since_date=None, on_date=None):
+    """Row-by-row loop previously copied into each db_utils loader."""
+    records = df.to_dict(orient="records")
+    news_by_date = {}
+    for item in records:
+        if pd.isna(item.get('date')): continue
+        date_str = str(item['date']).split('T')[0].split(' ')[0]
+        if since_date and date_str < since_date: continue
+        if on_date and date_str != on_date: continue
+        if date_str not in news_by_date:
+            news_by_date[date_str] = []
+        clean_item = {k: (v if not pd.isna(v) else "") for k, v in item.items()}
+        for field in ['references', 'related_topics']:
+            if field in clean_item and isinstance(clean_item[field], str):
+                val = str(clean_item[field]).strip()
+                if val.startswith('[') or val.startswith('{'):
+                    try:
+                        clean_item[field] = json.loads(val)
+                    except:
+                        try:
+                            import ast
+                            clean_item[field] = ast.literal_eval(val)
+                        except:
+                            pass
+        if not clean_item.get('link') or clean_item['link'] == "" or clean_item['link'] == "#":
+            refs = clean_item.get('references')
+            if isinstance(refs, list) and refs:
+                clean_item['link'] = refs[0].get('url', "#")
+            elif isinstance(refs, str) and refs.startswith('http'):
+                clean_item['link'] = refs
+        news_by_date[date_str].append(clean_item)
+    return news_by_date
+
+def build_sheet_frame(n_rows=10000):
+    """Mimics conn.read() output: JSON columns as strings, blanks as NaN."""
+    news = db_utils.load_news_partitions()
+    base = [dict(item) for items in news.values() for item in items]
+    rows = []
+    for i in range(n_rows):
+        item = dict(base[i % len(base)])
+        item['date'] = f"2025-{1 + (i // 900) % 12:02d}-{1 + (i // 30) % 28:02d}"
+        item['references'] = json.dumps(item.get('references', []), ensure_ascii=False)
+        item.pop('event_info', None)
+        if i % 7 == 0:
+            item['link'] = np.nan
+        if i % 11 == 0:
+            item['image_url'] = np.nan
+        rows.append(item)
+    return pd.DataFrame(rows)
+
+def run_benchmark():
+    df = build_sheet_frame()
+    print(f"--- News decoder benchmark ({len(df)} rows) ---")
+    cases = [
+        ("full corpus", {}),
+        ("recent window", {"since_date": "2025-11-01"}),
+        ("single date", {"on_date": "2025-03-05"}),
+    ]
+    for label, kwargs in cases:
+        t0 = time.perf_counter()
+        old = legacy_decode(df, **kwargs)
+        t1 = time.perf_counter()
+        new = db_utils.decode_news_frame(df, **kwargs)
+        t2 = time.perf_counter()
+        same = json.dumps(old, ensure_ascii=False, sort_keys=True, default=str) == json.dumps(new, ensure_ascii=False, sort_keys=True, default=str)
+        print(f"{label:14s} legacy {t1 - t0:.3f}s | vectorized {t2 - t1:.3f}s | identical: {same}")
+
+if __name__ == "__main__":
+    run_benchmark()
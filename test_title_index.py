@@ -0,0 +1,79 @@
+import difflib
+import re
+import time
+import db_utils
+import utils
+
+THRESHOLDS = (0.6, 0.85)   # batch_job: past items / today's items and in-batch dedup
+N_QUERIES = 150
+
+def legacy_matches(new_title, existing_titles, threshold):
+    """Full difflib scan previously run by batch_job against every recent title."""
+    lowered = new_title.lower()
+    return {
+        existing for existing in existing_titles
+        if difflib.SequenceMatcher(None, lowered, existing.lower()).ratio() > threshold
+    }
+
+def legacy_is_similar(new_title, existing_titles, threshold, matches=None):
+    """batch_job's decision: a title above the threshold with the same numbers."""
+    nums_new = re.findall(r'\d+', new_title)
+    if matches is None:
+        matches = legacy_matches(new_title, existing_titles, threshold)
+    return any(re.findall(r'\d+', existing) == nums_new for existing in matches)
+
+def indexed_is_similar(index, new_title, threshold):
+    """Same decision through TitleIndex (as batch_job runs it now)."""
+    nums_new = re.findall(r'\d+', new_title)
+    return any(
+        ratio > threshold and re.findall(r'\d+', existing) == nums_new
+        for existing, ratio in index.ratios(new_title, threshold)
+    )
+
+def load_real_titles():
+    """Stored topic titles + their source article titles (Korean, Thai and English)."""
+    news = db_utils.load_news_partitions(db_utils.ARCHIVE_NEWS_DIR)
+    news.update(db_utils.load_news_partitions())
+    existing, queries = [], []
+    for date_key in sorted(news):
+        for item in news[date_key]:
+            existing.append(item.get('title', ''))
+            for ref in item.get('references') or []:
+                if isinstance(ref, dict) and ref.get('title'):
+                    queries.append(ref['title'])
+    existing = [t for t in existing if t]
+    # Queries: source titles, stored titles, and lightly edited stored titles (near the thresholds)
+    queries += existing[::4]
+    queries += [" ".join(t.split()[:-1]) for t in existing[1::6] if len(t.split()) > 3]
+    queries += [t + " (속보)" for t in existing[2::6]]
+    step = max(1, len(queries) // N_QUERIES)
+    return existing, queries[::step][:N_QUERIES]
+
+def test_title_index_matches_full_scan():
+    existing, queries = load_real_titles()
+    if not existing:
+        print("No stored news titles found.")
+        return
+    index = utils.TitleIndex(existing)
+    for threshold in THRESHOLDS:
+        for query in queries:
+            legacy = legacy_matches(query, existing, threshold)
+            indexed = {t for t, r in index.ratios(query, threshold) if r > threshold}
+            assert indexed == legacy, query
+            assert indexed_is_similar(index, query, threshold) == legacy_is_similar(query, existing, threshold, legacy), query
+
+def run_benchmark():
+    existing, queries = load_real_titles()
+    index = utils.TitleIndex(existing)
+    print(f"--- Title similarity check ({len(existing)} titles, {len(queries)} queries) ---")
+    for threshold in THRESHOLDS:
+        t0 = time.perf_counter()
+        old = [legacy_is_similar(q, existing, threshold) for q in queries]
+        t1 = time.perf_counter()
+        new = [indexed_is_similar(index, q, threshold) for q in queries]
+        t2 = time.perf_counter()
+        print(f"threshold {threshold}: full scan {t1 - t0:.3f}s | index {t2 - t1:.3f}s | "
+              f"{sum(old)} similar | same decisions: {old == new}")
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,40 @@
+import json
+import time
+import utils
+import tour_ranker
+
+EVAL_SET_FILE = "data/tour_eval_set.json"
+
+def run_evaluation(k=tour_ranker.SHORTLIST_SIZE):
+    """Offline check of the recommend_tours shortlist: recall of hand-picked tours + prompt size."""
+    tours = utils.load_tours_local()
+    with open(EVAL_SET_FILE, 'r', encoding='utf-8') as f:
+        cases = json.load(f)
+
+    print(f"--- Tour shortlist evaluation ({len(cases)} profiles, k={k}) ---")
+    recalls, full_chars, short_chars, elapsed = [], 0, 0, 0.0
+    for case in cases:
+        region_tours = [t for t in tours if t.get('region', '방콕') == case['region']]
+        t0 = time.perf_counter()
+        index = tour_ranker.build_index(region_tours)
+        style_keys = [utils.tour_preference_key(s) for s in case['style']]
+        picked = tour_ranker.shortlist(index, utils.tour_preference_key(case['who']), style_keys,
+                                       utils.tour_preference_key(case['budget']), k=k)
+        elapsed += time.perf_counter() - t0
+
+        relevant = set(case['relevant'])
+        hits = relevant & {t['id'] for t in picked}
+        recalls.append(len(hits) / len(relevant))
+        full_chars += len(utils.build_tour_prompt_catalog(region_tours))
+        short_chars += len(utils.build_tour_prompt_catalog(picked))
+        missed = sorted(relevant - hits)
+        print(f"{case['region']} | {case['who']} | {', '.join(case['style'])} | {case['budget']}: "
+              f"recall {recalls[-1]:.2f}" + (f" (missed {missed})" if missed else ""))
+
+    print(f"mean recall@{k}: {sum(recalls) / len(recalls):.2f}")
+    print(f"prompt catalog: {full_chars / len(cases):,.0f} -> {short_chars / len(cases):,.0f} chars per request "
+          f"({short_chars / full_chars:.0%})")
+    print(f"ranking time: {elapsed / len(cases) * 1000:.2f} ms per request (index built each time)")
+
+if __name__ == "__main__":
+    run_evaluation()
@@ -2,6 +2,7 @@ import os
 import json
 import utils
 import db_utils
+import seen_urls
 from datetime import datetime
 import pytz
 
@@ -10,13 +11,11 @@ def dry_run():
     
     # 1. Load config
     FEEDS_FILE = 'data/feeds.json'
-    PROCESSED_URLS_FILE = 'data/processed_urls.json'
     
     with open(FEEDS_FILE, 'r') as f:
         feeds = json.load(f)
     
-    with open(PROCESSED_URLS_FILE, 'r') as f:
-        processed_urls = set(json.load(f))
+    processed_urls = seen_urls.SeenUrlStore()
     
     print(f"Loaded {len(processed_urls)} processed URLs.")
     
@@ -0,0 +1,111 @@
+import copy
+import hashlib
+import json
+import threading
+import time
+
+# In-process tour catalog (Google Sheets 'gsheets_tours' -> data/tours.json fallback)
+# - Loaded once per TOUR_CATALOG_TTL; a failed sheet read serves the local JSON and
+#   retries the sheet after TOUR_CATALOG_RETRY
+# - Indexed by id, region and type tag, so the tour tab and the recommender never scan
+#   or re-read the sheet per interaction
+# - save_tours() writes through with replace(); `signature` changes with the content
+TOUR_CATALOG_TTL = 600    # seconds
+TOUR_CATALOG_RETRY = 60   # seconds before retrying the sheet after a fallback
+DEFAULT_REGION = "방콕"
+
+
+class TourCatalog:
+    """
+    fetch_sheet: callable returning the sheet tours (list) or None on error
+    fetch_local: callable returning the data/tours.json tours (list)
+    """
+    def __init__(self, fetch_sheet, fetch_local, ttl=TOUR_CATALOG_TTL):
+        self.fetch_sheet = fetch_sheet
+        self.fetch_local = fetch_local
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._tours = []
+        self._by_id = {}       # str(id) -> tour
+        self._by_name = {}     # name -> tour (first wins, like the old next() scan)
+        self._by_region = {}   # region -> [tours] (catalog order)
+        self._by_type = {}     # tag -> [tours]
+        self._expires_at = 0
+        self.source = None     # "sheet" | "local"
+        self._signature = ""
+
+    # --- Index ---
+    def _build(self, tours, source, ttl):
+        by_id, by_name, by_region, by_type = {}, {}, {}, {}
+        for t in tours:
+            if not isinstance(t, dict):
+                continue
+            by_id.setdefault(str(t.get('id', '')), t)
+            by_name.setdefault(t.get('name'), t)
+            by_region.setdefault(t.get('region', DEFAULT_REGION), []).append(t)
+            for tag in t.get('type') or []:
+                by_type.setdefault(tag, []).append(t)
+        self._tours = [t for t in tours if isinstance(t, dict)]
+        self._by_id, self._by_name, self._by_region, self._by_type = by_id, by_name, by_region, by_type
+        self.source = source
+        self._signature = hashlib.md5(
+            json.dumps(self._tours, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()[:16]
+        self._expires_at = time.time() + ttl
+
+    def _ensure_fresh(self):
+        with self._lock:
+            if time.time() < self._expires_at:
+                return
+            tours = self.fetch_sheet()
+            if tours:
+                self._build(tours, "sheet", self.ttl)
+            else:
+                print("Fallback to local tours.json")
+                self._build(self.fetch_local() or [], "local", TOUR_CATALOG_RETRY)
+            print(f"Tour catalog loaded: {len(self._tours)} tours ({self.source})")
+
+    # --- Writes ---
+    def replace(self, tours):
+        """Write-through after save_tours (no sheet re-read)."""
+        with self._lock:
+            self._build(copy.deepcopy(list(tours)), self.source or "sheet", self.ttl)
+
+    def invalidate(self):
+        with self._lock:
+            self._expires_at = 0
+
+    # --- Queries (shared objects: treat as read-only) ---
+    @property
+    def signature(self):
+        """Content hash of the current catalog (changes on every edit / reload with new data)."""
+        self._ensure_fresh()
+        return self._signature
+
+    def all(self):
+        self._ensure_fresh()
+        return self._tours
+
+    def tours(self):
+        """Editable deep copy of the catalog (admin edits -> save_tours)."""
+        with self._lock:
+            return copy.deepcopy(self.all())
+
+    def get(self, tour_id):
+        self._ensure_fresh()
+        return self._by_id.get(str(tour_id))
+
+    def by_region(self, region):
+        self._ensure_fresh()
+        return self._by_region.get(region, [])
+
+    def by_type(self, tag):
+        self._ensure_fresh()
+        return self._by_type.get(tag, [])
+
+    def find_by_name(self, name):
+        """Exact name first, then the first partial match either way."""
+        self._ensure_fresh()
+        if name in self._by_name:
+            return self._by_name[name]
+        return next((t for t in self._tours if name in t["name"] or t["name"] in name), None)
@@ -0,0 +1,113 @@
+import re
+
+# Local pre-ranking for recommend_tours
+# Each tour gets a feature vector over the tour tab's preference vocabulary
+# (who_* / style_* / budget_* keys), computed once per catalog signature from its
+# type tags, price band and name/desc/pros keywords. A request is scored with a
+# handful of dict lookups, and only the top SHORTLIST_SIZE tours go into the prompt.
+SHORTLIST_SIZE = 12        # the model picks 6, so it still gets a choice
+TAG_WEIGHT = 2.0           # keyword found in a type tag
+TEXT_WEIGHT = 1.0          # keyword found in name / desc / pros only
+MAX_AFFINITY = 6.0         # cap per preference, so tag-heavy tours don't dominate
+STYLE_WEIGHT = 1.5          # applied to the mean over the selected styles
+BUDGET_WEIGHT = 1.5
+
+# Price bands in KRW ("약 45,000원")
+PRICE_BANDS = ((30000, "low"), (100000, "mid"), (float("inf"), "high"))
+
+# Preference key -> keywords (Korean tags first, English for *_en fields)
+PREFERENCE_TERMS = {
+    "who_alone": ["혼자", "자기계발", "원데이클래스", "짧은코스", "로컬", "자전거", "solo"],
+    "who_couple": ["커플", "연인", "로맨틱", "데이트", "선셋", "야경", "디너", "couple", "romantic"],
+    "who_friend": ["친구", "액티비티", "스릴", "익스트림", "나이트라이프", "펍", "단체", "friends"],
+    "who_child": ["아이", "키즈", "가족", "테마파크", "수족관", "아쿠아리움", "동물", "놀이", "family", "kids"],
+    "who_parent": ["부모님", "가족", "힐링", "문화", "역사", "크루즈", "스파", "마사지", "산책", "parents"],
+    "style_healing": ["힐링", "마사지", "스파", "온천", "휴식", "웰빙", "여유", "spa", "massage"],
+    "style_photo": ["인생샷", "사진", "선셋", "오션뷰", "루프탑", "랜드마크", "photo"],
+    "style_history": ["역사", "문화", "사원", "박물관", "미술관", "전통", "temple", "history"],
+    "style_activity": ["액티비티", "스릴", "익스트림", "다이빙", "제트스키", "레이싱", "집라인", "번지",
+                       "스노클링", "스노쿨링", "수상액티비티", "activity"],
+    "style_food": ["맛집", "미식", "요리", "다이닝", "뷔페", "디너", "미슐랭", "쿠킹", "food"],
+    "style_night": ["야경", "로맨틱", "나이트", "루프탑", "선셋", "불꽃놀이", "크루즈", "야간", "night"],
+    "style_unique": ["이색", "체험", "원데이클래스", "unique"],
+}
+LUXURY_TERMS = ["럭셔리", "프라이빗", "프리미엄", "파인다이닝", "비쌈"]
+BUDGET_AFFINITY = {  # budget key -> {price band: score}
+    "budget_low": {"low": 2.0, "mid": 1.0, "high": -1.0},
+    "budget_mid": {"low": 1.0, "mid": 2.0, "high": 0.0},
+    "budget_high": {"low": 0.0, "mid": 1.0, "high": 2.0},
+}
+
+INDEX_CACHE_SIZE = 32
+_index_cache = {}  # catalog signature (+ region) -> index
+
+
+def parse_price(price):
+    """'약 45,000원' -> 45000 (None if no digits)."""
+    digits = re.sub(r"[^0-9]", "", str(price or ""))
+    return int(digits) if digits else None
+
+
+def price_band(price):
+    value = parse_price(price)
+    if value is None:
+        return "mid"
+    return next(band for limit, band in PRICE_BANDS if value < limit)
+
+
+def _text(value):
+    return str(value).lower() if isinstance(value, str) else ""
+
+
+def tour_features(tour):
+    """Feature vector {preference key: affinity} + price band for one tour."""
+    tags = [_text(tag) for tag in tour.get("type") or []]
+    body = " ".join(_text(tour.get(f)) for f in ("name", "desc", "pros", "name_en", "desc_en", "pros_en"))
+
+    def affinity(terms):
+        score = 0.0
+        for term in terms:
+            if any(term in tag for tag in tags):
+                score += TAG_WEIGHT
+            elif term in body:
+                score += TEXT_WEIGHT
+        return min(score, MAX_AFFINITY)
+
+    vector = {key: affinity(terms) for key, terms in PREFERENCE_TERMS.items()}
+    band = price_band(tour.get("price"))
+    luxury = affinity(LUXURY_TERMS)
+    for key, by_band in BUDGET_AFFINITY.items():
+        vector[key] = by_band[band]
+    vector["budget_high"] += min(luxury, TAG_WEIGHT)
+    vector["budget_low"] -= min(luxury, TAG_WEIGHT) / 2
+    return {"vector": vector, "band": band}
+
+
+def build_index(tours, signature=None):
+    """[(tour, features)] in catalog order; memoized per catalog signature."""
+    if signature and signature in _index_cache:
+        return _index_cache[signature]
+    index = [(t, tour_features(t)) for t in tours]
+    if signature:
+        if len(_index_cache) >= INDEX_CACHE_SIZE:
+            _index_cache.clear()  # Old catalog versions
+        _index_cache[signature] = index
+    return index
+
+
+def score(features, who_key, style_keys, budget_key):
+    vector = features["vector"]
+    total = vector.get(who_key, 0.0)
+    if style_keys:
+        total += sum(vector.get(k, 0.0) for k in style_keys) / len(style_keys) * STYLE_WEIGHT
+    total += vector.get(budget_key, 0.0) * BUDGET_WEIGHT
+    return total
+
+
+def shortlist(index, who_key, style_keys, budget_key, k=SHORTLIST_SIZE):
+    """Top-k tours for the profile (ties keep catalog order)."""
+    ranked = sorted(
+        enumerate(index),
+        key=lambda item: (-score(item[1][1], who_key, style_keys, budget_key), item[0])
+    )
+    return [tour for _, (tour, _) in ranked[:k]]
@@ -0,0 +1,89 @@
+import copy
+import json
+import os
+import threading
+import time
+
+# Tour recommendation cache keyed by preference profile
+#   key = region | who | sorted styles | budget | language   (labels normalized to UI_TEXT keys)
+# Each entry remembers the tour catalog signature it was built from; entries of an
+# older catalog never hit and are dropped on the next write. The batch job can
+# pre-warm common profiles, so the file is shared through the repo like other data.
+TOUR_REC_CACHE_FILE = "data/tour_recommendations.json"
+TOUR_REC_CACHE_TTL = 7 * 86400   # seconds
+TOUR_REC_CACHE_MAX_ENTRIES = 500
+
+_lock = threading.Lock()
+_entries = None    # {profile_key: {"catalog": signature, "created_at": ts, "result": {...}}}
+_loaded_mtime = None
+
+
+def profile_key(region, who, styles, budget, language):
+    """Normalized cache key; style order and duplicates don't matter."""
+    style_part = ",".join(sorted(set(styles or [])))
+    return f"{region}|{who}|{style_part}|{budget}|{language or 'Korean'}"
+
+
+def _load():
+    """(Re)reads the file when it changed on disk (e.g. a deploy with pre-warmed entries)."""
+    global _entries, _loaded_mtime
+    mtime = os.path.getmtime(TOUR_REC_CACHE_FILE) if os.path.exists(TOUR_REC_CACHE_FILE) else None
+    if _entries is not None and mtime == _loaded_mtime:
+        return _entries
+    entries = {}
+    if mtime is not None:
+        try:
+            with open(TOUR_REC_CACHE_FILE, 'r', encoding='utf-8') as f:
+                entries = json.load(f).get("entries", {})
+        except Exception as e:
+            print(f"Tour recommendation cache read error: {e}")
+    _entries, _loaded_mtime = entries, mtime
+    return _entries
+
+
+def _save(entries):
+    global _loaded_mtime
+    try:
+        os.makedirs(os.path.dirname(TOUR_REC_CACHE_FILE) or ".", exist_ok=True)
+        tmp_path = f"{TOUR_REC_CACHE_FILE}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"entries": entries}, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, TOUR_REC_CACHE_FILE)
+        _loaded_mtime = os.path.getmtime(TOUR_REC_CACHE_FILE)
+    except Exception as e:
+        print(f"Tour recommendation cache write error: {e}")
+
+
+def _is_fresh(entry, catalog_signature, now):
+    return entry.get("catalog") == catalog_signature and now - entry.get("created_at", 0) < TOUR_REC_CACHE_TTL
+
+
+def get(key, catalog_signature):
+    """Cached result for the profile, or None (missing, expired or built from another catalog)."""
+    with _lock:
+        entry = _load().get(key)
+        if entry and _is_fresh(entry, catalog_signature, time.time()):
+            return copy.deepcopy(entry["result"])
+    return None
+
+
+def put(key, catalog_signature, result):
+    global _entries
+    now = time.time()
+    with _lock:
+        entries = {k: e for k, e in _load().items() if _is_fresh(e, catalog_signature, now)}
+        entries[key] = {"catalog": catalog_signature, "created_at": now, "result": copy.deepcopy(result)}
+        if len(entries) > TOUR_REC_CACHE_MAX_ENTRIES:
+            oldest = sorted(entries, key=lambda k: entries[k]["created_at"])
+            for k in oldest[:len(entries) - TOUR_REC_CACHE_MAX_ENTRIES]:
+                del entries[k]
+        _entries = entries
+        _save(entries)
+
+
+def invalidate():
+    """Drops every entry (the catalog signature check already covers edits)."""
+    global _entries
+    with _lock:
+        _entries = {}
+        _save(_entries)
@@ -5,12 +5,13 @@ from datetime import datetime, timedelta
 import time
 import json
 import os
+import threading
 # import certifi
 # os.environ["SSL_CERT_FILE"] = certifi.where()
 import certifi
 import os
 os.environ["SSL_CERT_FILE"] = certifi.where()
-import requests
+import http_utils
 import re
 from bs4 import BeautifulSoup
 import gspread
@@ -21,6 +22,11 @@ import csv
 from streamlit_gsheets import GSheetsConnection
 import streamlit as st
 import pathlib
+from llm_cache import cached_generate_content
+import restaurant_cache
+import tour_catalog
+import tour_ranker
+import tour_rec_cache
 
 # --- GA4 (Google Analytics 4) Injection ---
 @st.cache_resource
@@ -332,6 +338,60 @@ def detect_browser_language():
         # Fallback: Default to English for international users / reviewers
         return "English"
 
+# --- Keyword Highlighting ---
+# [OPTIMIZED] Keyword -> severity table kept as data; one compiled alternation does a
+# single pass per text (was ~30 str.replace passes, which could also double-wrap a
+# keyword found inside another keyword's markup). Kept in utils rather than app.py,
+# which Streamlit re-executes on every rerun, so the regex and memo are built once.
+HIGHLIGHT_KEYWORDS = {
+    # 1. 위험 (Red) - 가장 강력한 경고
+    "red": ["사망", "살인", "체포", "총기", "마약", "야바", "폭발", "화재", "강도", "성범죄", "테러"],
+    # 2. 주의/경고 (Orange) - 비자, 법규, 벌금
+    "orange": ["추방", "블랙리스트", "입국거부", "단속", "벌금", "전자담배", "불법", "비자", "경고"],
+    # 3. 경제/정보 (Blue) - 돈, 수치 변화
+    "blue": ["인상", "하락", "폭등", "폭락", "환율", "사기", "바가지"],
+    # 4. 배경지식 (Green) - 환경, 질병
+    "green": ["홍수", "침수", "뎅기열", "주류 판매 금지", "시위"],
+}
+HIGHLIGHT_HTML_COLORS = {"red": "#FF4444", "orange": "#FF8C00", "blue": "#1E90FF", "green": "#32CD32"}
+HIGHLIGHT_CACHE_SIZE = 2048  # memoized summaries per variant
+
+_KEYWORD_SEVERITY = {word: severity for severity, words in HIGHLIGHT_KEYWORDS.items() for word in words}
+# Longest first, so the alternation prefers the longest keyword at a position
+_KEYWORD_RE = re.compile("|".join(re.escape(w) for w in sorted(_KEYWORD_SEVERITY, key=len, reverse=True)))
+_highlight_cache = {"markdown": {}, "html": {}}
+
+def _highlight(text, variant):
+    if variant == "html":
+        def wrap(m):
+            color = HIGHLIGHT_HTML_COLORS[_KEYWORD_SEVERITY[m.group(0)]]
+            return f"<span style='color:{color};font-weight:bold;'>{m.group(0)}</span>"
+    else:
+        def wrap(m):
+            return f":{_KEYWORD_SEVERITY[m.group(0)]}[**{m.group(0)}**]"
+    return _KEYWORD_RE.sub(wrap, text or "")
+
+def _highlight_memo(text, variant, topic_id):
+    if not topic_id:
+        return _highlight(text, variant)
+    cache = _highlight_cache[variant]
+    hit = cache.get(topic_id)
+    if hit is not None and hit[0] == text:  # topic_id survives edits, so the text is checked too
+        return hit[1]
+    if len(cache) >= HIGHLIGHT_CACHE_SIZE:
+        cache.clear()
+    rendered = _highlight(text, variant)
+    cache[topic_id] = (text, rendered)
+    return rendered
+
+def highlight_text(text, topic_id=None):
+    """Highlight keywords using Streamlit markdown syntax (for st.markdown)"""
+    return _highlight_memo(text, "markdown", topic_id)
+
+def highlight_text_html(text, topic_id=None):
+    """Highlight keywords using HTML spans (for raw HTML rendering in news cards)"""
+    return _highlight_memo(text, "html", topic_id)
+
 import streamlit as st
 import streamlit.components.v1 as components
 
@@ -617,7 +677,7 @@ def fetch_combined_english_news(max_articles=15):
     
     for rss_url in THAI_ENGLISH_RSS:
         try:
-            feed = feedparser.parse(rss_url)
+            feed = feedparser.parse(http_utils.get(rss_url, timeout=10).content)
             source_name = feed.feed.get('title', 'Thai News')[:30]
             
             for entry in feed.entries[:10]:  # Max 10 per source
@@ -846,44 +906,116 @@ def get_hotel_gsheets_client():
         print(f"GSheets Auth Error: {e}")
         return None
 
-def get_hotel_cache(hotel_name, language="Korean"):
-    """Checks if analysis for the given hotel already exists in GSheets (Language aware)."""
+# --- Hotel Cache Index (keyed lookup instead of sheet scans) ---
+# hotel_cache_db rows: [hotel_name, cached_date, ai_summary, raw_json, agoda_url, language]
+# Loaded once per process (or from the on-disk snapshot), then refreshed by
+# fetching only rows appended since the last load. Writes go to the sheet and the index.
+HOTEL_CACHE_FILE = "data/hotel_cache_index.json"  # On-disk snapshot (survives restarts)
+HOTEL_CACHE_TTL = 600               # seconds between incremental refreshes
+HOTEL_CACHE_FULL_RELOAD = 6 * 3600  # full re-download (picks up manual sheet edits)
+
+_hotel_index = None  # { "rows": {"name\tlang": [row_no, row]}, "row_count", "refreshed_at", "loaded_at" }
+_hotel_index_lock = threading.Lock()
+
+def normalize_hotel_name(name):
+    """Case/width/whitespace-insensitive hotel key."""
+    import unicodedata
+    return " ".join(unicodedata.normalize("NFKC", str(name or "")).casefold().split())
+
+def _hotel_key(hotel_name, language):
+    return f"{normalize_hotel_name(hotel_name)}\t{language or 'Korean'}"
+
+def _get_hotel_cache_sheet():
     client = get_hotel_gsheets_client()
     if not client: return None
+    return client.open("hotel_cache_db").get_worksheet(0)
+
+def _index_hotel_rows(index, rows, first_row_no):
+    for offset, row in enumerate(rows):
+        if not row or not row[0] or row[0] == "hotel_name":
+            continue
+        language = row[5] if len(row) >= 6 and row[5] else "Korean"
+        # First row wins (same as the previous top-down scan)
+        index["rows"].setdefault(_hotel_key(row[0], language), [first_row_no + offset, row])
+    index["row_count"] = max(index["row_count"], first_row_no + len(rows) - 1)
+
+def _save_hotel_index_snapshot(index):
     try:
-        sh = client.open("hotel_cache_db")
-        sheet = sh.get_worksheet(0)
+        tmp_path = f"{HOTEL_CACHE_FILE}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False)
+        os.replace(tmp_path, HOTEL_CACHE_FILE)
+    except Exception as e:
+        print(f"Hotel cache snapshot error: {e}")
+
+def _load_hotel_index_snapshot():
+    if not os.path.exists(HOTEL_CACHE_FILE):
+        return None
+    try:
+        with open(HOTEL_CACHE_FILE, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if isinstance(index, dict) and "rows" in index:
+            return index
+    except Exception as e:
+        print(f"Hotel cache snapshot read error: {e}")
+    return None
+
+def _get_hotel_index(force=False, full=False):
+    """
+    Returns the index, refreshing it (new rows only) when the TTL has passed.
+    full=True re-downloads the sheet (row numbers must be exact before writes).
+    """
+    global _hotel_index
+    with _hotel_index_lock:
+        if _hotel_index is None:
+            _hotel_index = _load_hotel_index_snapshot() or {"rows": {}, "row_count": 0, "refreshed_at": 0, "loaded_at": 0}
         
-        from gspread.utils import escape_for_json
-        # Search for hotel_name
-        cells = sheet.find(hotel_name, in_column=1)
-        if cells:
-             # There might be multiple entries for different languages
-             all_records = sheet.get_all_values()
-             for row in all_records:
-                 if row[0] == hotel_name:
-                     # Row: [name, date, summary, json, agoda, lang]
-                     cached_lang = row[5] if len(row) >= 6 else "Korean"
-                     if cached_lang == language:
-                        return {
-                            "hotel_name": row[0],
-                            "cached_date": row[1],
-                            "ai_summary": row[2],
-                            "raw_json": json.loads(row[3]),
-                            "agoda_url": row[4] if len(row) > 4 else None,
-                            "language": cached_lang
-                        }
+        now = time.time()
+        if not force and not full and now - _hotel_index["refreshed_at"] < HOTEL_CACHE_TTL:
+            return _hotel_index
+        
+        try:
+            sheet = _get_hotel_cache_sheet()
+            if sheet is None:
+                return _hotel_index
+            if full or now - _hotel_index["loaded_at"] >= HOTEL_CACHE_FULL_RELOAD:
+                index = {"rows": {}, "row_count": 0, "refreshed_at": now, "loaded_at": now}
+                _index_hotel_rows(index, sheet.get_all_values(), 1)
+            else:
+                index = _hotel_index
+                start = index["row_count"] + 1
+                _index_hotel_rows(index, sheet.get(f"A{start}:F"), start)
+                index["refreshed_at"] = now
+            _hotel_index = index
+            _save_hotel_index_snapshot(index)
+        except Exception as e:
+            print(f"Hotel cache refresh error: {e}")
+            _hotel_index["refreshed_at"] = now  # Back off until the next TTL
+        return _hotel_index
+
+def get_hotel_cache(hotel_name, language="Korean"):
+    """Checks if analysis for the given hotel already exists (Language aware, keyed lookup)."""
+    try:
+        entry = _get_hotel_index()["rows"].get(_hotel_key(hotel_name, language))
+        if entry:
+            row = entry[1]
+            return {
+                "hotel_name": row[0],
+                "cached_date": row[1],
+                "ai_summary": row[2],
+                "raw_json": json.loads(row[3]),
+                "agoda_url": row[4] if len(row) > 4 else None,
+                "language": row[5] if len(row) >= 6 and row[5] else "Korean"
+            }
     except Exception as e:
         print(f"Cache Lookup Error: {e}")
     return None
 
 def save_hotel_cache(hotel_name, ai_summary, raw_json_dict, agoda_url=None, language="Korean"):
-    """Appends new analysis results to the hotel_cache_db GSheet."""
-    client = get_hotel_gsheets_client()
-    if not client: return
+    """Appends new analysis results to the hotel_cache_db GSheet (write-through to the index)."""
     try:
-        sh = client.open("hotel_cache_db")
-        sheet = sh.get_worksheet(0)
+        sheet = _get_hotel_cache_sheet()
+        if sheet is None: return
         
         # Header: [hotel_name, cached_date, ai_summary, raw_json, agoda_url, language]
         from datetime import datetime
@@ -897,8 +1029,16 @@ def save_hotel_cache(hotel_name, ai_summary, raw_json_dict, agoda_url=None, lang
             agoda_url or "",
             language
         ]
-        sheet.append_row(new_row)
+        response = sheet.append_row(new_row)
         print(f"✅ Cached ({language}) analysis for: {hotel_name}")
+        
+        # Row number from "Sheet1!A12:F12"
+        match = re.search(r"![A-Z]+(\d+)", (response or {}).get("updates", {}).get("updatedRange", ""))
+        index = _get_hotel_index()
+        with _hotel_index_lock:
+            row_no = int(match.group(1)) if match else index["row_count"] + 1
+            _index_hotel_rows(index, [new_row], row_no)
+            _save_hotel_index_snapshot(index)
     except Exception as e:
         print(f"Cache Save Error: {e}")
 
@@ -907,22 +1047,27 @@ def update_hotel_agoda_url(hotel_name, agoda_url):
     """
     특정 호텔의 아고다 직통 URL을 업데이트합니다.
     관리자가 직통 링크를 수동으로 입력할 때 사용.
+    (모든 언어 행을 한 번의 batch_update로 갱신, 인덱스도 함께 갱신)
     """
-    client = get_hotel_gsheets_client()
-    if not client: return False
     try:
-        sh = client.open("hotel_cache_db")
-        sheet = sh.get_worksheet(0)
-        
-        cell = sheet.find(hotel_name)
-        if cell:
-            # 5번째 컬럼(E열)에 URL 업데이트
-            sheet.update_cell(cell.row, 5, agoda_url)
-            print(f"✅ Updated Agoda URL for: {hotel_name}")
-            return True
-        else:
+        index = _get_hotel_index(full=True)
+        name_key = normalize_hotel_name(hotel_name)
+        entries = [entry for key, entry in index["rows"].items() if key.split("\t")[0] == name_key]
+        if not entries:
             print(f"❌ Hotel not found: {hotel_name}")
             return False
+        
+        sheet = _get_hotel_cache_sheet()
+        if sheet is None: return False
+        # 5번째 컬럼(E열)에 URL 업데이트
+        sheet.batch_update([{"range": f"E{row_no}", "values": [[agoda_url]]} for row_no, _ in entries])
+        with _hotel_index_lock:
+            for _, row in entries:
+                row.extend([""] * (5 - len(row)))
+                row[4] = agoda_url
+            _save_hotel_index_snapshot(index)
+        print(f"✅ Updated Agoda URL for: {hotel_name}")
+        return True
     except Exception as e:
         print(f"Update Error: {e}")
         return False
@@ -977,95 +1122,266 @@ def get_hotel_link(hotel_name, cached_agoda_url=None):
 
 SEARCH_LOG_FILE = "data/search_log.csv"
 
-def log_search(name, rating, category):
-    """
-    사용자의 검색 내역을 Google Sheets 'search_log' 시트에 저장합니다.
-    """
-    try:
+SEARCH_LOG_FLUSH_INTERVAL = 5   # seconds between background flushes
+SEARCH_LOG_BATCH_SIZE = 20      # flush early once this many rows are buffered
+SEARCH_LOG_MAX_BUFFER = 1000    # oldest rows are dropped if the sheet stays unreachable
+SEARCH_RANK_RETRY = 60          # seconds before retrying a failed 'search_rank' load
+SEARCH_RANK_HEADERS = ['category', 'name', 'count', 'rating_sum', 'updated_at']
+
+# Buffered search log + per-(category, name) aggregates in the 'search_rank' worksheet.
+# log_search only appends to memory; a background thread writes both sheets in batches.
+_search_log_lock = threading.Lock()
+_search_log_buffer = []      # rows for 'search_log': [name, rating, category, timestamp]
+_search_rank_pending = {}    # {(category, name): [count, rating_sum]} not yet in _search_rank
+_search_rank = None          # {(category, name): [count, rating_sum, row_no]} (sheet state)
+_search_rank_dirty = set()
+_search_rank_unlocated = set()  # keys appended to 'search_rank' whose row number is not known yet
+_search_rank_failed_at = 0
+_search_log_sheets = None
+_search_rank_load_lock = threading.Lock()
+_search_log_wakeup = threading.Event()
+_search_log_thread = None
+
+def _get_search_log_sheets():
+    """('search_log', 'search_rank') worksheets, opened (or created) once per process."""
+    global _search_log_sheets
+    if _search_log_sheets is None:
         client = get_hotel_gsheets_client()
         if not client:
-            return
-
+            return None
         sh = client.open("hotel_cache_db")
         
         # 'search_log' 워크시트 가져오기 또는 생성
         try:
-            sheet = sh.worksheet("search_log")
+            log_sheet = sh.worksheet("search_log")
         except:
             # 시트가 없으면 생성 (헤더 포함)
-            sheet = sh.add_worksheet(title="search_log", rows="100", cols="4")
-            sheet.append_row(['name', 'rating', 'category', 'timestamp'])
+            log_sheet = sh.add_worksheet(title="search_log", rows="100", cols="4")
+            log_sheet.append_row(['name', 'rating', 'category', 'timestamp'])
         
-        # 데이터 추가
+        try:
+            rank_sheet = sh.worksheet("search_rank")
+        except:
+            rank_sheet = None
+        _search_log_sheets = (sh, log_sheet, rank_sheet)
+    return _search_log_sheets
+
+def _to_rating(value):
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+def _load_search_rank():
+    """
+    Loads the aggregate table once per process.
+    First run: builds 'search_rank' from the full 'search_log' (one-time migration).
+    A failed load returns None and is not retried for SEARCH_RANK_RETRY seconds,
+    so an unreachable sheet does not block every render.
+    """
+    global _search_rank_failed_at
+    if _search_rank is not None:
+        return _search_rank
+    if time.time() - _search_rank_failed_at < SEARCH_RANK_RETRY:
+        return None
+    with _search_rank_load_lock:
+        if _search_rank is None and time.time() - _search_rank_failed_at >= SEARCH_RANK_RETRY:
+            try:
+                _build_search_rank()
+            except Exception as e:
+                print(f"❌ GSheets Ranking Load Error: {e}")
+            if _search_rank is None:
+                _search_rank_failed_at = time.time()
+    return _search_rank
+
+def _build_search_rank():
+    global _search_rank, _search_log_sheets
+    sheets = _get_search_log_sheets()
+    if not sheets:
+        return
+    sh, log_sheet, rank_sheet = sheets
+    
+    rank = {}
+    if rank_sheet is not None:
+        for row_no, row in enumerate(rank_sheet.get_all_values()[1:], start=2):
+            if len(row) >= 4 and row[1]:
+                rank[(row[0], row[1])] = [int(_to_rating(row[2])), _to_rating(row[3]), row_no]
+    else:
+        print("Building search_rank from search_log (one-time)...")
+        for record in log_sheet.get_all_records():
+            entry = rank.setdefault((str(record.get('category', '')), str(record.get('name', ''))), [0, 0.0, None])
+            entry[0] += 1
+            entry[1] += _to_rating(record.get('rating'))
+        rank_sheet = sh.add_worksheet(title="search_rank", rows=str(max(100, len(rank) + 1)), cols=str(len(SEARCH_RANK_HEADERS)))
         now_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        sheet.append_row([name, rating, category, now_str])
+        rows = [SEARCH_RANK_HEADERS] + [[cat, name, c, round(total, 4), now_str] for (cat, name), (c, total, _) in rank.items()]
+        rank_sheet.update(range_name="A1", values=rows)
+        for row_no, key in enumerate(rank.keys(), start=2):
+            rank[key][2] = row_no
+        _search_log_sheets = (sh, log_sheet, rank_sheet)
+    
+    with _search_log_lock:
+        _search_rank = rank
+
+def _locate_search_rank_rows(rank_sheet, rank):
+    """Resolves row numbers of appended keys (one read) when the append response had none."""
+    row_numbers = {}
+    for row_no, row in enumerate(rank_sheet.get_all_values()[1:], start=2):
+        if len(row) >= 2 and row[1]:
+            row_numbers[(row[0], row[1])] = row_no
+    with _search_log_lock:
+        for key in _search_rank_unlocated:
+            if key in row_numbers:
+                rank[key][2] = row_numbers[key]
+            else:
+                _search_rank_dirty.add(key)  # Append never landed: write it again
+        _search_rank_unlocated.clear()
+
+def flush_search_log():
+    """Writes buffered log rows (append_rows) and changed aggregate rows (batch_update) in one pass."""
+    global _search_log_buffer, _search_rank_pending
+    try:
+        rank = _load_search_rank()
+        sheets = _get_search_log_sheets()
+    except Exception as e:
+        print(f"❌ GSheets Logging Error: {e}")
+        return
+    if rank is None or not sheets:
+        return
+    _, log_sheet, rank_sheet = sheets
+    
+    with _search_log_lock:
+        rows, _search_log_buffer = _search_log_buffer, []
+        # Fold pending deltas into the aggregate table
+        for key, (count, total) in _search_rank_pending.items():
+            entry = rank.setdefault(key, [0, 0.0, None])
+            entry[0] += count
+            entry[1] += total
+            _search_rank_dirty.add(key)
+        _search_rank_pending = {}
+        dirty = list(_search_rank_dirty)
+        _search_rank_dirty.clear()
+    
+    appended = []
+    try:
+        if rows:
+            log_sheet.append_rows(rows)
+            print(f"✅ Logged {len(rows)} searches to GSheets")
+            rows = []  # Written: only the rank step is retried on failure
         
-        print(f"✅ Logged search to GSheets: {name} ({category})")
+        if _search_rank_unlocated:
+            _locate_search_rank_rows(rank_sheet, rank)
+        now_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        updates, new_keys = [], []
+        with _search_log_lock:
+            for key in dirty:
+                count, total, row_no = rank[key]
+                values = [[key[0], key[1], count, round(total, 4), now_str]]
+                if row_no:
+                    updates.append({"range": f"A{row_no}:E{row_no}", "values": values})
+                else:
+                    new_keys.append((key, values[0]))
+        if updates:
+            rank_sheet.batch_update(updates)
+        if new_keys:
+            response = rank_sheet.append_rows([v for _, v in new_keys])
+            appended = [key for key, _ in new_keys]
+            match = re.search(r"![A-Z]+(\d+)", (response or {}).get("updates", {}).get("updatedRange", ""))
+            with _search_log_lock:
+                if match:
+                    for offset, key in enumerate(appended):
+                        rank[key][2] = int(match.group(1)) + offset
+                else:
+                    _search_rank_unlocated.update(appended)  # Located on the next flush, never re-appended
+            appended = []
     except Exception as e:
         print(f"❌ GSheets Logging Error: {e}")
+        # Retry on the next flush (bounded buffer); rows already appended are not re-sent
+        with _search_log_lock:
+            _search_log_buffer = (rows + _search_log_buffer)[-SEARCH_LOG_MAX_BUFFER:]
+            _search_rank_unlocated.update(appended)
+            _search_rank_dirty.update(k for k in dirty if k not in _search_rank_unlocated)
+
+def _search_log_worker():
+    while True:
+        _search_log_wakeup.wait(SEARCH_LOG_FLUSH_INTERVAL)
+        _search_log_wakeup.clear()
+        with _search_log_lock:
+            has_work = bool(_search_log_buffer or _search_rank_pending or _search_rank_dirty or _search_rank_unlocated)
+        if has_work:
+            flush_search_log()
+
+def log_search(name, rating, category):
+    """
+    사용자의 검색 내역을 버퍼에 기록합니다. (요청 경로에서 API 호출 없음)
+    백그라운드 스레드가 Google Sheets 'search_log'에 append_rows로 일괄 저장하고
+    'search_rank' 집계(검색 횟수, 평점 합계)를 갱신합니다.
+    """
+    global _search_log_thread
+    now_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    rating_value = _to_rating(rating)
+    with _search_log_lock:
+        _search_log_buffer.append([name, rating, category, now_str])
+        del _search_log_buffer[:-SEARCH_LOG_MAX_BUFFER]
+        entry = _search_rank_pending.setdefault((category, name), [0, 0.0])
+        entry[0] += 1
+        entry[1] += rating_value
+        if _search_log_thread is None:
+            _search_log_thread = threading.Thread(target=_search_log_worker, daemon=True)
+            _search_log_thread.start()
+            import atexit
+            atexit.register(flush_search_log)
+        if len(_search_log_buffer) >= SEARCH_LOG_BATCH_SIZE:
+            _search_log_wakeup.set()
 
-@st.cache_data(ttl=600)  # 10분간 랭킹 캐시
 def get_top_places(category, limit=10):
     """
-    Google Sheets에서 검색 내역을 읽어와 스마트 랭킹 TOP 10을 반환합니다.
+    'search_rank' 집계 테이블(메모리)에서 스마트 랭킹 TOP 10을 반환합니다.
+    (로그 전체를 읽지 않으므로 로그 크기와 무관하게 일정한 비용)
     """
     try:
-        client = get_hotel_gsheets_client()
-        if not client:
-            return []
-
-        sh = client.open("hotel_cache_db")
-        try:
-            sheet = sh.worksheet("search_log")
-        except:
-            return []
-
-        # 모든 데이터 가져오기
-        records = sheet.get_all_records()
-        if not records:
+        rank = _load_search_rank()
+        if rank is None:
             return []
-            
-        df = pd.DataFrame(records)
         
-        # 카테고리 필터링
-        df = df[df['category'] == category]
-        if df.empty:
-            return []
-            
-        # 1. 장소별 집계 (평균 평점, 검색 횟수)
-        stats = df.groupby('name').agg({
-            'rating': 'mean',
-            'name': 'count'
-        }).rename(columns={'name': 'search_count'}).reset_index()
+        # 1. 장소별 집계 (평균 평점, 검색 횟수) + 아직 반영 전인 버퍼
+        with _search_log_lock:
+            totals = {name: [count, total] for (cat, name), (count, total, _) in rank.items() if cat == category}
+            for (cat, name), (count, total) in _search_rank_pending.items():
+                if cat == category:
+                    entry = totals.setdefault(name, [0, 0.0])
+                    entry[0] += count
+                    entry[1] += total
         
         # 2. 필터링: 평점 3.5 미만 제외
-        stats = stats[stats['rating'] >= 3.5]
-        
-        if stats.empty:
-            return []
-            
         # 3. 스코어 계산 (공식: 평점 * 10 + log(검색횟수 + 1))
-        stats['score'] = stats['rating'] * 10 + np.log1p(stats['search_count'])
+        scored = []
+        for name, (count, total) in totals.items():
+            if count <= 0:
+                continue
+            avg_rating = total / count
+            if avg_rating >= 3.5:
+                scored.append((avg_rating * 10 + np.log1p(count), name, avg_rating, count))
         
         # 4. 정렬 및 상위 N개 추출
-        top_df = stats.sort_values(by='score', ascending=False).head(limit)
+        import heapq
+        top = heapq.nlargest(limit, scored)
         
         results = []
-        for i, (_, row) in enumerate(top_df.iterrows()):
-            name = row['name']
+        for i, (_, name, avg_rating, count) in enumerate(top):
             badge = ""
             if i == 0:
                 badge = "🔥 믿고 가는 랭킹 1위"
-            elif row['rating'] >= 4.8:
+            elif avg_rating >= 4.8:
                 badge = "💎 숨은 보석 (평점 4.8+)"
-            elif row['search_count'] >= 5:
+            elif count >= 5:
                 badge = "👀 지금 가장 핫함"
             
             results.append({
                 'rank': i + 1,
                 'name': name,
-                'rating': round(row['rating'], 1),
-                'count': int(row['search_count']),
+                'rating': round(avg_rating, 1),
+                'count': int(count),
                 'badge': badge
             })
             
@@ -1245,49 +1561,131 @@ def delete_blog_post(post_id):
 # 🍜 Restaurant Caching System (Google Sheets)
 # ============================================
 
+RESTAURANT_CACHE_HEADERS = ['location_id', 'name', 'rating', 'num_reviews', 'food_rating', 
+                            'atmosphere_rating', 'location_rating', 'price_level', 'price',
+                            'cuisines', 'hours', 'address', 'phone', 'web_url', 'photos', 'ranking', 'maps_url',
+                            'editorial_summary', 'recommended_menu', 'analysis', 'weekday_text', 'language']
+
+RESTAURANT_ROW_INDEX_TTL = restaurant_cache.RESTAURANT_CACHE_TTL  # seconds, like the local mirror
+
+# Opened once per process (header sync included); row index: {(location_id, language): row_no}
+# The row index is rebuilt after RESTAURANT_ROW_INDEX_TTL, and every indexed row is
+# verified before it is overwritten (rows may be sorted/deleted or appended elsewhere).
+_restaurant_sheet = None
+_restaurant_row_index = None
+_restaurant_row_index_built_at = 0
+_restaurant_sheet_lock = threading.Lock()
+
 def get_cached_restaurants_sheet():
     """
     cached_restaurants 시트를 가져오거나 생성합니다.
+    (프로세스당 1회만 열고 헤더를 동기화)
     """
+    global _restaurant_sheet
+    if _restaurant_sheet is not None:
+        return _restaurant_sheet
+    
     client = get_hotel_gsheets_client()
     if not client:
         return None
     
     try:
-        try:
-            sh = client.open("cached_restaurants")
-        except:
-            # 시트 생성
-            print("Creating cached_restaurants spreadsheet...")
-            sh = client.create("cached_restaurants")
-            sh.share('', perm_type='anyone', role='reader')
-        
-        sheet = sh.get_worksheet(0)
-        
-        expected_headers = ['location_id', 'name', 'rating', 'num_reviews', 'food_rating', 
-                           'atmosphere_rating', 'location_rating', 'price_level', 'price',
-                           'cuisines', 'hours', 'address', 'phone', 'web_url', 'photos', 'ranking', 'maps_url',
-                           'editorial_summary', 'recommended_menu', 'analysis', 'weekday_text', 'language']
-        
-        first_row = sheet.row_values(1)
-        if not first_row:
-            sheet.insert_row(expected_headers, 1)
-        elif first_row != expected_headers:
-            # 기존 헤더와 다르면 (새 컬럼 추가 등) 부족한 부분 업데이트
-            for i, header in enumerate(expected_headers):
-                if i >= len(first_row) or first_row[i] != header:
-                    sheet.update_cell(1, i + 1, header)
-            print(f"✅ Google Sheets headers synchronized: {len(expected_headers)} columns")
-        
-        return sheet
+        with _restaurant_sheet_lock:
+            if _restaurant_sheet is not None:
+                return _restaurant_sheet
+            try:
+                sh = client.open("cached_restaurants")
+            except:
+                # 시트 생성
+                print("Creating cached_restaurants spreadsheet...")
+                sh = client.create("cached_restaurants")
+                sh.share('', perm_type='anyone', role='reader')
+            
+            sheet = sh.get_worksheet(0)
+            
+            first_row = sheet.row_values(1)
+            if not first_row:
+                sheet.insert_row(RESTAURANT_CACHE_HEADERS, 1)
+            elif first_row[:len(RESTAURANT_CACHE_HEADERS)] != RESTAURANT_CACHE_HEADERS:
+                # 기존 헤더와 다르면 (새 컬럼 추가 등) 헤더 행 전체를 한 번에 갱신
+                sheet.update(range_name=f"A1:{_restaurant_last_col()}1", values=[RESTAURANT_CACHE_HEADERS])
+                print(f"✅ Google Sheets headers synchronized: {len(RESTAURANT_CACHE_HEADERS)} columns")
+            
+            _restaurant_sheet = sheet
+            return sheet
     except Exception as e:
         print(f"Cache Sheet Error: {e}")
         return None
 
 
+def _restaurant_last_col():
+    from gspread.utils import rowcol_to_a1
+    return re.sub(r"\d", "", rowcol_to_a1(1, len(RESTAURANT_CACHE_HEADERS)))
+
+
+def _get_restaurant_row_index(sheet, rebuild=False):
+    """{(location_id, language): row_no}, built from the id and language columns (per TTL or on rebuild)."""
+    global _restaurant_row_index, _restaurant_row_index_built_at
+    with _restaurant_sheet_lock:
+        expired = time.time() - _restaurant_row_index_built_at >= RESTAURANT_ROW_INDEX_TTL
+        if _restaurant_row_index is None or expired or rebuild:
+            lang_col = _restaurant_last_col()
+            id_values, lang_values = sheet.batch_get(["A2:A", f"{lang_col}2:{lang_col}"])
+            index = {}
+            for offset, id_row in enumerate(id_values):
+                if not id_row or not id_row[0]:
+                    continue
+                lang_row = lang_values[offset] if offset < len(lang_values) else []
+                language = (lang_row[0] if lang_row else "") or "Korean"
+                index.setdefault((str(id_row[0]), language), offset + 2)
+            _restaurant_row_index = index
+            _restaurant_row_index_built_at = time.time()
+        return _restaurant_row_index
+
+
+def _find_restaurant_row(sheet, key):
+    """
+    Row number of (location_id, language), or None.
+    The indexed row is re-read (one request) and must still hold the key;
+    on a mismatch the index is rebuilt from the sheet.
+    """
+    row_no = _get_restaurant_row_index(sheet).get(key)
+    if not row_no:
+        return None
+    lang_col = _restaurant_last_col()
+    id_cell, lang_cell = sheet.batch_get([f"A{row_no}", f"{lang_col}{row_no}"])
+    found = (
+        str(id_cell[0][0]) if id_cell and id_cell[0] else "",
+        (lang_cell[0][0] if lang_cell and lang_cell[0] else "") or "Korean",
+    )
+    if found == key:
+        return row_no
+    print(f"Restaurant row index stale at row {row_no}: rebuilding")
+    return _get_restaurant_row_index(sheet, rebuild=True).get(key)
+
+
+def _fetch_restaurant_records():
+    sheet = get_cached_restaurants_sheet()
+    if not sheet:
+        return None
+    return sheet.get_all_records()
+
+_restaurant_store = None
+
+def get_restaurant_store():
+    """Process-wide local mirror of the cached_restaurants sheet (see restaurant_cache.py)."""
+    global _restaurant_store
+    if _restaurant_store is None:
+        with _restaurant_sheet_lock:
+            if _restaurant_store is None:
+                _restaurant_store = restaurant_cache.RestaurantCache(_fetch_restaurant_records)
+    return _restaurant_store
+
+
 def search_cached_restaurants(keyword):
     """
     캐시된 식당 중에서 검색어와 일치하는 식당을 찾습니다.
+    (로컬 이름 인덱스에서 조회, 시트 전체 다운로드 없음)
     
     Args:
         keyword: 검색어
@@ -1295,26 +1693,8 @@ def search_cached_restaurants(keyword):
     Returns:
         list: 캐시된 식당 리스트
     """
-    sheet = get_cached_restaurants_sheet()
-    if not sheet:
-        return []
-    
     try:
-        all_data = sheet.get_all_records()
-        keyword_lower = keyword.lower()
-        
-        cached_results = []
-        for row in all_data:
-            name = str(row.get('name', '')).lower()
-            if keyword_lower in name or name in keyword_lower:
-                cached_results.append({
-                    'location_id': str(row.get('location_id', '')),
-                    'name': row.get('name', ''),
-                    'address': row.get('address', '주소 정보 없음'),
-                    'is_cached': True  # 캐시 표시
-                })
-        
-        return cached_results
+        return get_restaurant_store().search(keyword)
     except Exception as e:
         print(f"Search Cache Error: {e}")
         return []
@@ -1322,83 +1702,10 @@ def search_cached_restaurants(keyword):
 
 def get_cached_restaurant_details(location_id, language="Korean"):
     """
-    캐시에서 식당 상세 정보를 가져옵니다. (언어 인식)
+    캐시에서 식당 상세 정보를 가져옵니다. (언어 인식, (location_id, language) 키 조회)
     """
-    sheet = get_cached_restaurants_sheet()
-    if not sheet:
-        return None
-    
     try:
-        # location_id로 검색 (동일 ID가 여러 언어로 있을 수 있음)
-        all_records = sheet.get_all_records()
-        for data in all_records:
-            if str(data.get('location_id')) == str(location_id):
-                # 언어가 명시되어 있고 현재 요청 언어와 같으면 반환
-                # (구버전 캐시는 language가 비어있으므로 Korean으로 간주)
-                cached_lang = data.get('language') or "Korean"
-                if cached_lang == language:
-                    # Parse logic...
-                    import json
-                    photos = []
-                    if data.get('photos'):
-                        try:
-                            photos = json.loads(data['photos'])
-                        except:
-                            photos = data['photos'].split(',') if data['photos'] else []
-                    
-                    cuisines = []
-                    if data.get('cuisines'):
-                        try:
-                            cuisines = json.loads(data['cuisines'])
-                        except:
-                            cuisines = data['cuisines'].split(',') if data['cuisines'] else []
-                    
-                    recommended_menu = []
-                    if data.get('recommended_menu'):
-                        try:
-                            recommended_menu = json.loads(data['recommended_menu'])
-                        except:
-                            recommended_menu = []
-                    
-                    analysis = {}
-                    if data.get('analysis'):
-                        try:
-                            analysis = json.loads(data['analysis'])
-                        except:
-                            analysis = {}
-
-                    weekday_text = []
-                    if data.get('weekday_text'):
-                        try:
-                            weekday_text = json.loads(data['weekday_text'])
-                        except:
-                            weekday_text = []
-
-                    return {
-                        'name': data.get('name', ''),
-                        'rating': float(data.get('rating', 0) or 0),
-                        'num_reviews': int(data.get('num_reviews', 0) or 0),
-                        'food_rating': float(data.get('food_rating', 0) or 0),
-                        'atmosphere_rating': float(data.get('atmosphere_rating', 0) or 0),
-                        'location_rating': float(data.get('location_rating', 0) or 0),
-                        'price_level': data.get('price_level', ''),
-                        'price': data.get('price', ''),
-                        'cuisines': cuisines,
-                        'hours': data.get('hours', ''),
-                        'weekday_text': weekday_text,
-                        'address': data.get('address', ''),
-                        'phone': data.get('phone', ''),
-                        'web_url': data.get('web_url', ''),
-                        'maps_url': data.get('maps_url', data.get('web_url', '')),
-                        'photos': photos,
-                        'ranking': data.get('ranking', ''),
-                        'editorial_summary': data.get('editorial_summary', ''),
-                        'recommended_menu': recommended_menu,
-                        'analysis': analysis,
-                        'language': cached_lang,
-                        'is_cached': True
-                    }
-        return None
+        return get_restaurant_store().get(location_id, language)
     except Exception as e:
         print(f"Get Cached Details Error: {e}")
         return None
@@ -1412,6 +1719,7 @@ def save_restaurant_to_cache(location_id, details):
         location_id: Google Places 위치 ID
         details: 식당 상세 정보
     """
+    global _restaurant_row_index
     sheet = get_cached_restaurants_sheet()
     if not sheet:
         return False
@@ -1419,13 +1727,6 @@ def save_restaurant_to_cache(location_id, details):
     try:
         import json
         
-        # 이미 존재하는지 확인
-        existing = None
-        try:
-            existing = sheet.find(str(location_id))
-        except:
-            pass
-        
         # 행 데이터 준비
         row = [
             str(location_id),
@@ -1452,16 +1753,27 @@ def save_restaurant_to_cache(location_id, details):
             details.get('language', 'Korean')
         ]
         
-        if existing:
-            # 업데이트
-            for i, value in enumerate(row):
-                sheet.update_cell(existing.row, i + 1, value)
+        # 이미 존재하는지 확인 (행 인덱스, sheet.find 없음)
+        key = (str(location_id), row[-1] or "Korean")
+        existing_row = _find_restaurant_row(sheet, key)
+        
+        if existing_row:
+            # 업데이트 (행 전체를 한 번의 range update로)
+            sheet.update(range_name=f"A{existing_row}:{_restaurant_last_col()}{existing_row}", values=[row])
             print(f"✅ Restaurant cache updated: {location_id}")
         else:
             # 새로 추가
-            sheet.append_row(row)
+            response = sheet.append_row(row)
+            match = re.search(r"![A-Z]+(\d+)", (response or {}).get("updates", {}).get("updatedRange", ""))
+            with _restaurant_sheet_lock:
+                if match and _restaurant_row_index is not None:
+                    _restaurant_row_index[key] = int(match.group(1))
+                else:
+                    _restaurant_row_index = None  # Unknown row -> rebuild on next save
             print(f"✅ Restaurant cached: {location_id}")
         
+        # Write-through to the local mirror
+        get_restaurant_store().upsert(dict(zip(RESTAURANT_CACHE_HEADERS, row)))
         return True
     except Exception as e:
         print(f"Save Cache Error: {e}")
@@ -1712,7 +2024,7 @@ def analyze_restaurant_reviews(reviews, rating, price_level=0, name="", num_revi
             }}
             """
             
-            response = model.generate_content(prompt)
+            response = cached_generate_content(model, prompt, site="restaurant_reviews")
             print(f"DEBUG: Gemini Restaurant Raw Response: {response.text}")
             
             # Clean JSON if wrapped in markdown
@@ -1904,7 +2216,6 @@ def search_restaurants(keyword):
     Returns:
         list: 검색 결과 리스트 [{place_id, name, address, is_cached}, ...]
     """
-    import requests
     
     # 1단계: 캐시에서 먼저 검색
     cached_results = search_cached_restaurants(keyword)
@@ -1928,14 +2239,14 @@ def search_restaurants(keyword):
                 "key": google_places_key
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = http_utils.get(url, params=params, timeout=10)
             
             # Fallback: If no results with "Thailand", try just the keyword
             if response.status_code == 200:
                 data = response.json()
                 if data.get('status') == 'ZERO_RESULTS':
                     params["query"] = keyword
-                    response = requests.get(url, params=params, timeout=10)
+                    response = http_utils.get(url, params=params, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -1999,7 +2310,7 @@ def get_restaurant_details(place_id, gemini_api_key=None, language="Korean"):
             "key": google_places_key
         }
         
-        response = requests.get(url, params=params, timeout=15)
+        response = http_utils.get(url, params=params, timeout=15)
         
         if response.status_code != 200:
             print(f"Google Places Details Error: {response.status_code}")
@@ -2269,7 +2580,7 @@ def translate_text(text: str, dest: str = "ko") -> str:
         {text}
         """
         
-        response = model.generate_content(prompt)
+        response = cached_generate_content(model, prompt, site="translate")
         translated = response.text.strip()
         
         # Double check: if it still has Thai, try one more time or just return it
@@ -2320,27 +2631,232 @@ def is_relevant_to_thailand(entry):
             
     return False
 
+# Near-Duplicate Title Index
+class TitleIndex:
+    """
+    Near-duplicate title lookup that runs difflib only where it can matter.
+    
+    ratios(title, threshold) skips an existing title only when one of difflib's own
+    upper bounds on SequenceMatcher(None, new, existing).ratio() is already <= threshold:
+    real_quick_ratio (lengths; titles are kept sorted by length, so this is a bisect
+    window) and quick_ratio (character counts). Every title whose ratio exceeds the
+    threshold is still scored, so `ratio > threshold` decisions match a full difflib scan.
+    Without a threshold every title is scored (e.g. max ratio for the zero-result fallback).
+    """
+    def __init__(self, titles=None):
+        self.titles = []
+        self._lengths = []   # sorted (len(lowered title), idx)
+        self._matchers = {}
+        for title in titles or []:
+            self.add(title)
+
+    def __len__(self):
+        return len(self.titles)
+
+    def add(self, title):
+        import bisect
+        idx = len(self.titles)
+        self.titles.append(title)
+        bisect.insort(self._lengths, (len(title.lower()), idx))
+
+    def _length_window(self, length, threshold):
+        """Indices (insertion order) whose length bound 2*min/(sum) can exceed the threshold."""
+        import bisect
+        if threshold is None or threshold <= 0:
+            return range(len(self.titles))
+        # 2*min(a, b)/(a + b) > t  <=>  a*t/(2-t) < b < a*(2-t)/t  (widened by 1; re-checked exactly)
+        low = int(length * threshold / (2 - threshold)) - 1
+        high = int(length * (2 - threshold) / threshold) + 1
+        lo = bisect.bisect_left(self._lengths, (low, -1))
+        hi = bisect.bisect_right(self._lengths, (high, len(self.titles)))
+        return sorted(idx for _, idx in self._lengths[lo:hi])
+
+    def ratios(self, title, threshold=None):
+        """Yields (existing_title, difflib ratio), insertion order; with a threshold only titles that can exceed it."""
+        import difflib
+        lowered = title.lower()
+        for idx in self._length_window(len(lowered), threshold):
+            matcher = self._matchers.get(idx)
+            if matcher is None:
+                # seq2 (existing title) analysis is cached by SequenceMatcher
+                matcher = difflib.SequenceMatcher(None, "", self.titles[idx].lower())
+                self._matchers[idx] = matcher
+            matcher.set_seq1(lowered)
+            if threshold is not None and (matcher.real_quick_ratio() <= threshold or matcher.quick_ratio() <= threshold):
+                continue
+            yield self.titles[idx], matcher.ratio()
+
+# RSS Fetch Concurrency
+RSS_FETCH_WORKERS = 8      # 전체 동시 요청 수
+RSS_PER_HOST_LIMIT = 2     # 같은 호스트(예: bangkokpost.com)에 대한 동시 요청 수
+
+# Conditional GET Cache (ETag / Last-Modified / body hash per feed URL)
+FEED_CACHE_FILE = "data/feed_cache.json"
+
+def load_feed_cache(file_path=FEED_CACHE_FILE):
+    """
+    Loads per-feed HTTP validators.
+    Returns: dict { url: {"etag", "last_modified", "body_hash", "checked_at"} }
+    """
+    if not os.path.exists(file_path):
+        return {}
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except Exception as e:
+        print(f"Error loading feed cache: {e}")
+        return {}
+
+def save_feed_cache(feed_cache, file_path=FEED_CACHE_FILE):
+    """Writes committed validators only (uncommitted '_staged' entries are dropped)."""
+    try:
+        data = {url: {k: v for k, v in cached.items() if k != '_staged'} for url, cached in feed_cache.items()}
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+    except Exception as e:
+        print(f"Error saving feed cache: {e}")
+
+def commit_feed_cache(feed_cache, pending_links=()):
+    """
+    Promotes the validators fetched this run, per feed, once its items are consumed.
+    A feed keeps its previous ETag / body hash (so it is downloaded and parsed again
+    next run) if it was not fully parsed or any of its candidate links is still pending.
+    pending_links: links that were candidates this run but were not processed
+    Returns: number of feeds committed
+    """
+    pending = set(pending_links)
+    committed = 0
+    for cached in feed_cache.values():
+        staged = cached.pop('_staged', None)
+        if not staged:
+            continue
+        if staged.get('complete') and not pending.intersection(staged.get('links', [])):
+            cached.update(staged['validators'])
+            committed += 1
+    return committed
+
+def fetch_feeds_concurrently(urls, headers=None, timeout=10, feed_cache=None):
+    """
+    Downloads multiple feed URLs in parallel (thread pool + per-host limit).
+    Total wall time is roughly one slowest-feed round trip instead of the sum.
+    
+    feed_cache: dict from load_feed_cache() (optional). When given, requests carry
+    If-None-Match / If-Modified-Since. A feed is marked "not_modified" on 304 or when
+    the body hash equals the last committed one. New validators are only staged
+    (cache[url]['_staged']); commit_feed_cache() applies them after the run.
+    
+    Returns: dict { url: {"status", "content", "latency", "error", "not_modified"} }
+    """
+    import hashlib
+    import threading
+    import urllib.parse
+    from concurrent.futures import ThreadPoolExecutor
+    
+    unique_urls = list(dict.fromkeys(u for u in urls if u))
+    host_locks = {}
+    for u in unique_urls:
+        host = urllib.parse.urlparse(u).netloc.lower()
+        if host not in host_locks:
+            host_locks[host] = threading.BoundedSemaphore(RSS_PER_HOST_LIMIT)
+    
+    def _fetch_one(url):
+        host = urllib.parse.urlparse(url).netloc.lower()
+        req_headers = dict(headers or {})
+        cached = (feed_cache or {}).get(url) or {}
+        if cached.get('etag'):
+            req_headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            req_headers['If-Modified-Since'] = cached['last_modified']
+        
+        with host_locks[host]:
+            started = time.perf_counter()
+            try:
+                response = http_utils.get(url, headers=req_headers, timeout=timeout)
+                return {
+                    "status": response.status_code,
+                    "content": response.content,
+                    "etag": response.headers.get('ETag'),
+                    "last_modified": response.headers.get('Last-Modified'),
+                    "latency": time.perf_counter() - started,
+                    "error": None
+                }
+            except Exception as e:
+                return {
+                    "status": None,
+                    "content": None,
+                    "latency": time.perf_counter() - started,
+                    "error": str(e)
+                }
+    
+    results = {}
+    if not unique_urls:
+        return results
+    
+    with ThreadPoolExecutor(max_workers=min(RSS_FETCH_WORKERS, len(unique_urls))) as executor:
+        for url, result in zip(unique_urls, executor.map(_fetch_one, unique_urls)):
+            results[url] = result
+    
+    # Validator bookkeeping (main thread only)
+    for url, result in results.items():
+        result['not_modified'] = False
+        if feed_cache is None:
+            continue
+        cached = feed_cache.get(url) or {}
+        if result['status'] == 304:
+            result['not_modified'] = True
+            cached['checked_at'] = datetime.now().isoformat(timespec='seconds')
+        elif result['status'] == 200:
+            # Some servers ignore validators -> compare body hash instead
+            body_hash = hashlib.sha256(result['content'] or b'').hexdigest()
+            result['not_modified'] = (body_hash == cached.get('body_hash'))
+            cached['checked_at'] = datetime.now().isoformat(timespec='seconds')
+            if not result['not_modified']:
+                # Parsers mark it complete and list their candidate links
+                cached['_staged'] = {
+                    "validators": {
+                        "etag": result.get('etag'),
+                        "last_modified": result.get('last_modified'),
+                        "body_hash": body_hash,
+                    },
+                    "complete": False,
+                    "links": []
+                }
+        else:
+            continue
+        feed_cache[url] = cached
+    return results
+
 # 1. RSS Parsing (Balanced)
-def fetch_balanced_rss(feeds_config, processed_urls=None):
+def fetch_balanced_rss(feeds_config, processed_urls=None, feed_cache=None):
     """
     Fetches RSS feeds and returns a balanced mix of items across categories.
     feeds_config: List of dicts [{'category': '...', 'url': '...'}, ...]
-    processed_urls: Set of strings (optional) to skip already seen news.
-    """
-    import requests
+    processed_urls: Set of strings or seen_urls.SeenUrlStore (optional) to skip already seen news.
+    feed_cache: dict from load_feed_cache() (optional). Unchanged feeds are not parsed;
+                changed feeds stage their candidate links for commit_feed_cache().
     
+    Network fetch runs concurrently; parsing/quota/interleave stay in feeds_config order
+    so the output is identical to the sequential version.
+    """
     if processed_urls is None:
         processed_urls = set()
     
     # Using a typical browser User-Agent
     headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
+        'User-Agent': http_utils.DEFAULT_USER_AGENT,
         'Accept': 'application/rss+xml, application/xml, text/xml, */*'
     }
     
     category_buckets = {}
     MAX_PER_CATEGORY = 80  # Increased from 20 to 80 to allow checking more feeds (e.g. Pattaya News)
     
+    # [PARALLEL] Download all feed bodies at once
+    crawl_started = time.perf_counter()
+    print(f"Fetching {len(feeds_config)} feeds concurrently...")
+    fetched = fetch_feeds_concurrently([f.get('url') for f in feeds_config], headers=headers, timeout=10, feed_cache=feed_cache)
+    print(f"Feed download finished in {time.perf_counter() - crawl_started:.2f}s")
+    
     for feed in feeds_config:
         category = feed.get('category', 'General')
         url = feed.get('url')
@@ -2354,23 +2870,32 @@ def fetch_balanced_rss(feeds_config, processed_urls=None):
             continue
             
         try:
-            print(f"Fetching [{category}] {url}...")
-            response = requests.get(url, headers=headers, timeout=10)
+            result = fetched.get(url) or {"status": None, "content": None, "latency": 0.0, "error": "no url"}
+            print(f"Fetched [{category}] {url} ({result['latency']:.2f}s)")
+            
+            if result['error']:
+                raise Exception(result['error'])
+            
+            if result.get('not_modified'):
+                print(f"Unchanged since last run (HTTP {result['status']}), skipping parse: {url}")
+                continue
             
-            if response.status_code != 200:
-                print(f"Failed to fetch {url}: Status {response.status_code}")
+            if result['status'] != 200:
+                print(f"Failed to fetch {url}: Status {result['status']}")
                 continue
                 
-            feed_data = feedparser.parse(response.content)
+            feed_data = feedparser.parse(result['content'])
             
             if feed_data.bozo:
                 print(f"XML Parse Warning for {url}: {feed_data.bozo_exception}")
             
             print(f"Successfully parsed {url}: Found {len(feed_data.entries)} entries.")
+            staged = ((feed_cache or {}).get(url) or {}).get('_staged')
             
             for entry in feed_data.entries:
                 # Re-check quota inside loop
                 if len(category_buckets[category]) >= MAX_PER_CATEGORY:
+                    staged = None  # Entries left unread -> keep the old validators
                     break
                 
                 # Filter: Relevance Check (Skip non-Thai news)
@@ -2399,6 +2924,11 @@ def fetch_balanced_rss(feeds_config, processed_urls=None):
                         "_raw_entry": entry
                     }
                     category_buckets[category].append(item)
+                    if staged is not None:
+                        staged['links'].append(entry.link)
+            
+            if staged is not None:
+                staged['complete'] = True
                     
         except Exception as e:
             print(f"Error fetching {url}: {e}")
@@ -2428,15 +2958,14 @@ def clean_html(raw_html):
 # --------------------------------------------------------------------------------
 # Google News RSS Fetcher (Backup Source)
 # --------------------------------------------------------------------------------
-def fetch_google_news_rss(query="Thailand Tourism", period="24h"):
+def fetch_google_news_rss(query="Thailand Tourism", period="24h", feed_cache=None):
     """
     Fetches Google News RSS for a specific query.
+    feed_cache: dict from load_feed_cache() (optional). Unchanged feed -> [];
+                a changed feed stages its links for commit_feed_cache().
     Returns: List of dicts matching news item structure.
     """
-    import feedparser
     import urllib.parse
-    import time
-    import requests
     
     encoded_query = urllib.parse.quote(query)
     # hl=en-TH, gl=TH ensures Thailand focus
@@ -2447,15 +2976,21 @@ def fetch_google_news_rss(query="Thailand Tourism", period="24h"):
     print(f"Fetching Google News: {query}...")
     
     headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'
+        'User-Agent': http_utils.DEFAULT_USER_AGENT
     }
     
     try:
         # [FIX] Use requests with User-Agent to avoid 403/Blocking
-        response = requests.get(rss_url, headers=headers, timeout=10)
+        result = fetch_feeds_concurrently([rss_url], headers=headers, timeout=10, feed_cache=feed_cache)[rss_url]
+        if result['error']:
+            raise Exception(result['error'])
         
-        if response.status_code == 200:
-            feed = feedparser.parse(response.content)
+        if result['not_modified']:
+            print(f" -> Google News unchanged since last run (HTTP {result['status']}), skipping parse.")
+            return []
+        
+        if result['status'] == 200:
+            feed = feedparser.parse(result['content'])
             items = []
             for entry in feed.entries:
                 # [FIX] Robust Source Extraction for Google News
@@ -2473,105 +3008,201 @@ def fetch_google_news_rss(query="Thailand Tourism", period="24h"):
                     '_raw_entry': entry # Keep for image extraction
                 }
                 items.append(item)
+            staged = ((feed_cache or {}).get(rss_url) or {}).get('_staged')
+            if staged is not None:
+                staged.update(complete=True, links=[i['link'] for i in items])
             print(f" -> Found {len(items)} items from Google News.")
             return items
         else:
-            print(f"Google News Fetch Failed: Status {response.status_code}")
+            print(f"Google News Fetch Failed: Status {result['status']}")
             return []
             
     except Exception as e:
         print(f"Google News Fetch Error: {e}")
         return []
 
-# Helper: Fetch Full Content from URL
-def fetch_full_content(url):
+# Article Extraction Cache (body text + og:image, one download per URL)
+ARTICLE_CACHE_FILE = "data/article_cache.json"
+ARTICLE_CACHE_TTL_HOURS = 72
+
+_article_cache = None
+_article_failures = {}  # In-process only: failed URLs are retried on the next run
+_article_cache_lock = threading.Lock()
+
+def _get_article_cache():
+    global _article_cache
+    if _article_cache is None:
+        _article_cache = {}
+        if os.path.exists(ARTICLE_CACHE_FILE):
+            try:
+                with open(ARTICLE_CACHE_FILE, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    _article_cache = data
+            except Exception as e:
+                print(f"Error loading article cache: {e}")
+    return _article_cache
+
+def _is_article_fresh(entry):
+    try:
+        fetched_at = datetime.fromisoformat(entry.get('fetched_at', ''))
+    except (TypeError, ValueError):
+        return False
+    return datetime.now() - fetched_at < timedelta(hours=ARTICLE_CACHE_TTL_HOURS)
+
+def save_article_cache():
+    """Drops expired entries and writes the cache atomically (tmp file + rename)."""
+    with _article_cache_lock:
+        cache = _get_article_cache()
+        fresh = {url: entry for url, entry in cache.items() if _is_article_fresh(entry)}
+        cache.clear()
+        cache.update(fresh)
+        try:
+            tmp_path = ARTICLE_CACHE_FILE + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(fresh, f, ensure_ascii=False)
+            os.replace(tmp_path, ARTICLE_CACHE_FILE)
+        except Exception as e:
+            print(f"Error saving article cache: {e}")
+
+def _parse_article_html(html):
+    """Parses body text (<p> tags, max 3000 chars) and og:image from one HTML document."""
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    image_url = None
+    og_image = soup.find("meta", property="og:image")
+    if og_image and og_image.get("content"):
+        image_url = og_image["content"]
+    
+    # Remove unwanted elements
+    for script in soup(["script", "style", "nav", "footer", "header", "aside", "noscript"]):
+        script.decompose()
+        
+    # Extract text from p tags (most reliable for news)
+    paragraphs = soup.find_all('p')
+    text = ' '.join([p.get_text() for p in paragraphs])
+    
+    # Clean up whitespace
+    text = ' '.join(text.split())
+    
+    # Remove Google Cache Header Artifacts (if any)
+    if "Google's cache of" in text:
+         text = text.replace("This is Google's cache of", "")
+    
+    if len(text) < 100: # Too short, likely failed
+        text = None
+    else:
+        text = text[:3000] # Limit to 3000 chars
+    return text, image_url
+
+def extract_article(url):
     """
-    Scrapes the main text content from a news URL.
-    Returns: String (text) or None
+    Single extraction stage for a news URL: downloads the page once and parses
+    body text and og:image together. Successful results are cached on disk
+    (ARTICLE_CACHE_FILE, ARTICLE_CACHE_TTL_HOURS) and shared by fetch_full_content
+    and batch_job's image fallback.
+    
+    Returns: {"text": str|None, "image_url": str|None, "fetched_at": iso string}
     """
-    import requests
-    from bs4 import BeautifulSoup
+    empty = {"text": None, "image_url": None, "fetched_at": None}
+    if not url:
+        return empty
+    
+    with _article_cache_lock:
+        cached = _get_article_cache().get(url)
+        if cached and _is_article_fresh(cached):
+            return cached
+        if url in _article_failures:
+            return _article_failures[url]
     
     try:
         headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'
+            'User-Agent': http_utils.DEFAULT_USER_AGENT
         }
         # Timeout slightly longer for scraping
-        response = requests.get(url, headers=headers, timeout=5)
-# Reverted Google Cache Fallback
+        response = http_utils.get(url, headers=headers, timeout=5)
         
         if response.status_code != 200:
-            return None
-            
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Remove unwanted elements
-        for script in soup(["script", "style", "nav", "footer", "header", "aside", "noscript"]):
-            script.decompose()
-            
-        # Extract text from p tags (most reliable for news)
-        paragraphs = soup.find_all('p')
-        text = ' '.join([p.get_text() for p in paragraphs])
-        
-        # Clean up whitespace
-        text = ' '.join(text.split())
-        
-        # Remove Google Cache Header Artifacts (if any)
-        if "Google's cache of" in text:
-             text = text.replace("This is Google's cache of", "")
-        
-        if len(text) < 100: # Too short, likely failed
-            return None
-            
-        return text[:3000] # Limit to 3000 chars
+            with _article_cache_lock:
+                _article_failures[url] = empty
+            return empty
+        
+        text, image_url = _parse_article_html(response.content)
+        entry = {
+            "text": text,
+            "image_url": image_url,
+            "fetched_at": datetime.now().isoformat(timespec='seconds')
+        }
+        with _article_cache_lock:
+            _get_article_cache()[url] = entry
+        return entry
         
     except Exception as e:
         # print(f"Error scraping {url}: {e}")
-        return None
+        with _article_cache_lock:
+            _article_failures[url] = empty
+        return empty
 
-def analyze_news_with_gemini(news_items, api_key, existing_titles=None, current_time=None):
-    if not news_items:
-        return {}, "No news items to analyze."
-        
-    genai.configure(api_key=api_key)
-    
-    # Analyze ALL provided items
-    limited_news_items = news_items[:10] 
-    
-    aggregated_topics = []
-    total_items = len(limited_news_items)
-    print(f"Starting sequential analysis for {total_items} items...")
-
-    # Format existing titles for context
-    existing_context = "\n".join([f"- {t}" for t in (existing_titles or [])[:15]])
-
-    for idx, item in enumerate(limited_news_items):
-        print(f"[{idx+1}/{total_items}] Processing: {item['title']}...")
-        
-        full_content = fetch_full_content(item['link'])
-        if not full_content:
-            full_content = clean_html(item['summary'])[:800]
-
-        # New Context-Aware Prompt
-        prompt = f"""
+# Helper: Fetch Full Content from URL
+def fetch_full_content(url):
+    """
+    Scrapes the main text content from a news URL (via extract_article cache).
+    Returns: String (text) or None
+    """
+    return extract_article(url)['text']
+
+# Gemini Rate Limit Budget (gemini-2.0-flash)
+GEMINI_RPM = 15                 # requests per minute
+GEMINI_TPM = 1000000            # input tokens per minute
+GEMINI_MAX_CONCURRENCY = 4      # in-flight generate_content calls
+GEMINI_SCRAPE_WORKERS = 4       # parallel fetch_full_content calls
+GEMINI_NEWS_BATCH_SIZE = 4      # articles per analysis request (1 = single-item mode)
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. `rate_per_minute` tokens refill continuously,
+    up to `capacity` (defaults to one minute of budget).
+    """
+    def __init__(self, rate_per_minute, capacity=None):
+        import threading
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount=1):
+        """Blocks until `amount` tokens are available, then takes them."""
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.rate
+            time.sleep(wait)
+
+def estimate_tokens(text):
+    """Rough input token estimate (Korean/Thai heavy prompts ~3 chars per token)."""
+    return max(1, len(text or "") // 3)
+
+# Shared prompt sections (single-item and batched analysis)
+NEWS_PROMPT_HEADER = """
 # Role
 당신은 태국 방콕을 여행하는 한국인 여행자를 위한 '실시간 뉴스 큐레이터'입니다.
-현재 시각은 {current_time or '알 수 없음'} 이며, 아침/저녁 브리핑을 위해 뉴스를 선별 중입니다.
+현재 시각은 {current_time} 이며, 아침/저녁 브리핑을 위해 뉴스를 선별 중입니다.
 
 # Task
 입력된 뉴스 기사들을 분석하여 여행자에게 필요한 정보를 선별하고 요약하세요.
 **[CRITICAL] 모든 출력 텍스트(제목, 요약, 기사 전문 등)는 반드시 한국어(Korean)여야 합니다.** 태국어나 영어로 남겨두지 마세요.
 이때, **'기계적인 중복'과 '의미 있는 업데이트'를 구분**하는 것이 가장 중요합니다.
 
-# Input Data
-1. **Candidate News:** 
-   - Title: {item['title']}
-   - Source: {item['source']}
-   - Content Snippet: {full_content[:1500]}
-2. **Existing News (최근 24시간 내 이미 게시된 기사들):**
-{existing_context}
+"""
 
-# 🔍 Filtering & Scoring Logic (3-Step)
+NEWS_PROMPT_RULES = """# 🔍 Filtering & Scoring Logic (3-Step)
 
 ## Step 1: '업데이트' 여부 판단 (Context Check)
 기존 뉴스(Existing News)와 주제가 비슷하더라도, 아래 경우에는 **'새로운 뉴스'**로 취급하세요.
@@ -2596,7 +3227,18 @@ def analyze_news_with_gemini(news_items, api_key, existing_titles=None, current_
   - 경제, 금융, 비즈니스 → BUSINESS
   - 문화, 엔터테인먼트, K-Pop → LIFESTYLE
 
-# Output Format (JSON Only)
+"""
+
+def _build_news_prompt(item, full_content, existing_context, current_time=None):
+    prompt = NEWS_PROMPT_HEADER.format(current_time=current_time or '알 수 없음') + f"""# Input Data
+1. **Candidate News:** 
+   - Title: {item['title']}
+   - Source: {item['source']}
+   - Content Snippet: {full_content[:1500]}
+2. **Existing News (최근 24시간 내 이미 게시된 기사들):**
+{existing_context}
+
+""" + NEWS_PROMPT_RULES + f"""# Output Format (JSON Only)
 {{
   "topics": [
     {{
@@ -2619,89 +3261,324 @@ def analyze_news_with_gemini(news_items, api_key, existing_titles=None, current_
   ]
 }}
 """
-        
-        # Retry Logic with Safety Limits
-        max_retries = 3
-        retry_count = 0
-        success = False
-        
-        while retry_count < max_retries and not success:
-            try:
-                model = genai.GenerativeModel('gemini-2.0-flash', generation_config={"response_mime_type": "application/json"})
-                response = model.generate_content(prompt)
-                # Force HTTPS for all URLs in the generated content (Markdown links, Image URLs, References)
-                safe_text = response.text.replace("http://", "https://")
-                result = json.loads(safe_text)
-                
-                if 'topics' in result and result['topics']:
-                    # --- Python Post-Processing & Verification ---
-                    filtered_topics = []
-                    for topic in result['topics']:
-                        # 0. Sanitize Source (Emergency fix if AI failed constraints)
-                        for ref in topic.get('references', []):
-                            src = str(ref.get('source', '')).strip()
-                            if not src or src.lower() == 'none' or src == '[MISSING_SOURCE]':
-                                ref['source'] = 'Google News'
-                        
-                        # 1. Strict Source Filtering Verification
-                        is_missing_source = (item['source'] == '[MISSING_SOURCE]')
-                        impact_score = topic.get('tourist_impact_score', 0)
-                        
-                        if is_missing_source and impact_score < 8:
-                            print(f"   -> [Filtered] Skipping '{topic['title']}' (Missing source & Low score: {impact_score})")
-                            continue
-                            
-                        # --- [NEW] Ingestion-Time Translation Safety ---
-                        # If AI returned Thai, force manual translation before saving
-                        for field in ['title', 'summary', 'full_translated']:
-                            if field in topic and is_thai(topic[field]):
-                                print(f"   -> [Safety] Missed translation in {field}, forcing manual translation...")
-                                topic[field] = translate_text(topic[field])
-
-                        # 2. Festival/Event Strict Mode
-                        if topic.get('category') == '축제/이벤트':
-                            evt = topic.get('event_info')
-                            # Check strict conditions
-                            if not evt or not evt.get('location') or not evt.get('date') or not evt.get('price'):
-                                print(f"   -> [Strict Mode] Downgrading '{topic['title']}' from Event to Travel News (Missing Info)")
-                                topic['category'] = 'TRAVEL'
-                                topic['event_info'] = None # Clear it
-                            elif evt.get('location') == 'Unknown' or evt.get('location') == 'null':
-                                 print(f"   -> [Strict Mode] Downgrading '{topic['title']}' (Location Unknown)")
-                                 topic['category'] = 'TRAVEL'
-                                 topic['event_info'] = None
-                        
-                        # 3. Normalize Category (Fallback safety)
-                        raw_cat = topic.get('category', '')
-                        topic['category'] = normalize_category(raw_cat)
-                        
-                        filtered_topics.append(topic)
+    return prompt
 
-                    aggregated_topics.extend(filtered_topics)
-                    print(f"   -> Success. Topics so far: {len(aggregated_topics)}")
-                    success = True
-                else:
-                    raise ValueError("Empty topics in response")
-                
-            except Exception as e:
-                retry_count += 1
-                wait_time = 2 ** retry_count # Exponential backoff: 2s, 4s, 8s
-                print(f"   -> API Error for item {idx+1} (Attempt {retry_count}/{max_retries}): {e}")
-                
-                if "429" in str(e):
-                    print("   -> Rate Limit Hit. Waiting longer...")
-                    time.sleep(60) # Special wait for Rate Limit
-                elif retry_count < max_retries:
-                    print(f"   -> Retrying in {wait_time}s...")
-                    time.sleep(wait_time)
-                else:
-                    print("   -> Max retries reached. Skipping this item.")
+def _build_news_batch_prompt(items, contents, existing_context, current_time=None):
+    """
+    Packs several articles into one prompt. Each article is labelled [index]
+    and the model must return exactly one entry per index in `topics`.
+    """
+    articles = []
+    for idx, (item, content) in enumerate(zip(items, contents)):
+        articles.append(f"""[{idx}]
+   - Title: {item['title']}
+   - URL: {item['link']}
+   - Source: {item['source']}
+   - Content Snippet: {content[:1500]}""")
+    articles_block = "\n".join(articles)
+    
+    prompt = NEWS_PROMPT_HEADER.format(current_time=current_time or '알 수 없음') + f"""# Input Data
+1. **Candidate News ({len(items)}건, 각 기사는 [index] 번호로 구분):** 
+{articles_block}
+2. **Existing News (최근 24시간 내 이미 게시된 기사들):**
+{existing_context}
+
+""" + NEWS_PROMPT_RULES + """- **[CRITICAL - BATCH] 기사들을 서로 합치지 말고 입력 기사마다 정확히 하나의 항목을 `topics`에 넣으세요. 각 항목의 `index`에는 입력 기사 번호를 적으세요.**
+- 제외하기로 한 기사는 {"index": 번호, "skip": true, "impact_reason": "제외 사유"} 형태로만 출력하세요.
+- `references`에는 해당 기사의 원문 제목, URL, 출처를 그대로 적으세요.
+
+# Output Format (JSON Only)
+{
+  "topics": [
+    {
+      "index": 0,
+      "title": "기사 제목",
+      "summary": "핵심 3줄 요약 (- 로 시작)",
+      "full_translated": "기사 전문 (Markdown)",
+      "category": "POLITICS | BUSINESS | TRAVEL | LIFESTYLE 중 하나",
+      "tourist_impact_score": 0,
+      "impact_reason": "점수 부여 및 업데이트 판단 근거",
+      "event_info": {
+          "date": "YYYY-MM-DD",
+          "location": "...", 
+          "price": "...",
+          "location_google_map_query": "..."
+      },
+      "references": [
+        {"title": "원문 제목", "url": "원문 URL", "source": "출처"}
+      ]
+    }
+  ]
+}
+"""
+    return prompt
+
+def _validate_news_topic(topic):
+    """Checks that one Gemini topic has the fields the pipeline relies on."""
+    if not isinstance(topic, dict):
+        return False
+    for field in ['title', 'summary', 'category']:
+        if not isinstance(topic.get(field), str) or not topic[field].strip():
+            return False
+    try:
+        float(topic.get('tourist_impact_score', 0) or 0)
+    except (TypeError, ValueError):
+        return False
+    refs = topic.get('references')
+    if refs is not None and not isinstance(refs, list):
+        return False
+    return True
+
+def _postprocess_news_topics(topics, item):
+    """
+    Python-side verification of Gemini output for one source item:
+    source sanitizing, missing-source filtering, Thai-script safety,
+    event strict mode and category normalization.
+    """
+    filtered_topics = []
+    for topic in topics:
+        # 0. Sanitize Source (Emergency fix if AI failed constraints)
+        for ref in topic.get('references', []):
+            src = str(ref.get('source', '')).strip()
+            if not src or src.lower() == 'none' or src == '[MISSING_SOURCE]':
+                ref['source'] = 'Google News'
+
+        # 1. Strict Source Filtering Verification
+        is_missing_source = (item['source'] == '[MISSING_SOURCE]')
+        impact_score = topic.get('tourist_impact_score', 0)
+
+        if is_missing_source and impact_score < 8:
+            print(f"   -> [Filtered] Skipping '{topic['title']}' (Missing source & Low score: {impact_score})")
+            continue
+
+        # --- [NEW] Ingestion-Time Translation Safety ---
+        # If AI returned Thai, force manual translation before saving
+        for field in ['title', 'summary', 'full_translated']:
+            if field in topic and is_thai(topic[field]):
+                print(f"   -> [Safety] Missed translation in {field}, forcing manual translation...")
+                topic[field] = translate_text(topic[field])
+
+        # 2. Festival/Event Strict Mode
+        if topic.get('category') == '축제/이벤트':
+            evt = topic.get('event_info')
+            # Check strict conditions
+            if not evt or not evt.get('location') or not evt.get('date') or not evt.get('price'):
+                print(f"   -> [Strict Mode] Downgrading '{topic['title']}' from Event to Travel News (Missing Info)")
+                topic['category'] = 'TRAVEL'
+                topic['event_info'] = None # Clear it
+            elif evt.get('location') == 'Unknown' or evt.get('location') == 'null':
+                 print(f"   -> [Strict Mode] Downgrading '{topic['title']}' (Location Unknown)")
+                 topic['category'] = 'TRAVEL'
+                 topic['event_info'] = None
+
+        # 3. Normalize Category (Fallback safety)
+        raw_cat = topic.get('category', '')
+        topic['category'] = normalize_category(raw_cat)
+
+        filtered_topics.append(topic)
+
+    return filtered_topics
+
+def _parse_llm_json(text):
+    """Parses a (possibly ```json fenced) model answer; None if it is not JSON."""
+    text = (text or "").strip().replace("```json", "").replace("```", "").strip()
+    try:
+        return json.loads(text)
+    except Exception:
+        return None
+
+def _has_news_topics(text):
+    """Cache validator: only responses with a non-empty topics list are stored."""
+    try:
+        result = json.loads(text)
+    except Exception:
+        return False
+    return isinstance(result, dict) and isinstance(result.get('topics'), list) and bool(result['topics'])
+
+def _call_gemini_news_json(prompt, rpm_bucket, tpm_bucket, lane_label, max_retries=3):
+    """
+    Calls Gemini (JSON mode) under the shared RPM/TPM budget with retries.
+    429 backs off only this lane (adaptive, jittered).
+    Returns: parsed dict with a non-empty 'topics' list, or None after max retries
+    """
+    import random
+    
+    retry_count = 0
+    backoff = 5
+    
+    while retry_count < max_retries:
+        rpm_bucket.acquire(1)
+        tpm_bucket.acquire(estimate_tokens(prompt))
+        try:
+            model = genai.GenerativeModel('gemini-2.0-flash', generation_config={"response_mime_type": "application/json"})
+            response = cached_generate_content(model, prompt, site="news_analysis", validate=_has_news_topics)
+            # Force HTTPS for all URLs in the generated content (Markdown links, Image URLs, References)
+            safe_text = response.text.replace("http://", "https://")
+            result = json.loads(safe_text)
+            
+            if isinstance(result, dict) and isinstance(result.get('topics'), list) and result['topics']:
+                return result
+            raise ValueError("Empty topics in response")
+            
+        except Exception as e:
+            retry_count += 1
+            print(f"   -> API Error for {lane_label} (Attempt {retry_count}/{max_retries}): {e}")
             
-        # Delay logic (except for the last one)
-        if idx < total_items - 1:
-            print("   -> Waiting 20 seconds to respect API rate limits...")
-            time.sleep(20)
+            if "429" in str(e):
+                # Adaptive backoff for this lane only; other lanes keep using the budget
+                wait_time = min(60, backoff) * random.uniform(0.8, 1.2)
+                backoff *= 2
+                print(f"   -> Rate Limit Hit. {lane_label} backing off {wait_time:.1f}s...")
+                time.sleep(wait_time)
+            elif retry_count < max_retries:
+                wait_time = 2 ** retry_count # Exponential backoff: 2s, 4s, 8s
+                print(f"   -> Retrying in {wait_time}s...")
+                time.sleep(wait_time)
+            else:
+                print(f"   -> Max retries reached. Skipping {lane_label}.")
+    return None
 
+def _resolve_content(item, content_future):
+    full_content = content_future.result()
+    if not full_content:
+        full_content = clean_html(item['summary'])[:800]
+    return full_content
+
+def _generate_news_topics(item, content_future, existing_context, current_time, rpm_bucket, tpm_bucket, lane_label):
+    """
+    Single-item lane: waits for the scraped content, then asks Gemini about one article.
+    Returns: list of post-processed topics ([] on failure)
+    """
+    prompt = _build_news_prompt(item, _resolve_content(item, content_future), existing_context, current_time)
+    result = _call_gemini_news_json(prompt, rpm_bucket, tpm_bucket, lane_label)
+    if result is None:
+        return []
+    
+    topics = _postprocess_news_topics(result['topics'], item)
+    print(f"   -> {lane_label} Success: {len(topics)} topic(s)")
+    return topics
+
+def _generate_news_batch(indices, items, content_futures, existing_context, current_time, rpm_bucket, tpm_bucket, lane_label):
+    """
+    Batched lane: packs several articles into one request.
+    Each returned topic is matched back by its `index` and validated on its own.
+    
+    Returns: dict { input_index: [topics] } for items that passed validation.
+    Missing or invalid items are left out so the caller retries them in single-item mode.
+    """
+    batch_items = [items[i] for i in indices]
+    contents = [_resolve_content(items[i], content_futures[i]) for i in indices]
+    prompt = _build_news_batch_prompt(batch_items, contents, existing_context, current_time)
+    result = _call_gemini_news_json(prompt, rpm_bucket, tpm_bucket, lane_label)
+    if result is None:
+        return {}
+    
+    raw_by_pos = {}
+    invalid = set()
+    for topic in result['topics']:
+        pos = topic.get('index') if isinstance(topic, dict) else None
+        try:
+            pos = int(pos)
+        except (TypeError, ValueError):
+            continue
+        if not 0 <= pos < len(indices) or pos in invalid:
+            continue
+        if topic.get('skip'):
+            # Model decided to drop this article (duplicate / low score)
+            raw_by_pos.setdefault(pos, [])
+            continue
+        if not _validate_news_topic(topic):
+            invalid.add(pos)
+            raw_by_pos.pop(pos, None)
+            continue
+        topic.pop('index', None)
+        topic.pop('skip', None)
+        if not topic.get('references'):
+            item = batch_items[pos]
+            topic['references'] = [{'title': item['title'], 'url': item['link'], 'source': item['source']}]
+        raw_by_pos.setdefault(pos, []).append(topic)
+    
+    topics_by_index = {}
+    for pos, topics in raw_by_pos.items():
+        topics_by_index[indices[pos]] = _postprocess_news_topics(topics, batch_items[pos])
+    
+    missing = len(indices) - len(topics_by_index)
+    print(f"   -> {lane_label} Batch success: {len(topics_by_index)}/{len(indices)} items" + (f" ({missing} to single-item fallback)" if missing else ""))
+    return topics_by_index
+
+def analyze_news_with_gemini(news_items, api_key, existing_titles=None, current_time=None, rpm=None, tpm=None, max_concurrency=None, batch_size=None):
+    """
+    Analyzes news items with Gemini concurrently under a requests/tokens-per-minute
+    budget (token buckets instead of fixed sleeps). Full-content scraping runs in a
+    separate pool so it overlaps with in-flight model calls.
+    
+    batch_size > 1 packs that many articles into one request (default GEMINI_NEWS_BATCH_SIZE);
+    items whose batched output fails validation fall back to single-item requests.
+    Topics are returned in input order.
+    
+    Returns: ({"topics": [...]}, None) or ({}, error_message)
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    
+    if not news_items:
+        return {}, "No news items to analyze."
+        
+    genai.configure(api_key=api_key)
+    
+    # Analyze ALL provided items
+    limited_news_items = news_items[:10] 
+    total_items = len(limited_news_items)
+    concurrency = max_concurrency or GEMINI_MAX_CONCURRENCY
+    batch_size = batch_size or GEMINI_NEWS_BATCH_SIZE
+    print(f"Starting parallel analysis for {total_items} items (concurrency {concurrency}, batch size {batch_size}, {rpm or GEMINI_RPM} RPM)...")
+
+    # Format existing titles for context
+    existing_context = "\n".join([f"- {t}" for t in (existing_titles or [])[:15]])
+    
+    rpm_bucket = TokenBucket(rpm or GEMINI_RPM)
+    tpm_bucket = TokenBucket(tpm or GEMINI_TPM)
+    topics_by_index = {}
+    
+    with ThreadPoolExecutor(max_workers=GEMINI_SCRAPE_WORKERS) as scrape_pool, \
+         ThreadPoolExecutor(max_workers=concurrency) as model_pool:
+        content_futures = [scrape_pool.submit(fetch_full_content, item['link']) for item in limited_news_items]
+        
+        # 1. Batched requests
+        if batch_size > 1:
+            chunks = [list(range(i, min(i + batch_size, total_items))) for i in range(0, total_items, batch_size)]
+            batch_futures = []
+            for chunk in chunks:
+                if len(chunk) < 2:
+                    continue # A lone item goes straight to single-item mode
+                lane_label = f"[batch {chunk[0]+1}-{chunk[-1]+1}/{total_items}]"
+                print(f"{lane_label} Queued: {len(chunk)} items")
+                batch_futures.append(model_pool.submit(
+                    _generate_news_batch, chunk, limited_news_items, content_futures, existing_context,
+                    current_time, rpm_bucket, tpm_bucket, lane_label
+                ))
+            for future in batch_futures:
+                topics_by_index.update(future.result())
+        
+        # 2. Single-item requests (default mode, or fallback for failed batch items)
+        single_futures = {}
+        for idx, item in enumerate(limited_news_items):
+            if idx in topics_by_index:
+                continue
+            lane_label = f"[{idx+1}/{total_items}]"
+            print(f"{lane_label} Queued: {item['title']}")
+            single_futures[idx] = model_pool.submit(
+                _generate_news_topics, item, content_futures[idx], existing_context,
+                current_time, rpm_bucket, tpm_bucket, lane_label
+            )
+        for idx, future in single_futures.items():
+            topics_by_index[idx] = future.result()
+    
+    # Collect in input order
+    aggregated_topics = []
+    for idx in range(total_items):
+        aggregated_topics.extend(topics_by_index.get(idx, []))
+    
+    print(f"Analysis finished. Total topics: {len(aggregated_topics)}")
     return {"topics": aggregated_topics}, None
 
 
@@ -2744,8 +3621,7 @@ def get_thb_krw_rate():
 
     try:
         # Increased timeout to 15s to prevent frequent timeouts
-        import requests
-        response = requests.get(url, timeout=15)
+        response = http_utils.get(url, timeout=15)
         if response.status_code == 200:
             data = response.json()
             rate = data.get('rates', {}).get('KRW')
@@ -2790,8 +3666,7 @@ def get_usd_thb_rate():
         return None
 
     try:
-        import requests
-        response = requests.get(url, timeout=15)
+        response = http_utils.get(url, timeout=15)
         if response.status_code == 200:
             data = response.json()
             rate = data.get('rates', {}).get('THB')
@@ -2819,8 +3694,7 @@ def get_air_quality(token):
     """
     url = f"https://api.waqi.info/feed/bangkok/?token={token}"
     try:
-        import requests
-        response = requests.get(url, timeout=5)
+        response = http_utils.get(url, timeout=5)
         if response.status_code == 200:
             data = response.json()
             if data.get('status') == 'ok':
@@ -2865,7 +3739,7 @@ def fetch_thai_events():
         try:
             print(f" - Requesting {target['name']}...")
             headers = {'User-Agent': 'Mozilla/5.0'}
-            response = requests.get(target['url'], headers=headers, timeout=10)
+            response = http_utils.get(target['url'], headers=headers, timeout=10)
             
             if response.status_code == 200:
                 soup = BeautifulSoup(response.content, 'html.parser')
@@ -2980,10 +3854,10 @@ def extract_event_from_url(url, api_key):
     try:
         # 1. Scrape Content
         headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
+            'User-Agent': http_utils.DEFAULT_USER_AGENT,
              'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7'
         }
-        resp = requests.get(url, headers=headers, timeout=10)
+        resp = http_utils.get(url, headers=headers, timeout=10)
         resp.raise_for_status()
         
         soup = BeautifulSoup(resp.content, 'html.parser')
@@ -3036,7 +3910,7 @@ def extract_event_from_url(url, api_key):
         If information is missing, use "정보없음" or "" (empty string).
         """
         
-        response = model.generate_content(prompt)
+        response = cached_generate_content(model, prompt, site="event_extract", validate=_is_event_json)
         text_response = response.text.strip()
         
         # Parse JSON
@@ -3057,6 +3931,16 @@ def extract_event_from_url(url, api_key):
     except Exception as e:
         return None, str(e)
 
+def _is_event_json(text):
+    """Cache validator (event_extract): a JSON object with a title."""
+    data = _parse_llm_json(text)
+    return isinstance(data, dict) and bool(data.get('title'))
+
+def _is_big_event_json(text):
+    """Cache validator (big_events): a JSON object with a 'found' verdict."""
+    data = _parse_llm_json(text)
+    return isinstance(data, dict) and 'found' in data
+
 def fetch_big_events_by_keywords(keywords, api_key):
     """
     Crawls Google News RSS (Thailand Locale) for keywords and critically verifies details with Gemini.
@@ -3075,7 +3959,11 @@ def fetch_big_events_by_keywords(keywords, api_key):
         # Use Thailand Locale (en-TH)
         rss_url = f"https://news.google.com/rss/search?q={encoded_kw}&hl=en-TH&gl=TH&ceid=TH:en"
         
-        feed = feedparser.parse(rss_url)
+        try:
+            feed = feedparser.parse(http_utils.get(rss_url, timeout=10).content)
+        except Exception as e:
+            print(f"RSS fetch failed for {kw}: {e}")
+            continue
         
         # Check top 2 entries (efficient)
         entries_to_check = feed.entries[:2]
@@ -3119,7 +4007,7 @@ def fetch_big_events_by_keywords(keywords, api_key):
         """
         
         try:
-            response = model.generate_content(prompt)
+            response = cached_generate_content(model, prompt, site="big_events", validate=_is_big_event_json)
             text = response.text.strip()
             if "```json" in text:
                 text = text.replace("```json", "").replace("```", "")
@@ -3159,7 +4047,6 @@ def fetch_trend_hunter_items(api_key, existing_links=None):
         list: shuffled list of dicts {title, desc, location, image_url, link, badge}
     """
     import random
-    import requests
     import feedparser
     
     print("Fetching Trend Hunter items via Google News RSS...")
@@ -3273,7 +4160,7 @@ def fetch_trend_hunter_items(api_key, existing_links=None):
             rss_url = f"https://news.google.com/rss/search?q=site:{target['domain']}&hl=en-TH&gl=TH&ceid=TH:en"
             print(f"Reading RSS: {target['name']}...")
             
-            resp = requests.get(rss_url, headers=headers, timeout=10)
+            resp = http_utils.get(rss_url, headers=headers, timeout=10)
             feed = feedparser.parse(resp.content)
             
             raw_items = []
@@ -3382,44 +4269,116 @@ def push_changes_to_github(files_to_commit, commit_message):
 # Visitor Counter (counterapi.dev)
 # --------------------------------------------------------------------------------
 
+VISITOR_NAMESPACE = "today-thailand-app"
+VISITOR_API_URL = "https://api.counterapi.dev/v1"
+VISITOR_REFRESH_INTERVAL = 60   # seconds between remote snapshot refreshes
+VISITOR_FLUSH_INTERVAL = 30     # seconds between batched increment flushes
+VISITOR_TIMEOUT = 3
+
+# [OPTIMIZED] The counter service is never called on the render path.
+# Hits are counted in process memory (shared by all sessions); a background thread
+# pushes them to counterapi.dev in batches and refreshes a snapshot of the remote
+# totals. Displayed totals = last snapshot + hits not flushed yet.
+_visitor_lock = threading.Lock()
+_visitor_pending = {}     # {counter_key: hits not yet sent}
+_visitor_inflight = {}    # {counter_key: hits being sent by the current flush}
+_visitor_snapshot = {}    # {counter_key: remote count}
+_visitor_refreshed_at = 0
+_visitor_thread = None
+
+def _visitor_keys():
+    from datetime import datetime
+    return "total", f"date_{datetime.now().strftime('%Y-%m-%d')}"
+
+def _visitor_call(key, action="", **params):
+    """GET /{namespace}/{key}/{action}; returns the count or None."""
+    try:
+        url = f"{VISITOR_API_URL}/{VISITOR_NAMESPACE}/{key}" + (f"/{action}" if action else "")
+        r = http_utils.get(url, params=params or None, timeout=VISITOR_TIMEOUT, retries=0)
+        if r.status_code == 200:
+            return int(r.json().get("count", 0))
+    except Exception as e:
+        print(f"Visitor counter error ({key}): {e}")
+    return None
+
+def _push_visitor_hits(key, hits):
+    """
+    Sends `hits` increments for one counter, one atomic 'up' per hit (a get + set
+    would lose visits counted by other instances in between). Runs in the background
+    flush only, so the per-hit requests never touch the render path.
+    Returns: (last count or None, hits not sent)
+    """
+    count = None
+    for sent in range(hits):
+        result = _visitor_call(key, "up")
+        if result is None:
+            return count, hits - sent
+        count = result
+    return count, 0
+
+def flush_visitor_stats():
+    """Pushes buffered hits and refreshes the remote snapshot (background thread / exit)."""
+    global _visitor_pending, _visitor_inflight, _visitor_refreshed_at
+    with _visitor_lock:
+        pending, _visitor_pending = _visitor_pending, {}
+        _visitor_inflight = dict(pending)
+
+    counts, failed = {}, {}
+    for key, hits in pending.items():
+        count, unsent = _push_visitor_hits(key, hits)
+        if unsent:
+            failed[key] = unsent
+        if count is not None:
+            counts[key] = count
+
+    if time.time() - _visitor_refreshed_at >= VISITOR_REFRESH_INTERVAL:
+        for key in _visitor_keys():
+            if key not in counts:
+                count = _visitor_call(key)
+                if count is not None:
+                    counts[key] = count
+        _visitor_refreshed_at = time.time()
+
+    with _visitor_lock:
+        _visitor_inflight = {}
+        # Retry failed pushes on the next flush
+        for key, hits in failed.items():
+            _visitor_pending[key] = _visitor_pending.get(key, 0) + hits
+        today_keys = set(_visitor_keys())
+        for key in list(_visitor_snapshot):
+            if key not in today_keys:
+                del _visitor_snapshot[key]  # Yesterday's daily counter
+        _visitor_snapshot.update({k: v for k, v in counts.items() if k in today_keys})
+
+def _visitor_worker():
+    while True:
+        try:
+            flush_visitor_stats()
+        except Exception as e:
+            print(f"Visitor counter error: {e}")
+        time.sleep(min(VISITOR_FLUSH_INTERVAL, VISITOR_REFRESH_INTERVAL))
+
+def _ensure_visitor_thread():
+    global _visitor_thread
+    with _visitor_lock:
+        if _visitor_thread is None:
+            _visitor_thread = threading.Thread(target=_visitor_worker, daemon=True)
+            _visitor_thread.start()
+            import atexit
+            atexit.register(flush_visitor_stats)
+
 def get_visitor_stats():
     """
-    Fetches both Total and Daily visitor counts.
+    Returns the Total and Daily visitor counts from the cached snapshot (never blocks).
     Returns: (total_count, daily_count)
     """
-    try:
-        import requests
-        from datetime import datetime
-        
-        namespace = "today-thailand-app"
-        today_str = datetime.now().strftime("%Y-%m-%d")
-        
-        # Keys
-        key_total = f"total"
-        key_daily = f"date_{today_str}"
-        
-        # 1. Get Total
-        total_val = 0
-        try:
-            url_total = f"https://api.counterapi.dev/v1/{namespace}/{key_total}"
-            r1 = requests.get(url_total, timeout=2)
-            if r1.status_code == 200:
-                total_val = r1.json().get("count", 0)
-        except: pass
-        
-        # 2. Get Daily
-        daily_val = 0
-        try:
-            url_daily = f"https://api.counterapi.dev/v1/{namespace}/{key_daily}"
-            r2 = requests.get(url_daily, timeout=2)
-            if r2.status_code == 200:
-                daily_val = r2.json().get("count", 0)
-        except: pass
-            
-        return total_val, daily_val
-        
-    except:
-        return 0, 0
+    _ensure_visitor_thread()
+    key_total, key_daily = _visitor_keys()
+    with _visitor_lock:
+        return tuple(
+            _visitor_snapshot.get(key, 0) + _visitor_inflight.get(key, 0) + _visitor_pending.get(key, 0)
+            for key in (key_total, key_daily)
+        )
 
 def is_bot_user():
     """
@@ -3442,50 +4401,15 @@ def is_bot_user():
 
 def increment_visitor_stats():
     """
-    Increments both Total and Daily counts (once per session).
+    Counts one visit for Total and Daily (once per session); sent later in a batch.
     Returns: (new_total, new_daily)
     """
-    try:
-        import requests
-        from datetime import datetime
-        
-        # [NEW] Bot Filtering: skip increment if bot
-        is_bot = is_bot_user()
-        
-        namespace = "today-thailand-app"
-        today_str = datetime.now().strftime("%Y-%m-%d")
-        
-        # Keys
-        key_total = f"total"
-        key_daily = f"date_{today_str}"
-        
-        # 1. Hit Total
-        total_val = 0
-        try:
-            url_total = f"https://api.counterapi.dev/v1/{namespace}/{key_total}/"
-            # Append 'up' only for humans
-            url_total += "up" if not is_bot else "get"
-            r1 = requests.get(url_total, timeout=2)
-            if r1.status_code == 200:
-                total_val = r1.json().get("count", 0)
-        except: pass
-        
-        # 2. Hit Daily
-        daily_val = 0
-        try:
-            url_daily = f"https://api.counterapi.dev/v1/{namespace}/{key_daily}/"
-            # Append 'up' only for humans
-            url_daily += "up" if not is_bot else "get"
-            r2 = requests.get(url_daily, timeout=2)
-            if r2.status_code == 200:
-                daily_val = r2.json().get("count", 0)
-        except: pass
-        
-        return total_val, daily_val
-        
-    except:
-        return 0, 0
-        return 0, 0
+    # [NEW] Bot Filtering: skip increment if bot
+    if not is_bot_user():
+        with _visitor_lock:
+            for key in _visitor_keys():
+                _visitor_pending[key] = _visitor_pending.get(key, 0) + 1
+    return get_visitor_stats()
 
 # --------------------------------------------------------------------------------
 # Twitter Trend Analyzer (trends24.in + Gemini)
@@ -3496,7 +4420,6 @@ def fetch_twitter_trends(api_key):
     Scrapes trends24.in/thailand/ for top 10 hashtags and analyzes them with Gemini.
     Returns: dict { "topic": "...", "reason": "...", "severity": "info" } or None
     """
-    import requests
     from bs4 import BeautifulSoup
     import google.generativeai as genai
     import json
@@ -3508,7 +4431,7 @@ def fetch_twitter_trends(api_key):
     
     try:
         print("Fetching Twitter Trends from trends24.in...")
-        resp = requests.get(url, headers=headers, timeout=10)
+        resp = http_utils.get(url, headers=headers, timeout=10)
         soup = BeautifulSoup(resp.content, 'html.parser')
         
         # trends24 structure: .trend-card__list (first one is latest) -> li -> a
@@ -3690,7 +4613,7 @@ def fetch_hotel_candidates(hotel_name, city, api_key):
     }
     
     try:
-        response = requests.post(url, json=payload, headers=headers)
+        response = http_utils.post(url, json=payload, headers=headers)
         if response.status_code != 200:
             # st.error(f"🚨 API 호출 실패: {response.status_code}")
             return None
@@ -3726,7 +4649,7 @@ def fetch_hotel_details(place_id, api_key):
     }
     
     try:
-        resp = requests.get(url, headers=headers)
+        resp = http_utils.get(url, headers=headers)
         if resp.status_code != 200:
             st.error(f"상세 정보 조회 실패: {resp.text}")
             return None
@@ -3827,7 +4750,7 @@ def analyze_hotel_reviews(hotel_name, rating, reviews, api_key, language="Korean
         }}
         """
         
-        response = model.generate_content(prompt)
+        response = cached_generate_content(model, prompt, site="hotel_reviews")
         return json.loads(response.text)
 
     except Exception as e:
@@ -3847,8 +4770,7 @@ def ensure_font_loaded():
     if not os.path.exists(FONT_PATH):
         try:
             print("Downloading font for Infographic...")
-            import requests
-            r = requests.get(FONT_URL, timeout=10)
+            r = http_utils.get(FONT_URL, timeout=10)
             with open(FONT_PATH, 'wb') as f:
                 f.write(r.content)
             print("Font downloaded.")
@@ -3858,6 +4780,11 @@ def ensure_font_loaded():
             
     return FONT_PATH
 
+def _has_infographic_lines(text):
+    """Cache validator (infographic): a JSON object with a non-empty 'lines' list."""
+    data = _parse_llm_json(text)
+    return isinstance(data, dict) and isinstance(data.get('lines'), list) and bool(data['lines'])
+
 def prettify_infographic_text(category, items, api_key):
     """
     Uses Gemini to shorten news into 'Emoji + One-liner' format.
@@ -3891,7 +4818,7 @@ def prettify_infographic_text(category, items, api_key):
     """
     
     try:
-        resp = model.generate_content(prompt)
+        resp = cached_generate_content(model, prompt, site="infographic", validate=_has_infographic_lines)
         text = resp.text.strip().replace("```json", "").replace("```", "")
         if text.startswith("```"): text = text.replace("```", "")
         data = json.loads(text)
@@ -3951,12 +4878,11 @@ def generate_category_infographic(category, items, date_str, api_key):
                 
         if target_img_url:
             try:
-                import requests
                 from io import BytesIO
                 
                 # Download Image
                 # print(f"Downloading BG: {target_img_url}")
-                resp = requests.get(target_img_url, timeout=5)
+                resp = http_utils.get(target_img_url, timeout=5)
                 if resp.status_code == 200:
                     raw_img = Image.open(BytesIO(resp.content)).convert("RGB")
                     
@@ -4078,8 +5004,7 @@ def get_route_estimates(origin, destination, api_key):
     }
     
     try:
-        import requests
-        resp = requests.post(endpoint, json=payload, headers=headers, timeout=10)
+        resp = http_utils.post(endpoint, json=payload, headers=headers, timeout=10)
         data = resp.json()
         
         if resp.status_code == 200:
@@ -4280,8 +5205,7 @@ def search_places(query, api_key):
     }
     
     try:
-        import requests
-        resp = requests.get(endpoint, params=params, timeout=5)
+        resp = http_utils.get(endpoint, params=params, timeout=5)
         data = resp.json()
         
         candidates = []
@@ -4358,7 +5282,7 @@ def scrape_wongnai_restaurant(url):
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
     }
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_utils.get(url, headers=headers, timeout=10)
         if response.status_code != 200:
             return {"error": f"현시점 웡나이 접속이 원활하지 않습니다 (Code: {response.status_code})"}
 
@@ -4457,6 +5381,51 @@ def analyze_wongnai_data(restaurant_data, api_key):
 # 🎒 AI Tour Recommendation Engine
 # ============================================
 
+def tour_preference_key(label):
+    """Tour tab option label (Korean or English) -> UI_TEXT key, e.g. "Couple" -> "who_couple"."""
+    for key, texts in UI_TEXT.items():
+        if key.startswith(("who_", "style_", "budget_")) and label in texts.values():
+            return key
+    return None
+
+def build_tour_prompt_catalog(tours):
+    """[상품 목록] block of the recommendation prompt."""
+    products_list = []
+    for t in tours:
+        # Always include Korean for context, and English if available
+        p_name_kr = t.get('name', 'Unknown')
+        p_desc_kr = t.get('desc', '')
+        p_pros_kr = t.get('pros', '')
+        
+        p_name_en = t.get('name_en', '')
+        p_desc_en = t.get('desc_en', '')
+        p_pros_en = t.get('pros_en', '')
+        
+        p_info = f"- ID {t['id']}. KR_Name: {p_name_kr}, KR_Desc: {p_desc_kr}, KR_Pros: {p_pros_kr}"
+        if p_name_en:
+            p_info += f" | EN_Name: {p_name_en}, EN_Desc: {p_desc_en}, EN_Pros: {p_pros_en}"
+        
+        products_list.append(p_info)
+    return "\n".join(products_list)
+
+def tour_profile_key(who, style, budget, region, language):
+    """Recommendation cache key: labels normalized to UI_TEXT keys, so KR/EN labels and style order don't matter."""
+    return tour_rec_cache.profile_key(
+        region,
+        tour_preference_key(who) or who,
+        [tour_preference_key(s) or s for s in style or []],
+        tour_preference_key(budget) or budget,
+        language
+    )
+
+def shortlist_tours(who, style, budget, region):
+    """Pre-ranked candidates for the recommendation prompt (top tour_ranker.SHORTLIST_SIZE of the region)."""
+    catalog = get_tour_catalog()
+    region_tours = catalog.by_region(region)
+    index = tour_ranker.build_index(region_tours, signature=f"{catalog.signature}|{region}")
+    style_keys = [k for k in (tour_preference_key(s) for s in style or []) if k]
+    return tour_ranker.shortlist(index, tour_preference_key(who), style_keys, tour_preference_key(budget))
+
 def recommend_tours(who, style, budget, region="방콕", language="Korean"):
     """
     사용자 입력을 바탕으로 Gemini AI가 투어를 추천하는 함수.
@@ -4474,6 +5443,13 @@ def recommend_tours(who, style, budget, region="방콕", language="Korean"):
     """
     import google.generativeai as genai
     
+    # [OPTIMIZED] Same profile (and same tour catalog) -> instant answer, no Gemini call
+    cache_key = tour_profile_key(who, style, budget, region, language)
+    catalog_signature = get_tour_catalog().signature or ""
+    cached = tour_rec_cache.get(cache_key, catalog_signature)
+    if cached is not None:
+        return cached
+    
     # Get API key
     api_key = os.environ.get("GEMINI_API_KEY")
     if not api_key:
@@ -4500,36 +5476,15 @@ def recommend_tours(who, style, budget, region="방콕", language="Korean"):
             generation_config={"response_mime_type": "application/json"}
         )
         
-        # Load tours
-        TOURS = load_tours()
-        
-        # Filter tours by region
-        filtered_tours = [t for t in TOURS if t.get('region', '방콕') == region]
+        # [OPTIMIZED] Only the locally pre-ranked shortlist goes into the prompt (not the whole region)
+        filtered_tours = shortlist_tours(who, style, budget, region)
         
         if not filtered_tours:
             return {"recommendations": []} # No tours for this region
 
         # Build product catalog for prompt
         is_english = (language == "English")
-        
-        products_list = []
-        for t in filtered_tours:
-            # Always include Korean for context, and English if available
-            p_name_kr = t.get('name', 'Unknown')
-            p_desc_kr = t.get('desc', '')
-            p_pros_kr = t.get('pros', '')
-            
-            p_name_en = t.get('name_en', '')
-            p_desc_en = t.get('desc_en', '')
-            p_pros_en = t.get('pros_en', '')
-            
-            p_info = f"- ID {t['id']}. KR_Name: {p_name_kr}, KR_Desc: {p_desc_kr}, KR_Pros: {p_pros_kr}"
-            if p_name_en:
-                p_info += f" | EN_Name: {p_name_en}, EN_Desc: {p_desc_en}, EN_Pros: {p_pros_en}"
-            
-            products_list.append(p_info)
-        
-        products_info = "\n".join(products_list)
+        products_info = build_tour_prompt_catalog(filtered_tours)
         
         style_str = ", ".join(style) if style else ("No specific preference" if is_english else "특별한 선호 없음")
 
@@ -4599,14 +5554,56 @@ Analyze the user's travel style and recommend the **top 6 perfect products** fro
 }}
 """
         
-        response = model.generate_content(prompt)
+        response = cached_generate_content(model, prompt, site="tour_recommendation")
         result = json.loads(response.text)
+        if result.get("recommendations"):
+            tour_rec_cache.put(cache_key, catalog_signature, result)
         return result
         
     except Exception as e:
         print(f"❌ Tour recommendation error: {e}")
         return None
 
+# Most common tour tab selections (UI_TEXT keys), pre-warmed by batch_job
+TOUR_PREWARM_PROFILES = [
+    ("who_couple", ["style_photo"], "budget_mid"),
+    ("who_alone", ["style_photo"], "budget_mid"),
+    ("who_friend", ["style_photo"], "budget_mid"),
+    ("who_child", ["style_photo"], "budget_mid"),
+    ("who_parent", ["style_photo"], "budget_mid"),
+    ("who_couple", ["style_night"], "budget_high"),
+    ("who_friend", ["style_activity"], "budget_low"),
+    ("who_child", ["style_unique"], "budget_mid"),
+]
+TOUR_PREWARM_LANGUAGES = ["Korean", "English"]
+TOUR_PREWARM_MAX_PER_RUN = 8  # Gemini calls per batch run (the rest fill in on later runs)
+
+def prewarm_tour_recommendations(max_calls=TOUR_PREWARM_MAX_PER_RUN):
+    """
+    Fills the recommendation cache for TOUR_PREWARM_PROFILES x regions x languages.
+    Profiles already cached for the current catalog are skipped.
+    Returns: number of Gemini calls made
+    """
+    catalog = get_tour_catalog()
+    regions = sorted({t.get('region', '방콕') for t in catalog.all() if isinstance(t.get('region', '방콕'), str)})
+    calls = 0
+    for language in TOUR_PREWARM_LANGUAGES:
+        lang_code = "en" if language == "English" else "ko"
+        for region in regions:
+            for who_key, style_keys, budget_key in TOUR_PREWARM_PROFILES:
+                if calls >= max_calls:
+                    return calls
+                who = UI_TEXT[who_key][lang_code]
+                style = [UI_TEXT[k][lang_code] for k in style_keys]
+                budget = UI_TEXT[budget_key][lang_code]
+                key = tour_profile_key(who, style, budget, region, language)
+                if tour_rec_cache.get(key, catalog.signature) is not None:
+                    continue
+                calls += 1
+                result = recommend_tours(who, style, budget, region=region, language=language)
+                print(f"Tour pre-warm {region}/{language}/{who_key}: {'ok' if result else 'failed'}")
+    return calls
+
 # --- 3. 데이터 로드 및 저장 (Data Handling) ---
 
 # 구글 시트 URL (투어 데이터베이스)
@@ -4671,18 +5668,22 @@ def save_tours_to_sheet(tours_data):
         print(f"Error saving tours to sheet: {e}")
         return False
 
+_tour_catalog = None
+
+def get_tour_catalog():
+    """
+    Cached tour catalog: Google Sheets (primary) or local JSON (fallback), reloaded once per TTL.
+    Use .by_region() / .get() / .find_by_name() for read-only lookups.
+    """
+    global _tour_catalog
+    if _tour_catalog is None:
+        _tour_catalog = tour_catalog.TourCatalog(load_tours_from_sheet, load_tours_local)
+    return _tour_catalog
+
 def load_tours():
-    """Load tours from Google Sheets (primary) or local JSON (fallback)"""
-    # 1. Try Google Sheets
-    sheet_tours = load_tours_from_sheet()
-    if sheet_tours:
-        # Update local cache (Disabled to prevent app restart during session)
-        # save_tours_local(sheet_tours)
-        return sheet_tours
-        
-    # 2. Fallback to Local
-    print("Fallback to local tours.json")
-    return load_tours_local()
+    """Load tours from the cached catalog (editable copy; pass it back to save_tours)"""
+    # Update local cache is disabled to prevent app restart during session
+    return get_tour_catalog().tours()
 
 def load_tours_local():
     """Load tours from data/tours.json"""
@@ -4702,6 +5703,9 @@ def save_tours(tours):
     if not success:
         save_tours_local(tours)
         print("Warning: Failed to save to Google Sheet, but saved locally.")
+    
+    # 3. Write through to the cached catalog
+    get_tour_catalog().replace(tours)
 
 def save_tours_local(tours):
     """Save tours to data/tours.json"""